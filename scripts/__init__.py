@@ -3,22 +3,88 @@ Claude Prompt Optimizer Scripts
 프롬프트 최적화 핵심 스크립트 모듈
 """
 
-# Claude 4 최적화 (기존)
-from .core import ClaudePromptOptimizer, get_optimizer, optimize_prompt, analyze_prompt
-from .analyzer import PromptAnalyzer, AnalysisResult, Domain, OptimizationLevel
-from .optimizer import PromptOptimizer, OptimizationResult
-from .templates import TemplateManager, Template
-
-# GPT-5 최적화 (신규)
-from .gpt5_analyzer import GPT5PromptAnalyzer, GPT5AnalysisResult, ReasoningEffort, Verbosity
-from .gpt5_optimizer import GPT5PromptOptimizer, GPT5OptimizationResult
-from .gpt5_core import (
-    GPT5Engine,
-    GPT5PipelineResult,
-    analyze_prompt as analyze_gpt5_prompt,
-    optimize_prompt as optimize_gpt5_prompt,
-    analyze_and_optimize_prompt as analyze_and_optimize_gpt5_prompt
-)
+import importlib
+from typing import TYPE_CHECKING
+
+# 공개 이름 → (서브모듈, 속성 이름)
+# 서브모듈은 처음 접근할 때 import 됩니다 (PEP 562).
+# Claude 4만 사용하면 GPT-5 모듈을, GPT-5만 사용하면 Claude 4 모듈을 로드하지 않습니다.
+_LAZY_ATTRIBUTES = {
+    # Claude 4 최적화 (기존)
+    "ClaudePromptOptimizer": (".core", "ClaudePromptOptimizer"),
+    "get_optimizer": (".core", "get_optimizer"),
+    "optimize_prompt": (".core", "optimize_prompt"),
+    "analyze_prompt": (".core", "analyze_prompt"),
+    "PromptAnalyzer": (".analyzer", "PromptAnalyzer"),
+    "AnalysisResult": (".analyzer", "AnalysisResult"),
+    "Domain": (".analyzer", "Domain"),
+    "OptimizationLevel": (".analyzer", "OptimizationLevel"),
+    "PromptOptimizer": (".optimizer", "PromptOptimizer"),
+    "OptimizationResult": (".optimizer", "OptimizationResult"),
+    "TemplateManager": (".templates", "TemplateManager"),
+    "Template": (".templates", "Template"),
+
+    # GPT-5 최적화 (신규)
+    "GPT5PromptAnalyzer": (".gpt5_analyzer", "GPT5PromptAnalyzer"),
+    "GPT5AnalysisResult": (".gpt5_analyzer", "GPT5AnalysisResult"),
+    "ReasoningEffort": (".gpt5_analyzer", "ReasoningEffort"),
+    "Verbosity": (".gpt5_analyzer", "Verbosity"),
+    "GPT5PromptOptimizer": (".gpt5_optimizer", "GPT5PromptOptimizer"),
+    "GPT5OptimizationResult": (".gpt5_optimizer", "GPT5OptimizationResult"),
+    "GPT5Engine": (".gpt5_core", "GPT5Engine"),
+    "GPT5PipelineResult": (".gpt5_core", "GPT5PipelineResult"),
+    "analyze_gpt5_prompt": (".gpt5_core", "analyze_prompt"),
+    "optimize_gpt5_prompt": (".gpt5_core", "optimize_prompt"),
+    "analyze_and_optimize_gpt5_prompt": (".gpt5_core", "analyze_and_optimize_prompt"),
+
+    # 증분 분석 세션
+    "AnalysisSession": (".session", "AnalysisSession"),
+    "GPT5AnalysisSession": (".session", "GPT5AnalysisSession"),
+    "TextEdit": (".session", "TextEdit"),
+
+    # 대량 분석 (NumPy 필요)
+    "BatchAnalyzer": (".batch_analyzer", "BatchAnalyzer"),
+
+    # 메시지 카탈로그
+    "Message": (".messages", "Message"),
+    "MessageCode": (".messages", "MessageCode"),
+}
+
+if TYPE_CHECKING:
+    from .core import ClaudePromptOptimizer, get_optimizer, optimize_prompt, analyze_prompt
+    from .analyzer import PromptAnalyzer, AnalysisResult, Domain, OptimizationLevel
+    from .optimizer import PromptOptimizer, OptimizationResult
+    from .templates import TemplateManager, Template
+    from .gpt5_analyzer import GPT5PromptAnalyzer, GPT5AnalysisResult, ReasoningEffort, Verbosity
+    from .gpt5_optimizer import GPT5PromptOptimizer, GPT5OptimizationResult
+    from .gpt5_core import (
+        GPT5Engine,
+        GPT5PipelineResult,
+        analyze_prompt as analyze_gpt5_prompt,
+        optimize_prompt as optimize_gpt5_prompt,
+        analyze_and_optimize_prompt as analyze_and_optimize_gpt5_prompt
+    )
+    from .session import AnalysisSession, GPT5AnalysisSession, TextEdit
+    from .batch_analyzer import BatchAnalyzer
+    from .messages import Message, MessageCode
+
+
+def __getattr__(name):
+    """공개 이름에 처음 접근할 때 해당 서브모듈을 import"""
+    target = _LAZY_ATTRIBUTES.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attribute = target
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    # 다음 접근부터는 __getattr__를 거치지 않도록 캐시
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __version__ = "1.2.0"
 __author__ = "zerodice0"
@@ -37,6 +103,14 @@ __all__ = [
     "GPT5PromptAnalyzer",
     "GPT5PromptOptimizer",
 
+    # 증분 분석 세션
+    "AnalysisSession",
+    "GPT5AnalysisSession",
+    "TextEdit",
+
+    # 대량 분석
+    "BatchAnalyzer",
+
     # Claude 4 데이터 클래스
     "AnalysisResult",
     "OptimizationResult",
@@ -47,6 +121,10 @@ __all__ = [
     "GPT5OptimizationResult",
     "GPT5PipelineResult",
 
+    # 메시지 카탈로그
+    "Message",
+    "MessageCode",
+
     # Claude 4 열거형
     "Domain",
     "OptimizationLevel",
@@ -0,0 +1,14 @@
+"""
+JSONL 스트리밍 최적화 명령행 진입점
+
+사용법:
+    python -m scripts [입력 파일 ...] [-o 출력 파일] [--engine claude|gpt5] [--workers N]
+"""
+
+import sys
+
+from .cli import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
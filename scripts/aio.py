@@ -0,0 +1,171 @@
+"""
+Async Runner
+asyncio 이벤트 루프에서 최적화 엔진을 호출하기 위한 실행기
+
+분석/최적화는 CPU 작업이므로 이벤트 루프에서 직접 실행하면 다른 요청이 모두 멈춥니다.
+AsyncRunner는 작업을 관리형 실행기(기본: 스레드 풀)로 보내고,
+세마포어로 동시 실행 수를 제한하며, 시간 제한과 태스크 취소를 처리합니다.
+
+- 시간 제한은 세마포어 대기 시간을 포함합니다 (요청 단위 마감 시간).
+- 취소되거나 시간 제한을 넘긴 작업은 결과를 버리고 세마포어를 즉시 반환합니다.
+  이미 실행 중인 스레드 작업은 중단할 수 없으므로 끝까지 실행된 뒤 버려집니다.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, Optional, Union
+
+
+# 기본 동시 실행 수 (ThreadPoolExecutor 기본 워커 수와 같은 기준)
+DEFAULT_MAX_CONCURRENCY = min(32, (os.cpu_count() or 1) + 4)
+
+
+class AsyncRunner:
+    """동시 실행 수와 시간 제한을 관리하는 asyncio 실행기"""
+
+    def __init__(self, max_concurrency: Optional[int] = None, executor: Optional[Executor] = None,
+                 timeout: Optional[float] = None):
+        """
+        초기화
+
+        Args:
+            max_concurrency: 최대 동시 실행 수 (None이면 DEFAULT_MAX_CONCURRENCY)
+            executor: 작업을 실행할 실행기 (None이면 처음 사용할 때 스레드 풀 생성)
+            timeout: 기본 작업 시간 제한 (초, None이면 제한 없음)
+        """
+        self.max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+        self.timeout = timeout
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._lock = threading.Lock()
+        # 이벤트 루프별 세마포어 (asyncio 세마포어는 하나의 루프에서만 사용 가능)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+
+    @property
+    def executor(self) -> Executor:
+        """작업 실행기"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency,
+                        thread_name_prefix="prompt-optimizer"
+                    )
+        return self._executor
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """현재 이벤트 루프의 세마포어"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def _execute(self, function: Callable[..., Any], args: tuple) -> Any:
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(function, *args))
+
+    async def run(self, function: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        작업을 실행기에서 실행하고 결과 반환
+
+        Args:
+            function: 실행할 함수
+            *args: 함수 인자
+            timeout: 시간 제한 (초, None이면 기본 시간 제한 사용)
+
+        Returns:
+            함수 반환값
+
+        Raises:
+            TimeoutError: 시간 제한 초과
+            asyncio.CancelledError: 호출한 태스크가 취소됨
+        """
+        if timeout is None:
+            timeout = self.timeout
+        try:
+            return await asyncio.wait_for(self._execute(function, args), timeout)
+        except asyncio.TimeoutError as e:
+            # Python 3.11 미만에서는 asyncio.TimeoutError가 내장 TimeoutError와 다른 클래스
+            if isinstance(e, TimeoutError):
+                raise
+            raise TimeoutError() from e
+
+    async def map(self, function: Callable[[Any], Any], items: Union[Iterable[Any], AsyncIterable[Any]],
+                  timeout: Optional[float] = None,
+                  on_error: Optional[Callable[[Any, Exception], Any]] = None) -> AsyncIterator[Any]:
+        """
+        여러 입력을 동시에 처리하고 입력 순서대로 결과 반환
+
+        입력은 필요한 만큼만 읽고, 처리 중인 작업 수를 max_concurrency로 제한합니다.
+
+        Args:
+            function: 입력 하나를 처리하는 함수
+            items: 입력 목록 (비동기 이터러블 가능)
+            timeout: 작업별 시간 제한 (초, None이면 기본 시간 제한 사용)
+            on_error: 작업별 오류(시간 제한 포함)를 결과로 바꾸는 함수 (None이면 예외 전파)
+
+        Returns:
+            결과 비동기 이터레이터
+        """
+        async def call(item):
+            try:
+                return await self.run(function, item, timeout=timeout)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                return on_error(item, e)
+
+        pending = deque()
+        try:
+            async for item in _aiter(items):
+                pending.append(asyncio.ensure_future(call(item)))
+                if len(pending) >= self.max_concurrency:
+                    yield await pending.popleft()
+
+            while pending:
+                yield await pending.popleft()
+        finally:
+            # 소비자가 중간에 멈추거나 취소된 경우 남은 작업 취소
+            for task in pending:
+                task.cancel()
+
+    def shutdown(self, wait: bool = True):
+        """직접 만든 스레드 풀 종료 (외부에서 받은 실행기는 종료하지 않음)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._owns_executor:
+            executor.shutdown(wait=wait)
+
+
+async def _aiter(items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    """동기/비동기 이터러블을 비동기 이터레이터로 변환"""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+# 전역 실행기 (처음 사용할 때 생성)
+_runner: Optional[AsyncRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_async_runner() -> AsyncRunner:
+    """전역 asyncio 실행기 반환"""
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                _runner = AsyncRunner()
+    return _runner
@@ -5,10 +5,14 @@ Claude 4 프롬프트 가이드 7원칙 기반 프롬프트 분석기
 
 import re
 import json
-from typing import Dict, List, Tuple, Any
-from dataclasses import dataclass
+from typing import Dict, List, Tuple, Any, Optional, Set
 from enum import Enum
 
+from .matcher import KeywordMatcher
+from .messages import Message, MessageCode, message, render_messages
+from .records import dump_json, frozen_dataclass
+from .tokens import Tokenizer, get_tokenizer
+
 
 class OptimizationLevel(Enum):
     CONSERVATIVE = "conservative"
@@ -24,7 +28,7 @@ class Domain(Enum):
     BUSINESS = "business"
 
 
-@dataclass
+@frozen_dataclass
 class AnalysisResult:
     """프롬프트 분석 결과"""
     original_prompt: str
@@ -33,16 +37,48 @@ class AnalysisResult:
     scores: Dict[str, int]  # 7원칙별 점수
     total_score: float
     token_count: int
-    issues: List[str]
-    suggestions: List[str]
+    issues: List[Message]
+    suggestions: List[Message]
     detected_intent: str
     complexity_level: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        """딕셔너리로 변환 (열거형은 값으로 변환)"""
+        return {
+            'original_prompt': self.original_prompt,
+            'domain': self.domain.value,
+            'optimization_level': self.optimization_level.value,
+            'scores': dict(self.scores),
+            'total_score': self.total_score,
+            'token_count': self.token_count,
+            'issues': render_messages(self.issues),
+            'suggestions': render_messages(self.suggestions),
+            'detected_intent': self.detected_intent,
+            'complexity_level': self.complexity_level
+        }
+
+    def to_json(self) -> str:
+        """JSON 문자열로 변환"""
+        return dump_json(self.to_dict())
+
 
 class PromptAnalyzer:
     """Claude 4 최적화 원칙 기반 프롬프트 분석기"""
 
-    def __init__(self):
+    # 원칙별 특화 분석에 사용하는 키워드
+    REQUEST_INDICATORS = ["?", "요청", "부탁"]
+    EXAMPLE_INDICATORS = ["예시", "예를"]
+    ROLE_INDICATORS = ["역할", "전문가", "관점", "입장"]
+    FORMAT_INDICATORS = ["형식", "방식", "구조", "템플릿"]
+    NEGATIVE_INDICATORS = ["하지 않도록", "피해", "제외", "주의"]
+
+    # 보수적 최적화 레벨에서 남기는 중요 이슈 (너무 짧거나 정보가 부족한 경우)
+    CONSERVATIVE_ISSUES = frozenset({MessageCode.PROMPT_TOO_SHORT, MessageCode.CONTEXT_INSUFFICIENT})
+
+    def __init__(self, tokenizer: Optional[Tokenizer] = None):
+        # 토큰 카운터 (None이면 전역 토큰 카운터 사용)
+        self.tokenizer = tokenizer
+
         # Claude 4 최적화 7원칙
         self.principles = {
             "clarity": {
@@ -147,30 +183,68 @@ class PromptAnalyzer:
             "plan": ["계획", "전략", "방안", "로드맵", "단계"]
         }
 
-    def detect_domain(self, prompt: str) -> Domain:
-        """프롬프트의 도메인 자동 감지 (가중치 기반)"""
-        prompt_lower = prompt.lower()
+        # 모든 키워드를 하나의 오토마톤으로 컴파일 (프롬프트 1회 순회로 전체 매칭)
+        self.keyword_matcher = KeywordMatcher(self._collect_keywords())
+
+    def _collect_keywords(self) -> List[str]:
+        """원칙, 도메인, 의도 분석에 사용되는 전체 키워드 수집"""
+        keywords = []
+
+        for principle in self.principles.values():
+            keywords.extend(principle["keywords"])
+            keywords.extend(principle["indicators"])
+
+        for keywords_dict in self.domain_keywords.values():
+            keywords.extend(keywords_dict.get("simple", []))
+            keywords.extend(keywords_dict.get("compound", []))
+            keywords.extend(keywords_dict.get("weighted", {}).keys())
+
+        for patterns in self.intent_patterns.values():
+            keywords.extend(patterns)
+
+        keywords.extend(self.REQUEST_INDICATORS)
+        keywords.extend(self.EXAMPLE_INDICATORS)
+        keywords.extend(self.ROLE_INDICATORS)
+        keywords.extend(self.FORMAT_INDICATORS)
+        keywords.extend(self.NEGATIVE_INDICATORS)
+
+        return keywords
+
+    def find_keywords(self, prompt: str) -> Set[str]:
+        """프롬프트(소문자 변환)에 등장하는 키워드 집합을 한 번의 순회로 계산"""
+        return self.keyword_matcher.find_all(prompt.lower())
+
+    def _score_domains(self, hits: Set[str]) -> Dict[Domain, float]:
+        """키워드 히트 집합으로 도메인별 가중치 점수 계산"""
         domain_scores = {domain: 0.0 for domain in self.domain_keywords.keys()}
 
         for domain, keywords_dict in self.domain_keywords.items():
             # Simple 키워드 (가중치 1.0)
             if "simple" in keywords_dict:
                 simple_score = sum(1.0 for keyword in keywords_dict["simple"]
-                                 if keyword in prompt_lower)
+                                 if keyword in hits)
                 domain_scores[domain] += simple_score
 
             # Compound 키워드 (가중치 2.0)
             if "compound" in keywords_dict:
                 compound_score = sum(2.0 for keyword in keywords_dict["compound"]
-                                   if keyword in prompt_lower)
+                                   if keyword in hits)
                 domain_scores[domain] += compound_score
 
             # Weighted 키워드 (개별 가중치)
             if "weighted" in keywords_dict:
                 weighted_score = sum(weight for keyword, weight in keywords_dict["weighted"].items()
-                                   if keyword in prompt_lower)
+                                   if keyword in hits)
                 domain_scores[domain] += weighted_score
 
+        return domain_scores
+
+    def detect_domain(self, prompt: str, hits: Optional[Set[str]] = None) -> Domain:
+        """프롬프트의 도메인 자동 감지 (가중치 기반)"""
+        if hits is None:
+            hits = self.find_keywords(prompt)
+        domain_scores = self._score_domains(hits)
+
         # 최고 점수 도메인 선택
         if max(domain_scores.values()) == 0:
             return Domain.AUTO
@@ -184,26 +258,11 @@ class PromptAnalyzer:
         else:
             return Domain.AUTO
 
-    def detect_domain_with_confidence(self, prompt: str) -> tuple:
+    def detect_domain_with_confidence(self, prompt: str, hits: Optional[Set[str]] = None) -> tuple:
         """도메인 감지 + 확신도 반환"""
-        prompt_lower = prompt.lower()
-        domain_scores = {domain: 0.0 for domain in self.domain_keywords.keys()}
-
-        for domain, keywords_dict in self.domain_keywords.items():
-            if "simple" in keywords_dict:
-                simple_score = sum(1.0 for keyword in keywords_dict["simple"]
-                                 if keyword in prompt_lower)
-                domain_scores[domain] += simple_score
-
-            if "compound" in keywords_dict:
-                compound_score = sum(2.0 for keyword in keywords_dict["compound"]
-                                   if keyword in prompt_lower)
-                domain_scores[domain] += compound_score
-
-            if "weighted" in keywords_dict:
-                weighted_score = sum(weight for keyword, weight in keywords_dict["weighted"].items()
-                                   if keyword in prompt_lower)
-                domain_scores[domain] += weighted_score
+        if hits is None:
+            hits = self.find_keywords(prompt)
+        domain_scores = self._score_domains(hits)
 
         total_score = sum(domain_scores.values())
         if total_score == 0:
@@ -214,13 +273,14 @@ class PromptAnalyzer:
 
         return best_domain, confidence
 
-    def detect_intent(self, prompt: str) -> str:
+    def detect_intent(self, prompt: str, hits: Optional[Set[str]] = None) -> str:
         """프롬프트의 주요 의도 감지"""
-        prompt_lower = prompt.lower()
+        if hits is None:
+            hits = self.find_keywords(prompt)
         intent_scores = {}
 
         for intent, patterns in self.intent_patterns.items():
-            score = sum(1 for pattern in patterns if pattern in prompt_lower)
+            score = sum(1 for pattern in patterns if pattern in hits)
             intent_scores[intent] = score
 
         if max(intent_scores.values()) == 0:
@@ -269,86 +329,105 @@ class PromptAnalyzer:
             return "low"
 
     def estimate_token_count(self, prompt: str) -> int:
-        """토큰 수 추정 (간단한 근사치)"""
-        # 한글과 영어의 토큰 비율 고려
-        korean_chars = len(re.findall(r'[가-힣]', prompt))
-        english_words = len(re.findall(r'\b[a-zA-Z]+\b', prompt))
+        """토큰 수 추정 (기본: 한글 1.5자당 1토큰, 영어 1단어당 1.3토큰 근사치)"""
+        tokenizer = self.tokenizer if self.tokenizer is not None else get_tokenizer()
+        return tokenizer.count(prompt)
 
-        # 대략적인 토큰 추정 (한글: 1.5자당 1토큰, 영어: 1단어당 1.3토큰)
-        korean_tokens = korean_chars / 1.5
-        english_tokens = english_words * 1.3
-
-        return int(korean_tokens + english_tokens)
-
-    def analyze_principle(self, prompt: str, principle_key: str) -> Tuple[int, List[str], List[str]]:
+    def analyze_principle(self, prompt: str, principle_key: str,
+                          hits: Optional[Set[str]] = None) -> Tuple[int, List[Message], List[Message]]:
         """개별 원칙에 대한 분석 수행"""
         principle = self.principles[principle_key]
-        prompt_lower = prompt.lower()
+        if hits is None:
+            hits = self.find_keywords(prompt)
 
         score = 1  # 기본 점수
-        issues = []
-        suggestions = []
 
         # 키워드 기반 점수 계산
-        keyword_matches = sum(1 for keyword in principle["keywords"] if keyword in prompt_lower)
+        keyword_matches = sum(1 for keyword in principle["keywords"] if keyword in hits)
         score += min(keyword_matches, 2)  # 최대 3점까지 추가
 
         # 지표 기반 추가 점수
-        indicator_matches = sum(1 for indicator in principle["indicators"] if indicator in prompt_lower)
+        indicator_matches = sum(1 for indicator in principle["indicators"] if indicator in hits)
         score += min(indicator_matches, 2)  # 최대 2점까지 추가
 
         # 원칙별 특화 분석
+        issues, suggestions = self._principle_feedback(prompt, principle_key, hits)
+
+        # 점수 제한 (1-5)
+        score = max(1, min(5, score))
+
+        return score, issues, suggestions
+
+    def _principle_feedback(self, prompt: str, principle_key: str,
+                            hits: Set[str]) -> Tuple[List[Message], List[Message]]:
+        """원칙별 특화 분석 (이슈와 개선 제안)"""
+        issues = []
+        suggestions = []
+
         if principle_key == "clarity":
             if len(prompt.split()) < 5:
-                issues.append("프롬프트가 너무 짧아 명확성 부족")
-                suggestions.append("더 구체적인 목표와 요구사항을 명시해주세요")
-            if "?" not in prompt and "요청" not in prompt and "부탁" not in prompt:
-                issues.append("명확한 요청 형태가 아님")
-                suggestions.append("무엇을 원하는지 명확히 요청해주세요")
+                issues.append(message(MessageCode.PROMPT_TOO_SHORT))
+                suggestions.append(message(MessageCode.SPECIFY_GOALS))
+            if not any(indicator in hits for indicator in self.REQUEST_INDICATORS):
+                issues.append(message(MessageCode.NOT_A_REQUEST))
+                suggestions.append(message(MessageCode.ASK_CLEARLY))
 
         elif principle_key == "context":
             if len(prompt.split()) < 10:
-                issues.append("충분한 배경 정보 부족")
-                suggestions.append("작업의 배경과 관련 정보를 더 제공해주세요")
+                issues.append(message(MessageCode.CONTEXT_INSUFFICIENT))
+                suggestions.append(message(MessageCode.PROVIDE_BACKGROUND))
 
         elif principle_key == "examples":
-            if "예시" not in prompt and "예를" not in prompt:
-                issues.append("구체적인 예시 부재")
-                suggestions.append("기대하는 결과물의 예시를 포함해주세요")
+            if not any(indicator in hits for indicator in self.EXAMPLE_INDICATORS):
+                issues.append(message(MessageCode.EXAMPLES_MISSING))
+                suggestions.append(message(MessageCode.INCLUDE_EXAMPLES))
 
         elif principle_key == "role":
-            role_indicators = ["역할", "전문가", "관점", "입장"]
-            if not any(indicator in prompt for indicator in role_indicators):
-                issues.append("AI 역할이 정의되지 않음")
-                suggestions.append("AI에게 특정 역할을 부여해주세요 (예: '전문가로서', '관리자 관점에서')")
+            if not any(indicator in hits for indicator in self.ROLE_INDICATORS):
+                issues.append(message(MessageCode.ROLE_UNDEFINED))
+                suggestions.append(message(MessageCode.ASSIGN_ROLE))
 
         elif principle_key == "format":
-            format_indicators = ["형식", "방식", "구조", "템플릿"]
-            if not any(indicator in prompt for indicator in format_indicators):
-                issues.append("출력 형식이 지정되지 않음")
-                suggestions.append("원하는 결과물의 형식이나 구조를 명시해주세요")
+            if not any(indicator in hits for indicator in self.FORMAT_INDICATORS):
+                issues.append(message(MessageCode.FORMAT_UNSPECIFIED))
+                suggestions.append(message(MessageCode.SPECIFY_FORMAT))
 
         elif principle_key == "constraints":
-            if not any(negative in prompt for negative in ["하지 않도록", "피해", "제외", "주의"]):
-                issues.append("피해야 할 사항이 명시되지 않음")
-                suggestions.append("원치 않는 결과나 피해야 할 사항을 명시해주세요")
-
-        # 점수 제한 (1-5)
-        score = max(1, min(5, score))
+            if not any(negative in hits for negative in self.NEGATIVE_INDICATORS):
+                issues.append(message(MessageCode.CONSTRAINTS_UNSPECIFIED))
+                suggestions.append(message(MessageCode.SPECIFY_CONSTRAINTS))
 
-        return score, issues, suggestions
+        return issues, suggestions
 
     def analyze(self, prompt: str, domain: Domain = Domain.AUTO,
-                optimization_level: OptimizationLevel = OptimizationLevel.BALANCED) -> AnalysisResult:
-        """전체 프롬프트 분석 수행"""
+                optimization_level: OptimizationLevel = OptimizationLevel.BALANCED,
+                hits: Optional[Set[str]] = None, token_count: Optional[int] = None) -> AnalysisResult:
+        """
+        전체 프롬프트 분석 수행
+
+        Args:
+            prompt: 분석할 프롬프트
+            domain: 도메인 (AUTO면 자동 감지)
+            optimization_level: 최적화 레벨
+            hits: 미리 계산한 키워드 히트 집합 (None이면 새로 매칭)
+            token_count: 미리 계산한 토큰 수 (None이면 새로 계산)
+
+        Returns:
+            분석 결과
+        """
+
+        # 전체 키워드 매칭 (1회 순회)
+        if hits is None:
+            hits = self.find_keywords(prompt)
 
         # 도메인 자동 감지
         if domain == Domain.AUTO:
-            domain = self.detect_domain(prompt)
+            domain = self.detect_domain(prompt, hits)
 
         # 기본 정보 계산
-        token_count = self.estimate_token_count(prompt)
-        detected_intent = self.detect_intent(prompt)
+        if token_count is None:
+            token_count = self.estimate_token_count(prompt)
+        detected_intent = self.detect_intent(prompt, hits)
         complexity_level = self.calculate_complexity(prompt)
 
         # 7원칙 분석
@@ -357,25 +436,32 @@ class PromptAnalyzer:
         all_suggestions = []
 
         for principle_key in self.principles.keys():
-            score, issues, suggestions = self.analyze_principle(prompt, principle_key)
+            score, issues, suggestions = self.analyze_principle(prompt, principle_key, hits)
             scores[principle_key] = score
             all_issues.extend(issues)
             all_suggestions.extend(suggestions)
 
+        return self._build_result(prompt, domain, optimization_level, scores, all_issues, all_suggestions,
+                                  token_count, detected_intent, complexity_level)
+
+    def _build_result(self, prompt: str, domain: Domain, optimization_level: OptimizationLevel,
+                      scores: Dict[str, int], all_issues: List[Message], all_suggestions: List[Message],
+                      token_count: int, detected_intent: str, complexity_level: str) -> AnalysisResult:
+        """원칙별 분석 결과를 최적화 레벨에 맞게 정리해 분석 결과 생성"""
         # 총점 계산
         total_score = sum(scores.values()) / len(scores)
 
         # 최적화 레벨에 따른 필터링
         if optimization_level == OptimizationLevel.CONSERVATIVE:
             # 보수적: 중요한 이슈만
-            all_issues = [issue for issue in all_issues if "너무 짧아" in issue or "부족" in issue]
+            all_issues = [issue for issue in all_issues if issue.code in self.CONSERVATIVE_ISSUES]
             all_suggestions = all_suggestions[:3]
         elif optimization_level == OptimizationLevel.AGGRESSIVE:
             # 적극적: 모든 개선 제안
             all_suggestions.extend([
-                "더 구체적인 수치나 목표를 추가해보세요",
-                "실제 사용 사례를 포함해보세요",
-                "결과물의 활용 방법을 명시해보세요"
+                message(MessageCode.ADD_METRICS),
+                message(MessageCode.ADD_USE_CASES),
+                message(MessageCode.DESCRIBE_USAGE)
             ])
 
         return AnalysisResult(
@@ -0,0 +1,263 @@
+"""
+Batch Analyzer
+NumPy 행렬 연산 기반 대량 프롬프트 분석기
+
+N개의 프롬프트를 키워드 오토마톤으로 한 번씩 순회해 희소 키워드 히트 행렬(CSR)을 만들고,
+7원칙 점수, 도메인 점수(simple/compound/weighted), 의도 점수를
+히트 행렬 × 키워드 가중치 행렬 연산으로 한꺼번에 계산합니다.
+점수 제한 규칙과 동점 처리(먼저 정의된 항목 우선)는 PromptAnalyzer와 같습니다.
+
+NumPy가 필요합니다 (선택 의존성: pip install numpy).
+대량 아카이브는 메모리를 일정하게 유지하도록 적당한 크기(예: 10만 건)로 나눠 호출하세요.
+
+사용 예:
+    batch = BatchAnalyzer()
+    scores = batch.score(prompts)
+    scores.principle_scores  # (N, 7) 정수 행렬
+    results = batch.analyze(prompts)  # PromptAnalyzer.analyze와 같은 AnalysisResult 목록
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    # 선택 의존성 (BatchAnalyzer 생성 시 오류)
+    np = None
+
+from .analyzer import AnalysisResult, Domain, OptimizationLevel, PromptAnalyzer
+
+
+@dataclass(frozen=True)
+class KeywordHitMatrix:
+    """프롬프트 × 키워드 희소 히트 행렬 (CSR, 값은 모두 1)"""
+    indptr: "np.ndarray"   # (N + 1,) 행 시작 위치
+    indices: "np.ndarray"  # (히트 수,) 히트한 키워드 열 번호 (행 안에서 오름차순)
+    keywords: Tuple[str, ...]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.indptr) - 1, len(self.keywords)
+
+    def row(self, index: int) -> Set[str]:
+        """한 프롬프트의 키워드 히트 집합"""
+        start, end = self.indptr[index], self.indptr[index + 1]
+        return {self.keywords[column] for column in self.indices[start:end]}
+
+    def to_dense(self) -> "np.ndarray":
+        """밀집 0/1 행렬로 변환"""
+        rows, columns = self.shape
+        dense = np.zeros((rows, columns), dtype=np.uint8)
+        dense[np.repeat(np.arange(rows), np.diff(self.indptr)), self.indices] = 1
+        return dense
+
+
+@dataclass(frozen=True)
+class BatchScores:
+    """대량 분석 점수 (행 순서는 입력 순서)"""
+    principle_keys: Tuple[str, ...]
+    principle_scores: "np.ndarray"  # (N, 원칙 수) 1~5 정수
+    total_scores: "np.ndarray"      # (N,) 원칙 점수 평균
+    domain_keys: Tuple[Domain, ...]
+    domain_scores: "np.ndarray"     # (N, 도메인 수) 가중치 합
+    domains: List[Domain]           # 감지된 도메인 (임계값 미만이면 Domain.AUTO)
+    intent_keys: Tuple[str, ...]
+    intent_scores: "np.ndarray"     # (N, 의도 수) 패턴 일치 수
+    intents: List[str]              # 감지된 의도 (일치 없으면 'general')
+
+
+class BatchAnalyzer:
+    """NumPy 행렬 연산으로 여러 프롬프트를 한꺼번에 채점하는 분석기"""
+
+    def __init__(self, analyzer: Optional[PromptAnalyzer] = None):
+        """
+        초기화
+
+        Args:
+            analyzer: 키워드 규칙과 이슈 분석에 사용할 분석기 (None이면 새로 생성)
+
+        Raises:
+            ImportError: NumPy가 설치되지 않은 경우
+        """
+        if np is None:
+            raise ImportError("BatchAnalyzer는 NumPy가 필요합니다 (pip install numpy)")
+
+        self.analyzer = analyzer if analyzer is not None else PromptAnalyzer()
+        self.keywords = self.analyzer.keyword_matcher.keywords
+        self._columns: Dict[str, int] = {keyword: column for column, keyword in enumerate(self.keywords)}
+
+        self.principle_keys = tuple(self.analyzer.principles)
+        self.domain_keys = tuple(self.analyzer.domain_keywords)
+        self.intent_keys = tuple(self.analyzer.intent_patterns)
+
+        # 키워드 × (원칙 키워드 | 원칙 지표 | 도메인 | 의도) 가중치 행렬
+        # 목록에 중복된 키워드는 PromptAnalyzer처럼 중복 횟수만큼 더해짐
+        groups: List[List[Tuple[str, float]]] = []
+        for principle in self.analyzer.principles.values():
+            groups.append([(keyword, 1.0) for keyword in principle["keywords"]])
+        for principle in self.analyzer.principles.values():
+            groups.append([(indicator, 1.0) for indicator in principle["indicators"]])
+        for keywords_dict in self.analyzer.domain_keywords.values():
+            groups.append(
+                [(keyword, 1.0) for keyword in keywords_dict.get("simple", [])]
+                + [(keyword, 2.0) for keyword in keywords_dict.get("compound", [])]
+                + list(keywords_dict.get("weighted", {}).items())
+            )
+        for patterns in self.analyzer.intent_patterns.values():
+            groups.append([(pattern, 1.0) for pattern in patterns])
+
+        weights = np.zeros((len(self.keywords), len(groups)), dtype=np.float64)
+        for group_index, group in enumerate(groups):
+            for keyword, weight in group:
+                column = self._columns.get(keyword)
+                if column is not None:
+                    weights[column, group_index] += weight
+        # 생성 후 변경하지 않으므로 스레드 간 공유 가능
+        weights.flags.writeable = False
+        self._weights = weights
+
+        principle_count = len(self.principle_keys)
+        domain_count = len(self.domain_keys)
+        self._slices = {
+            "keywords": slice(0, principle_count),
+            "indicators": slice(principle_count, 2 * principle_count),
+            "domains": slice(2 * principle_count, 2 * principle_count + domain_count),
+            "intents": slice(2 * principle_count + domain_count, len(groups))
+        }
+
+    def find_hits(self, prompts: Iterable[str]) -> List[Set[str]]:
+        """프롬프트별 키워드 히트 집합 (프롬프트마다 오토마톤 1회 순회)"""
+        find_all = self.analyzer.keyword_matcher.find_all
+        return [find_all(prompt.lower()) for prompt in prompts]
+
+    def hit_matrix(self, prompts: Iterable[str], hits: Optional[Sequence[Set[str]]] = None) -> KeywordHitMatrix:
+        """
+        희소 키워드 히트 행렬 생성
+
+        Args:
+            prompts: 프롬프트 목록
+            hits: 미리 계산한 프롬프트별 히트 집합 (None이면 새로 매칭)
+
+        Returns:
+            CSR 형식 히트 행렬
+        """
+        if hits is None:
+            hits = self.find_hits(prompts)
+
+        columns = self._columns
+        indptr = np.zeros(len(hits) + 1, dtype=np.int64)
+        indices: List[int] = []
+        for row, row_hits in enumerate(hits):
+            indices.extend(sorted(columns[keyword] for keyword in row_hits))
+            indptr[row + 1] = len(indices)
+
+        return KeywordHitMatrix(indptr, np.asarray(indices, dtype=np.int64), self.keywords)
+
+    def _group_sums(self, matrix: KeywordHitMatrix) -> "np.ndarray":
+        """히트 행렬 × 가중치 행렬 (행별로 히트한 키워드의 가중치 합)"""
+        rows = matrix.shape[0]
+        sums = np.zeros((rows, self._weights.shape[1]), dtype=np.float64)
+        if len(matrix.indices):
+            starts = matrix.indptr[:-1]
+            nonempty = starts < matrix.indptr[1:]
+            # 빈 행을 제외한 행 시작 위치로 구간 합 (각 구간은 다음 비어 있지 않은 행 직전까지)
+            sums[nonempty] = np.add.reduceat(self._weights[matrix.indices], starts[nonempty], axis=0)
+        return sums
+
+    def score(self, prompts: Sequence[str], hits: Optional[Sequence[Set[str]]] = None) -> BatchScores:
+        """
+        원칙, 도메인, 의도 점수를 한꺼번에 계산
+
+        Args:
+            prompts: 프롬프트 목록
+            hits: 미리 계산한 프롬프트별 히트 집합 (None이면 새로 매칭)
+
+        Returns:
+            대량 분석 점수
+        """
+        return self._score(self.hit_matrix(prompts, hits))
+
+    def _score(self, matrix: KeywordHitMatrix) -> BatchScores:
+        sums = self._group_sums(matrix)
+
+        # 원칙 점수: 기본 1점 + 키워드 최대 2점 + 지표 최대 2점, 1~5로 제한
+        keyword_matches = sums[:, self._slices["keywords"]]
+        indicator_matches = sums[:, self._slices["indicators"]]
+        principle_scores = np.clip(
+            1 + np.minimum(keyword_matches, 2) + np.minimum(indicator_matches, 2), 1, 5
+        ).astype(np.int64)
+        total_scores = principle_scores.sum(axis=1) / len(self.principle_keys)
+
+        # 도메인: 최고 점수(동점이면 먼저 정의된 도메인)가 신뢰도 임계값 1.0 이상일 때만 선택
+        domain_scores = sums[:, self._slices["domains"]]
+        best_domains = domain_scores.argmax(axis=1)
+        confident = domain_scores.max(axis=1, initial=0.0) >= 1.0
+        domains = [self.domain_keys[best] if ok else Domain.AUTO
+                   for best, ok in zip(best_domains.tolist(), confident.tolist())]
+
+        # 의도: 최고 일치 수(동점이면 먼저 정의된 의도), 일치가 없으면 general
+        intent_scores = sums[:, self._slices["intents"]].astype(np.int64)
+        best_intents = intent_scores.argmax(axis=1)
+        matched = intent_scores.max(axis=1, initial=0) > 0
+        intents = [self.intent_keys[best] if ok else "general"
+                   for best, ok in zip(best_intents.tolist(), matched.tolist())]
+
+        return BatchScores(
+            principle_keys=self.principle_keys,
+            principle_scores=principle_scores,
+            total_scores=total_scores,
+            domain_keys=self.domain_keys,
+            domain_scores=domain_scores,
+            domains=domains,
+            intent_keys=self.intent_keys,
+            intent_scores=intent_scores,
+            intents=intents
+        )
+
+    def analyze(self, prompts: Sequence[str], domain: Domain = Domain.AUTO,
+                optimization_level: OptimizationLevel = OptimizationLevel.BALANCED) -> List[AnalysisResult]:
+        """
+        여러 프롬프트 전체 분석 (PromptAnalyzer.analyze와 같은 결과)
+
+        점수는 행렬 연산으로 계산하고, 이슈/제안, 복잡도, 토큰 수는 프롬프트별로 계산합니다.
+
+        Args:
+            prompts: 분석할 프롬프트 목록
+            domain: 도메인 (AUTO면 프롬프트별 자동 감지)
+            optimization_level: 최적화 레벨
+
+        Returns:
+            입력 순서대로 분석 결과 목록
+        """
+        analyzer = self.analyzer
+        hits = self.find_hits(prompts)
+        scores = self._score(self.hit_matrix(prompts, hits))
+        principle_scores = scores.principle_scores.tolist()
+
+        results = []
+        for index, prompt in enumerate(prompts):
+            row_hits = hits[index]
+            row_scores = {}
+            all_issues = []
+            all_suggestions = []
+
+            for principle_key, score in zip(self.principle_keys, principle_scores[index]):
+                row_scores[principle_key] = score
+                issues, suggestions = analyzer._principle_feedback(prompt, principle_key, row_hits)
+                all_issues.extend(issues)
+                all_suggestions.extend(suggestions)
+
+            results.append(analyzer._build_result(
+                prompt,
+                scores.domains[index] if domain == Domain.AUTO else domain,
+                optimization_level,
+                row_scores,
+                all_issues,
+                all_suggestions,
+                analyzer.estimate_token_count(prompt),
+                scores.intents[index],
+                analyzer.calculate_complexity(prompt)
+            ))
+
+        return results
@@ -0,0 +1,723 @@
+"""
+Result Cache
+처리 결과 캐시
+
+같은 입력(프롬프트, 도메인, 최적화 레벨, 실행 모드, 템플릿, 패턴 버전)에 대한 결과를
+내용 해시 키로 저장해 파이프라인을 다시 실행하지 않도록 합니다.
+
+- CacheBackend: 캐시 백엔드 인터페이스
+- LRUCache: 개수/메모리 상한과 TTL을 지원하는 프로세스 내 LRU 캐시
+- SQLiteCache: 여러 프로세스가 공유하는 디스크 캐시 (WAL 모드, 일괄 쓰기)
+- SharedMemoryCache: pre-fork 워커들이 공유하는 공유 메모리 해시 테이블
+
+주의: SQLiteCache/SharedMemoryCache는 pickle로 직렬화하므로 직접 만든 신뢰할 수 있는 캐시 파일만 사용하세요.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+import weakref
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+# 캐시 값(결과 객체) 형식 버전 - 결과 형식이 바뀌면 올려서 이전 형식으로 저장된 항목을 사용하지 않음
+CACHE_FORMAT_VERSION = 2
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    캐시 키 생성 (입력 값들의 sha256)
+
+    Args:
+        parts: 키를 구성하는 값들 (JSON으로 표현 가능한 값, Enum은 value 사용)
+
+    Returns:
+        16진수 해시 문자열
+    """
+    payload = json.dumps(
+        (CACHE_FORMAT_VERSION,) + parts,
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(',', ':'),
+        default=lambda value: value.value if isinstance(value, Enum) else str(value)
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    결과 객체의 대략적인 메모리 크기 (바이트)
+
+    dataclass, dict, list/tuple, 문자열을 재귀적으로 따라가며 sys.getsizeof를 합산합니다.
+    공유되는 Enum 멤버는 제외합니다.
+    """
+    seen = set()
+    stack = [value]
+    total = 0
+
+    while stack:
+        item = stack.pop()
+        if item is None or isinstance(item, Enum) or id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif is_dataclass(item):
+            stack.extend(getattr(item, field.name) for field in fields(item))
+
+    return total
+
+
+class CacheBackend(ABC):
+    """캐시 백엔드 인터페이스"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """키에 해당하는 값 조회 (없거나 만료되면 None)"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any):
+        """값 저장"""
+
+    @abstractmethod
+    def clear(self):
+        """모든 항목 제거"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+
+
+class LRUCache(CacheBackend):
+    """개수/메모리 상한과 TTL을 지원하는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = 64 * 1024 * 1024,
+                 ttl: Optional[float] = None, sizeof: Callable[[Any], int] = estimate_size):
+        """
+        초기화
+
+        Args:
+            max_entries: 최대 항목 수
+            max_bytes: 최대 메모리 사용량 (None이면 제한 없음)
+            ttl: 항목 유효 시간 (초, None이면 만료 없음)
+            sizeof: 항목 크기 계산 함수
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+
+        self._lock = threading.Lock()
+        # {키: (값, 크기, 만료 시각)} - 가장 최근에 사용한 항목이 끝
+        self._entries: "OrderedDict[str, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __getstate__(self):
+        # 다른 프로세스로 전달하면 같은 설정의 빈 캐시가 됨 (항목은 프로세스 간 공유하지 않음)
+        return {'max_entries': self.max_entries, 'max_bytes': self.max_bytes,
+                'ttl': self.ttl, 'sizeof': self.sizeof}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any):
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            # 상한보다 큰 항목은 다른 항목을 모두 밀어내므로 저장하지 않음
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+
+            # 오래 사용하지 않은 항목부터 제거
+            while (len(self._entries) > self.max_entries
+                   or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups * 100) if lookups > 0 else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+
+# 종료 시 남은 쓰기를 반영할 SQLite 캐시들
+_open_sqlite_caches: "weakref.WeakSet[SQLiteCache]" = weakref.WeakSet()
+
+
+def _flush_sqlite_caches():
+    if not _open_sqlite_caches:
+        return
+
+    import sqlite3
+    for cache in list(_open_sqlite_caches):
+        try:
+            cache.flush()
+        except sqlite3.Error:
+            pass
+
+
+atexit.register(_flush_sqlite_caches)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    SQLite 기반 디스크 캐시
+
+    - WAL 모드로 여러 프로세스가 동시에 읽고 쓸 수 있음
+    - 쓰기는 batch_size개 또는 flush_interval초마다 한 트랜잭션으로 모아서 반영
+    - 값은 pickle + zlib로 압축 저장
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+      (전체 크기는 트리거가 같은 트랜잭션 안에서 meta 테이블에 누적하므로 테이블을 스캔하지 않음)
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            expires_at REAL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+        CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+        CREATE TABLE IF NOT EXISTS meta (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries BEGIN
+            UPDATE meta SET value = value + NEW.size WHERE name = 'total_size';
+        END;
+        CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries BEGIN
+            UPDATE meta SET value = value - OLD.size WHERE name = 'total_size';
+        END;
+        CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries BEGIN
+            UPDATE meta SET value = value - OLD.size + NEW.size WHERE name = 'total_size';
+        END;
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = 256 * 1024 * 1024,
+                 ttl: Optional[float] = None, batch_size: int = 32,
+                 flush_interval: float = 1.0, compress_level: int = 6):
+        """
+        초기화
+
+        Args:
+            path: 캐시 파일 경로
+            max_bytes: 저장된 값의 최대 총 크기 (None이면 제한 없음)
+            ttl: 항목 유효 시간 (초, None이면 만료 없음)
+            batch_size: 한 번에 반영할 쓰기 수
+            flush_interval: 쓰기를 반영하는 최대 간격 (초)
+            compress_level: zlib 압축 레벨
+        """
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compress_level = compress_level
+
+        self._lock = threading.Lock()
+        self._connection: Optional["sqlite3.Connection"] = None
+        self._pid: Optional[int] = None
+        # 아직 반영하지 않은 쓰기 {키: (압축된 값, 만료 시각)}와 사용 시각 갱신 {키: 사용 시각}
+        self._pending: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._touched: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        _open_sqlite_caches.add(self)
+
+    def __getstate__(self):
+        # 다른 프로세스로 전달하면 같은 파일에 새로 연결 (반영하지 않은 쓰기는 전달하지 않음)
+        return {'path': self.path, 'max_bytes': self.max_bytes, 'ttl': self.ttl,
+                'batch_size': self.batch_size, 'flush_interval': self.flush_interval,
+                'compress_level': self.compress_level}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _connect(self) -> "sqlite3.Connection":
+        """현재 프로세스의 연결 반환 (fork된 자식 프로세스는 새로 연결)"""
+        if self._connection is None or self._pid != os.getpid():
+            import sqlite3
+            connection = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False,
+                                         isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            # INSERT OR REPLACE가 기존 행을 지울 때도 삭제 트리거 실행
+            connection.execute("PRAGMA recursive_triggers=ON")
+            connection.executescript(self.SCHEMA)
+            self._init_total_size(connection)
+            self._connection = connection
+            self._pid = os.getpid()
+            self._pending.clear()
+            self._touched.clear()
+        return self._connection
+
+    @staticmethod
+    def _init_total_size(connection: "sqlite3.Connection"):
+        """전체 크기 행이 없으면(새 파일 또는 이전 버전 파일) 현재 항목 크기로 한 번 계산"""
+        if connection.execute("SELECT 1 FROM meta WHERE name = 'total_size'").fetchone() is not None:
+            return
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR IGNORE INTO meta (name, value) "
+                "SELECT 'total_size', COALESCE(SUM(size), 0) FROM entries"
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _total_size(connection: "sqlite3.Connection") -> int:
+        """저장된 값의 전체 크기 (meta 테이블의 누적 값)"""
+        row = connection.execute("SELECT value FROM meta WHERE name = 'total_size'").fetchone()
+        return row[0] if row is not None else 0
+
+    def _serialize(self, value: Any) -> bytes:
+        return zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), self.compress_level)
+
+    @staticmethod
+    def _deserialize(blob: bytes) -> Any:
+        return pickle.loads(zlib.decompress(blob))
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            pending = self._pending.get(key)
+            if pending is not None:
+                blob, expires_at = pending
+            else:
+                row = connection.execute(
+                    "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                blob, expires_at = row
+
+            if expires_at is not None and expires_at <= now:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._touched[key] = now
+            self._maybe_flush()
+
+        return self._deserialize(blob)
+
+    def set(self, key: str, value: Any):
+        blob = self._serialize(value)
+        if self.max_bytes is not None and len(blob) > self.max_bytes:
+            return
+
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._connect()
+            self._pending[key] = (blob, expires_at)
+            self._maybe_flush()
+
+    def _maybe_flush(self):
+        if (len(self._pending) + len(self._touched) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self._flush_locked()
+
+    def flush(self):
+        """모아 둔 쓰기를 디스크에 반영"""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if not self._pending and not self._touched:
+            return
+
+        now = time.time()
+        pending = [
+            (key, blob, len(blob), expires_at, now)
+            for key, (blob, expires_at) in self._pending.items()
+        ]
+        touched = [(accessed_at, key) for key, accessed_at in self._touched.items()]
+
+        connection = self._connection
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                pending
+            )
+            connection.executemany("UPDATE entries SET accessed_at = ? WHERE key = ?", touched)
+            connection.execute(
+                "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            )
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            # 반영하지 못한 쓰기는 다음 flush에서 다시 시도
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+
+        # 커밋된 뒤에만 제거 (잠금 안이므로 그동안 추가된 쓰기는 없음)
+        self._pending.clear()
+        self._touched.clear()
+
+    def _evict(self, connection: "sqlite3.Connection"):
+        """전체 크기가 상한을 넘으면 가장 오래 사용하지 않은 항목부터 제거"""
+        if self.max_bytes is None:
+            return
+
+        excess = self._total_size(connection) - self.max_bytes
+        if excess <= 0:
+            return
+
+        victims: List[Tuple[str]] = []
+        for key, size in connection.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        connection.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def clear(self):
+        with self._lock:
+            connection = self._connect()
+            self._pending.clear()
+            self._touched.clear()
+            connection.execute("DELETE FROM entries")
+
+    def close(self):
+        """남은 쓰기를 반영하고 연결 종료"""
+        self.flush()
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+        _open_sqlite_caches.discard(self)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            connection = self._connect()
+            entries = connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            size = self._total_size(connection)
+            lookups = self.hits + self.misses
+            return {
+                "backend": "sqlite",
+                "path": self.path,
+                "entries": entries,
+                "pending_writes": len(self._pending),
+                "bytes": size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups * 100) if lookups > 0 else 0.0,
+                "evictions": self.evictions
+            }
+
+
+class SharedMemoryCache(CacheBackend):
+    """
+    multiprocessing.shared_memory 기반 호스트 공유 캐시
+
+    고정 크기 해시 테이블로, 각 버킷은 ways개의 슬롯을 가집니다.
+    슬롯 = [seq(u64) | 키 해시(32B) | 저장 시각(f64) | 길이(u32) | 직렬화된 값]
+
+    - 읽기는 잠금 없이 수행 (seqlock: seq가 홀수이거나 읽는 도중 바뀌면 다시 읽음)
+    - 쓰기는 버킷별 잠금 스트라이프(multiprocessing.Lock)로 직렬화
+    - 버킷이 가득 차면 가장 오래 저장된 슬롯을 교체
+    - 슬롯에 들어가지 않는 큰 값은 저장하지 않음
+
+    워커를 fork하기 전에 부모 프로세스에서 생성하세요. 잠금은 fork 또는
+    multiprocessing의 initargs를 통해서만 자식 프로세스에 전달됩니다.
+    """
+
+    MAGIC = b"CPOSHM\x00\x00"
+    _SEGMENT_HEADER = struct.Struct("<8sIII")  # magic, 버킷 수, 버킷당 슬롯 수, 슬롯 크기
+    _SLOT_HEADER = struct.Struct("<Q32sdI")  # seq, 키 해시, 저장 시각, 값 길이
+    _SEQ = struct.Struct("<Q")
+
+    def __init__(self, buckets: int = 4096, ways: int = 4, slot_size: int = 8192,
+                 ttl: Optional[float] = None, lock_stripes: int = 64,
+                 name: Optional[str] = None, compress_level: int = 6, read_retries: int = 8,
+                 context=None):
+        """
+        초기화 (새 공유 메모리 세그먼트 생성)
+
+        Args:
+            buckets: 버킷 수
+            ways: 버킷당 슬롯 수
+            slot_size: 슬롯 크기 (바이트, 헤더 포함)
+            ttl: 항목 유효 시간 (초, None이면 만료 없음)
+            lock_stripes: 쓰기 잠금 개수 (버킷 % lock_stripes 번째 잠금 사용)
+            name: 공유 메모리 이름 (None이면 자동 생성)
+            compress_level: zlib 압축 레벨
+            read_retries: 쓰기와 겹친 읽기의 최대 재시도 횟수
+            context: 워커를 만들 multiprocessing 컨텍스트 (None이면 기본 컨텍스트)
+        """
+        if slot_size <= self._SLOT_HEADER.size:
+            raise ValueError(f"slot_size는 {self._SLOT_HEADER.size}바이트보다 커야 합니다")
+
+        self.buckets = buckets
+        self.ways = ways
+        self.slot_size = slot_size
+        self.ttl = ttl
+        self.compress_level = compress_level
+        self.read_retries = read_retries
+
+        import multiprocessing
+        from multiprocessing import shared_memory
+
+        size = self._SEGMENT_HEADER.size + buckets * ways * slot_size
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._SEGMENT_HEADER.pack_into(self._shm.buf, 0, self.MAGIC, buckets, ways, slot_size)
+        context = context if context is not None else multiprocessing.get_context()
+        self._locks = [context.Lock() for _ in range(lock_stripes)]
+        self._owner_pid = os.getpid()
+        self._init_counters()
+
+    def _init_counters(self):
+        # 통계는 프로세스별로 집계
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.skipped = 0
+
+    @property
+    def name(self) -> str:
+        """공유 메모리 이름"""
+        return self._shm.name
+
+    def __getstate__(self):
+        # spawn 방식 워커로 전달할 때는 이름으로 다시 연결
+        state = self.__dict__.copy()
+        state['_shm'] = self._shm.name
+        return state
+
+    def __setstate__(self, state):
+        from multiprocessing import shared_memory
+
+        self.__dict__.update(state)
+        self._shm = shared_memory.SharedMemory(name=state['_shm'])
+        self._init_counters()
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        """키를 32바이트 해시로 변환 (make_cache_key의 16진수 키는 그대로 사용)"""
+        if len(key) == 64:
+            try:
+                return bytes.fromhex(key)
+            except ValueError:
+                pass
+        return hashlib.sha256(key.encode('utf-8')).digest()
+
+    def _bucket(self, digest: bytes) -> int:
+        return int.from_bytes(digest[:8], 'little') % self.buckets
+
+    def _slot_offset(self, bucket: int, way: int) -> int:
+        return self._SEGMENT_HEADER.size + (bucket * self.ways + way) * self.slot_size
+
+    def _read_slot(self, offset: int, digest: bytes) -> Optional[Tuple[float, bytes]]:
+        """슬롯을 잠금 없이 읽기 (다른 키이거나 쓰기와 계속 겹치면 None)"""
+        buf = self._shm.buf
+        header_size = self._SLOT_HEADER.size
+
+        for _ in range(self.read_retries):
+            seq, slot_digest, stamp, length = self._SLOT_HEADER.unpack_from(buf, offset)
+            if seq & 1:
+                # 쓰는 중
+                continue
+
+            payload = None
+            if slot_digest == digest and length:
+                payload = bytes(buf[offset + header_size:offset + header_size + length])
+
+            if self._SEQ.unpack_from(buf, offset)[0] == seq:
+                return (stamp, payload) if payload is not None else None
+
+        return None
+
+    def get(self, key: str) -> Optional[Any]:
+        digest = self._digest(key)
+        bucket = self._bucket(digest)
+
+        for way in range(self.ways):
+            found = self._read_slot(self._slot_offset(bucket, way), digest)
+            if found is None:
+                continue
+
+            stamp, payload = found
+            if self.ttl is not None and stamp + self.ttl <= time.time():
+                break
+
+            try:
+                value = pickle.loads(zlib.decompress(payload))
+            except Exception:
+                break
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any):
+        payload = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), self.compress_level)
+        if len(payload) > self.slot_size - self._SLOT_HEADER.size:
+            self.skipped += 1
+            return
+
+        digest = self._digest(key)
+        bucket = self._bucket(digest)
+        buf = self._shm.buf
+
+        with self._locks[bucket % len(self._locks)]:
+            # 같은 키 → 빈 슬롯 → 가장 오래된 슬롯 순으로 선택
+            target = None
+            oldest = None
+            for way in range(self.ways):
+                offset = self._slot_offset(bucket, way)
+                _, slot_digest, stamp, length = self._SLOT_HEADER.unpack_from(buf, offset)
+                if slot_digest == digest:
+                    target = offset
+                    break
+                if length == 0:
+                    if target is None:
+                        target = offset
+                elif oldest is None or stamp < oldest[0]:
+                    oldest = (stamp, offset)
+
+            if target is None:
+                target = oldest[1]
+                self.evictions += 1
+
+            # seq를 홀수로 만든 뒤 기록하고, 다시 짝수로 만들어 읽기 측에 완료를 알림
+            seq = self._SEQ.unpack_from(buf, target)[0]
+            self._SEQ.pack_into(buf, target, seq + 1)
+            header_size = self._SLOT_HEADER.size
+            buf[target + header_size:target + header_size + len(payload)] = payload
+            self._SLOT_HEADER.pack_into(buf, target, seq + 1, digest, time.time(), len(payload))
+            self._SEQ.pack_into(buf, target, seq + 2)
+            self.writes += 1
+
+    def clear(self):
+        buf = self._shm.buf
+        for bucket in range(self.buckets):
+            with self._locks[bucket % len(self._locks)]:
+                for way in range(self.ways):
+                    offset = self._slot_offset(bucket, way)
+                    seq = self._SEQ.unpack_from(buf, offset)[0]
+                    self._SEQ.pack_into(buf, offset, seq + 1)
+                    self._SLOT_HEADER.pack_into(buf, offset, seq + 1, bytes(32), 0.0, 0)
+                    self._SEQ.pack_into(buf, offset, seq + 2)
+
+    def close(self):
+        """세그먼트 연결 해제 (생성한 프로세스에서는 세그먼트도 삭제)"""
+        shm = self._shm
+        shm.close()
+        if os.getpid() == self._owner_pid:
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        buf = self._shm.buf
+        used = 0
+        for bucket in range(self.buckets):
+            for way in range(self.ways):
+                if self._SLOT_HEADER.unpack_from(buf, self._slot_offset(bucket, way))[3]:
+                    used += 1
+
+        lookups = self.hits + self.misses
+        return {
+            "backend": "shared_memory",
+            "name": self.name,
+            "slots": self.buckets * self.ways,
+            "entries": used,
+            "bytes": self._shm.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups * 100) if lookups > 0 else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "skipped": self.skipped
+        }
@@ -0,0 +1,352 @@
+"""
+Command Line Interface
+JSONL 스트리밍 최적화 파이프라인
+
+표준 입력 또는 파일에서 한 줄에 하나씩 프롬프트를 읽어 최적화 결과를 JSONL로 출력합니다.
+입력은 필요한 만큼만 읽고 처리 중인 묶음 수를 제한하므로 입력 크기와 관계없이
+메모리 사용량이 일정합니다. 출력 순서는 입력 순서와 같습니다.
+
+입력 형식 (한 줄에 하나):
+    "프롬프트 문자열"
+    {"id": "a1", "prompt": "...", "domain": "development", "optimization_level": "balanced",
+     "execution_mode": "optimize", "template_id": null, "template_variables": null}
+
+출력 형식 (한 줄에 하나):
+    claude: OptimizationResponse 필드 (+ 입력에 id가 있으면 id)
+    gpt5: GPT5PipelineResult.to_dict() (+ 입력에 id가 있으면 id)
+    입력 오류: {"success": false, "message": "...", "source": "파일", "line": 줄 번호}
+
+사용 예:
+    python -m scripts < prompts.jsonl > results.jsonl
+    python -m scripts --engine gpt5 --workers 8 dump-*.jsonl -o results.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict
+from enum import Enum
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .messages import Message
+from .parallel import map_chunks
+
+
+# 엔진 종류
+ENGINES = ("claude", "gpt5")
+
+# 워커 프로세스의 엔진과 기본 요청 설정 (워커마다 한 번 초기화)
+_engine = None
+_settings: Dict[str, Any] = {}
+
+
+def _json_default(value: Any) -> Any:
+    """JSON으로 직접 변환되지 않는 값 변환"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Message):
+        return value.text
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_json_line(record: Dict[str, Any]) -> str:
+    """레코드를 JSONL 한 줄로 변환"""
+    return json.dumps(record, ensure_ascii=False, default=_json_default)
+
+
+def _init_worker(engine: str, settings: Dict[str, Any]):
+    """워커 초기화 (엔진 생성과 패턴 로드)"""
+    global _engine, _settings
+    _settings = settings
+
+    if engine == "gpt5":
+        from .gpt5_core import GPT5Engine
+        _engine = GPT5Engine(settings.get("patterns_file"))
+    else:
+        from .core import ClaudePromptOptimizer
+        _engine = ClaudePromptOptimizer(settings.get("patterns_dir"))
+        _engine.ensure_loaded()
+
+
+def _parse_line(raw: bytes) -> Dict[str, Any]:
+    """입력 한 줄을 {'prompt', ...} 레코드로 변환"""
+    record = json.loads(raw)
+    if isinstance(record, str):
+        return {"prompt": record}
+    if not isinstance(record, dict) or not isinstance(record.get("prompt"), str):
+        raise ValueError("입력은 문자열 또는 'prompt' 문자열 필드가 있는 객체여야 합니다")
+    return record
+
+
+def _process_claude(record: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+    from .analyzer import Domain, OptimizationLevel
+    from .core import ExecutionMode, OptimizationRequest
+
+    request = OptimizationRequest(
+        prompt=record["prompt"],
+        domain=Domain(record.get("domain", _settings["domain"])),
+        optimization_level=OptimizationLevel(record.get("optimization_level", _settings["optimization_level"])),
+        execution_mode=ExecutionMode(record.get("execution_mode", _settings["execution_mode"])),
+        template_id=record.get("template_id"),
+        template_variables=record.get("template_variables")
+    )
+    response = _engine.process_request(request)
+    return response.success, asdict(response)
+
+
+def _process_gpt5(record: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+    return True, _engine.analyze_and_optimize(record["prompt"]).to_dict()
+
+
+def _process_lines(lines: List[Tuple[str, int, bytes]]) -> List[Tuple[bool, str]]:
+    """
+    입력 줄 묶음 처리 (워커에서 실행)
+
+    Args:
+        lines: (입력 이름, 줄 번호, 원본 줄) 목록
+
+    Returns:
+        (성공 여부, 출력 JSON 줄) 목록
+    """
+    process = _process_gpt5 if _settings["engine"] == "gpt5" else _process_claude
+    results = []
+
+    for source, line_number, raw in lines:
+        try:
+            record = _parse_line(raw)
+            success, output = process(record)
+            if "id" in record:
+                output = {"id": record["id"], **output}
+        except Exception as e:
+            success, output = False, {
+                "success": False,
+                "message": f"오류가 발생했습니다: {str(e)}",
+                "source": source,
+                "line": line_number
+            }
+        results.append((success, to_json_line(output)))
+
+    return results
+
+
+def _chunk_failure(lines: List[Tuple[str, int, bytes]], error: BaseException) -> List[Tuple[bool, str]]:
+    """묶음 단위 오류(워커 종료 등)를 각 줄의 오류 레코드로 변환"""
+    return [
+        (False, to_json_line({
+            "success": False,
+            "message": f"오류가 발생했습니다: {str(error)}",
+            "source": source,
+            "line": line_number
+        }))
+        for source, line_number, _ in lines
+    ]
+
+
+def iter_input_lines(paths: Sequence[str]) -> Iterator[Tuple[str, int, bytes]]:
+    """
+    입력 파일들의 비어 있지 않은 줄을 차례로 읽기 ('-'는 표준 입력)
+
+    Args:
+        paths: 입력 파일 경로 목록
+
+    Returns:
+        (입력 이름, 줄 번호, 원본 줄) 이터레이터
+    """
+    for path in paths:
+        if path == "-":
+            stream, source = sys.stdin.buffer, "<stdin>"
+        else:
+            stream, source = open(path, "rb"), path
+
+        try:
+            for line_number, raw in enumerate(stream, 1):
+                if raw.strip():
+                    yield source, line_number, raw
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+
+class ProgressReporter:
+    """처리량을 주기적으로 표준 오류에 출력"""
+
+    def __init__(self, interval: float, stream=None):
+        """
+        초기화
+
+        Args:
+            interval: 출력 주기 (초, 0 이하면 출력하지 않음)
+            stream: 출력 스트림 (None이면 표준 오류)
+        """
+        self.interval = interval
+        self.stream = stream if stream is not None else sys.stderr
+        self.started = time.monotonic()
+        self.last_report = self.started
+        self.records = 0
+        self.errors = 0
+
+    def add(self, records: int, errors: int):
+        """처리 결과 반영 (주기가 지났으면 출력)"""
+        self.records += records
+        self.errors += errors
+        if self.interval > 0 and time.monotonic() - self.last_report >= self.interval:
+            self.report()
+
+    def report(self, final: bool = False):
+        """현재 처리량 출력"""
+        now = time.monotonic()
+        elapsed = max(now - self.started, 1e-9)
+        label = "완료" if final else "처리 중"
+        print(f"[{label}] {self.records}건, {self.records / elapsed:.1f}건/초, "
+              f"오류 {self.errors}건, {elapsed:.1f}초", file=self.stream, flush=True)
+        self.last_report = now
+
+
+def run(paths: Sequence[str], output: BinaryIO, engine: str = "claude", workers: int = 1,
+        chunksize: int = 64, max_in_flight: Optional[int] = None,
+        settings: Optional[Dict[str, Any]] = None,
+        progress: Optional[ProgressReporter] = None) -> Tuple[int, int]:
+    """
+    JSONL 입력을 처리해 결과를 JSONL로 출력
+
+    Args:
+        paths: 입력 파일 경로 목록 ('-'는 표준 입력)
+        output: 출력 바이너리 스트림
+        engine: 'claude' 또는 'gpt5'
+        workers: 워커 프로세스 수 (1 이하면 현재 프로세스에서 처리)
+        chunksize: 워커에 한 번에 전달할 줄 수
+        max_in_flight: 동시에 처리 중인 최대 묶음 수 (None이면 워커 수의 2배)
+        settings: 요청 기본값과 패턴 경로
+        progress: 처리량 출력기
+
+    Returns:
+        (처리한 레코드 수, 오류 수)
+    """
+    settings = dict(settings or {})
+    settings["engine"] = engine
+    settings.setdefault("domain", "auto")
+    settings.setdefault("optimization_level", "balanced")
+    settings.setdefault("execution_mode", "auto")
+
+    records = errors = 0
+    batches = map_chunks(
+        _process_lines, iter_input_lines(paths),
+        workers=workers,
+        chunksize=chunksize,
+        max_pending=max_in_flight,
+        initializer=_init_worker,
+        initargs=(engine, settings),
+        on_error=_chunk_failure
+    )
+
+    for _, results in batches:
+        chunk_errors = 0
+        for success, line in results:
+            output.write(line.encode("utf-8"))
+            output.write(b"\n")
+            if not success:
+                chunk_errors += 1
+        output.flush()
+
+        records += len(results)
+        errors += chunk_errors
+        if progress is not None:
+            progress.add(len(results), chunk_errors)
+
+    return records, errors
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """명령행 인자 파서 생성"""
+    from .analyzer import Domain, OptimizationLevel
+    from .core import ExecutionMode
+
+    parser = argparse.ArgumentParser(
+        prog="python -m scripts",
+        description="JSONL 프롬프트 스트림 최적화 (입력 한 줄 → 결과 한 줄)"
+    )
+    parser.add_argument("inputs", nargs="*", default=["-"],
+                        help="입력 JSONL 파일 (기본: 표준 입력, '-'는 표준 입력)")
+    parser.add_argument("-o", "--output", default="-", help="출력 JSONL 파일 (기본: 표준 출력)")
+    parser.add_argument("--engine", choices=ENGINES, default="claude", help="최적화 엔진 (기본: claude)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="워커 프로세스 수 (기본: 1, 0이면 CPU 수)")
+    parser.add_argument("--chunksize", type=int, default=64, help="워커에 한 번에 전달할 줄 수 (기본: 64)")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="동시에 처리 중인 최대 묶음 수 (기본: 워커 수의 2배)")
+    parser.add_argument("--progress", type=float, default=10.0,
+                        help="처리량 출력 주기 (초, 0이면 출력하지 않음, 기본: 10)")
+    parser.add_argument("--domain", choices=[domain.value for domain in Domain], default="auto",
+                        help="claude 기본 도메인 (기본: auto)")
+    parser.add_argument("--level", choices=[level.value for level in OptimizationLevel],
+                        default="balanced", dest="optimization_level",
+                        help="claude 기본 최적화 레벨 (기본: balanced)")
+    parser.add_argument("--mode", choices=[mode.value for mode in ExecutionMode],
+                        default="auto", dest="execution_mode",
+                        help="claude 기본 실행 모드 (기본: auto)")
+    parser.add_argument("--patterns-dir", default=None, help="claude 도메인 패턴 디렉토리")
+    parser.add_argument("--patterns-file", default=None, help="gpt5 패턴 파일")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    명령행 진입점
+
+    Args:
+        argv: 명령행 인자 (None이면 sys.argv)
+
+    Returns:
+        종료 코드 (입력 오류가 있으면 1, 인자 오류나 입출력 파일 오류면 2)
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.workers == 0:
+        args.workers = None
+    if args.chunksize < 1:
+        print("Error: --chunksize는 1 이상이어야 합니다", file=sys.stderr)
+        return 2
+
+    settings = {
+        "domain": args.domain,
+        "optimization_level": args.optimization_level,
+        "execution_mode": args.execution_mode,
+        "patterns_dir": args.patterns_dir,
+        "patterns_file": args.patterns_file
+    }
+    progress = ProgressReporter(args.progress)
+    try:
+        output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        records, errors = run(
+            args.inputs, output,
+            engine=args.engine,
+            workers=args.workers,
+            chunksize=args.chunksize,
+            max_in_flight=args.max_in_flight,
+            settings=settings,
+            progress=progress
+        )
+    except BrokenPipeError:
+        # 출력을 받는 쪽이 먼저 종료된 경우 (예: | head) 종료 시 flush 오류가 나지 않도록 출력을 닫음
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except OSError as e:
+        # 입력 파일이 없거나 읽을 수 없는 경우
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+
+    if args.progress > 0:
+        progress.report(final=True)
+    return 1 if errors else 0
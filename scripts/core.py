@@ -5,13 +5,23 @@ Claude Prompt Optimizer Core Engine
 
 import json
 import os
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Any, AsyncIterable, AsyncIterator, Iterable, Iterator, Optional, Tuple, Union
+from dataclasses import dataclass, replace
 from enum import Enum
 
 from .analyzer import PromptAnalyzer, AnalysisResult, Domain, OptimizationLevel
 from .optimizer import PromptOptimizer, OptimizationResult
 from .templates import TemplateManager, Template
+from .tokens import Tokenizer, get_tokenizer
+from .cache import CacheBackend, LRUCache, SQLiteCache, make_cache_key
+from .messages import render_messages
+from .pattern_registry import PatternWatcher, get_registry, get_watcher
+from .stats import DEFAULT_HISTORY_SIZE, ExecutionHistory, ExecutionRecord
+
+if TYPE_CHECKING:
+    from .aio import AsyncRunner
 
 
 class ExecutionMode(Enum):
@@ -45,20 +55,143 @@ class OptimizationResponse:
     message: str = ""
     execution_time: float = 0.0
     recommendations: List[str] = None
+    rule_version: Optional[str] = None  # 사용된 도메인 패턴 버전 (템플릿을 쓰지 않은 분석 모드는 None)
+
+
+def _copy_response(response: OptimizationResponse, **changes) -> OptimizationResponse:
+    """
+    캐시에 저장하거나 캐시에서 꺼낸 응답 복사
+
+    호출자가 응답을 수정해도 캐시 항목이 바뀌지 않도록 응답과 결과 객체의 변경 가능한 컨테이너
+    (목록, 딕셔너리)를 복사합니다. 메시지와 템플릿은 요청 간에 공유되는 객체이므로 복사하지 않습니다.
+
+    Args:
+        response: 복사할 응답
+        **changes: 복사본에서 바꿀 필드
+
+    Returns:
+        캐시 항목과 컨테이너를 공유하지 않는 응답
+    """
+    analysis = response.analysis
+    if analysis is not None:
+        analysis = replace(
+            analysis,
+            scores=dict(analysis.scores),
+            issues=list(analysis.issues),
+            suggestions=list(analysis.suggestions)
+        )
+
+    optimization = response.optimization
+    if optimization is not None:
+        optimization = replace(
+            optimization,
+            improvement_areas=list(optimization.improvement_areas),
+            applied_techniques=list(optimization.applied_techniques)
+        )
+
+    recommendations = response.recommendations
+    if recommendations is not None:
+        recommendations = list(recommendations)
+
+    return replace(
+        response,
+        analysis=analysis,
+        optimization=optimization,
+        recommendations=recommendations,
+        **changes
+    )
 
 
 class ClaudePromptOptimizer:
     """Claude 프롬프트 최적기 메인 엔진"""
 
-    def __init__(self, patterns_dir: str = None):
-        self.analyzer = PromptAnalyzer()
-        self.optimizer = PromptOptimizer()
-        self.template_manager = TemplateManager(patterns_dir)
-        self.execution_history = []
+    def __init__(self, patterns_dir: str = None, tokenizer: Optional[Tokenizer] = None,
+                 hot_reload: bool = False, cache: Optional[CacheBackend] = None,
+                 async_runner: Optional["AsyncRunner"] = None, history_size: int = DEFAULT_HISTORY_SIZE):
+        self.analyzer = PromptAnalyzer(tokenizer)
+        self.optimizer = PromptOptimizer(tokenizer)
+        # 결과 캐시 (None이면 캐시하지 않음)
+        self.cache = cache
+        # 비동기 API가 사용할 실행기 (None이면 전역 실행기)
+        self.async_runner = async_runner
+        self.patterns_dir = patterns_dir
+        # (패턴 버전, 템플릿 관리자) - 처음 사용할 때 생성하고, 패턴 변경 시 통째로 교체
+        self._template_state: Optional[Tuple[str, TemplateManager]] = None
+        self._reload_lock = threading.Lock()
+        # 최근 실행 기록 (고정 크기) + 전체 누적 통계
+        self.execution_history = ExecutionHistory(history_size)
+
+        if hot_reload:
+            self.enable_hot_reload()
+
+    def _build_template_state(self) -> Tuple[str, TemplateManager]:
+        """도메인 패턴을 로드해 새 템플릿 관리자 생성"""
+        template_manager = TemplateManager(self.patterns_dir)
+        version = get_registry().version(template_manager.pattern_files())
+        return version, template_manager
+
+    def _get_template_state(self) -> Tuple[str, TemplateManager]:
+        """현재 (패턴 버전, 템플릿 관리자) 스냅샷 (도메인 패턴 로드와 기본 템플릿 생성은 처음 사용할 때 수행)"""
+        state = self._template_state
+        if state is None:
+            with self._reload_lock:
+                state = self._template_state
+                if state is None:
+                    state = self._build_template_state()
+                    self._template_state = state
+        return state
+
+    def ensure_loaded(self):
+        """도메인 패턴 로드와 기본 템플릿 생성을 첫 요청 전에 미리 수행"""
+        self._get_template_state()
+
+    @property
+    def template_manager(self) -> TemplateManager:
+        """템플릿 관리자"""
+        return self._get_template_state()[1]
+
+    @property
+    def rule_version(self) -> str:
+        """현재 사용 중인 도메인 패턴 버전"""
+        return self._get_template_state()[0]
+
+    def reload(self) -> bool:
+        """
+        도메인 패턴 파일이 바뀐 경우 템플릿 관리자를 다시 만들어 교체
+
+        새 관리자는 완전히 만들어진 뒤 참조 하나로 교체되므로
+        처리 중인 요청은 시작할 때의 템플릿으로 끝까지 실행됩니다.
+
+        Returns:
+            교체되었는지 여부
+        """
+        with self._reload_lock:
+            state = self._template_state
+            if state is None:
+                # 아직 로드하지 않았으면 처음 사용할 때 최신 파일을 읽음
+                return False
+            if get_registry().version(state[1].pattern_files()) == state[0]:
+                return False
+            self._template_state = self._build_template_state()
+            return True
+
+    def enable_hot_reload(self, watcher: Optional[PatternWatcher] = None):
+        """
+        도메인 패턴 파일 감시 시작
+
+        Args:
+            watcher: 사용할 감시자 (None이면 전역 감시자)
+        """
+        watcher = watcher if watcher is not None else get_watcher()
+        watcher.watch(self._get_template_state()[1].pattern_files(), self.reload)
+
+    def disable_hot_reload(self, watcher: Optional[PatternWatcher] = None):
+        """도메인 패턴 파일 감시 중지"""
+        watcher = watcher if watcher is not None else get_watcher()
+        watcher.unwatch(self.reload)
 
     def process_request(self, request: OptimizationRequest) -> OptimizationResponse:
         """최적화 요청 처리"""
-        import time
         start_time = time.time()
 
         try:
@@ -68,6 +201,22 @@ class ClaudePromptOptimizer:
             else:
                 execution_mode = request.execution_mode
 
+            # 템플릿을 사용하는 모드는 요청 시작 시점의 템플릿 스냅샷으로 끝까지 처리
+            if execution_mode == ExecutionMode.ANALYZE:
+                rule_version, template_manager = None, None
+            else:
+                rule_version, template_manager = self._get_template_state()
+
+            # 같은 입력의 결과가 캐시에 있으면 파이프라인을 건너뜀
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self._cache_key(request, execution_mode, rule_version)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    response = _copy_response(cached, execution_time=time.time() - start_time)
+                    self._record(request, response)
+                    return response
+
             # 분석 수행
             analysis = self.analyzer.analyze(
                 request.prompt,
@@ -78,13 +227,14 @@ class ClaudePromptOptimizer:
             response = OptimizationResponse(
                 success=True,
                 original_prompt=request.prompt,
-                analysis=analysis
+                analysis=analysis,
+                rule_version=rule_version
             )
 
             # 실행 모드별 처리
             if execution_mode == ExecutionMode.TEMPLATE:
                 # 템플릿 모드
-                template_result = self._process_template_mode(request, analysis)
+                template_result = self._process_template_mode(request, analysis, template_manager)
                 response.template = template_result["template"]
                 response.optimized_prompt = template_result["filled_template"]
                 response.recommendations = template_result["recommendations"]
@@ -101,18 +251,16 @@ class ClaudePromptOptimizer:
                 response.message = self.optimizer.get_optimization_summary(optimization)
 
                 # 템플릿 추천
-                template_recommendations = self._get_template_recommendations(request, analysis)
+                template_recommendations = self._get_template_recommendations(request, analysis, template_manager)
                 if template_recommendations:
                     response.recommendations = [f"템플릿 추천: {t.name}" for t in template_recommendations[:3]]
 
             response.execution_time = time.time() - start_time
 
-            # 실행 기록 저장
-            self.execution_history.append({
-                "timestamp": time.time(),
-                "request": request,
-                "response": response
-            })
+            if cache_key is not None:
+                self.cache.set(cache_key, _copy_response(response))
+
+            self._record(request, response)
 
             return response
 
@@ -124,6 +272,190 @@ class ClaudePromptOptimizer:
                 execution_time=time.time() - start_time
             )
 
+    def process_batch(self, requests: Iterable[OptimizationRequest], workers: Optional[int] = None,
+                      chunksize: int = 32, context=None) -> Iterator[OptimizationResponse]:
+        """
+        여러 요청을 프로세스 풀에서 병렬 처리
+
+        워커마다 최적화 엔진을 한 번만 초기화하고 요청을 chunksize개씩 묶어 전달합니다.
+        입력은 필요한 만큼만 읽고 처리 중인 묶음 수를 워커 수의 2배로 제한하므로
+        입력 크기와 관계없이 메모리 사용량이 일정합니다.
+
+        Args:
+            requests: 최적화 요청 목록 (이터레이터 가능)
+            workers: 워커 프로세스 수 (None이면 CPU 수, 1 이하면 현재 프로세스에서 순차 처리)
+            chunksize: 워커에 한 번에 전달할 요청 수
+            context: 워커를 만들 multiprocessing 컨텍스트 (None이면 기본 컨텍스트)
+
+        Returns:
+            입력 순서대로 응답을 내보내는 이터레이터 (개별 요청의 오류는 실패 응답으로 반환)
+        """
+        from .parallel import iter_chunks, map_chunks
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1:
+            for chunk in iter_chunks(requests, chunksize):
+                for request in chunk:
+                    yield self.process_request(request)
+            return
+
+        # 워커는 부모와 같은 패턴 디렉토리, 토큰 카운터, 캐시 설정으로 엔진 생성
+        tokenizer = self.analyzer.tokenizer if self.analyzer.tokenizer is not None else get_tokenizer()
+        batches = map_chunks(
+            _process_batch_chunk, requests,
+            workers=workers,
+            chunksize=chunksize,
+            initializer=_init_batch_worker,
+            initargs=(self.patterns_dir, tokenizer, self.cache),
+            context=context,
+            on_error=self._batch_failure
+        )
+
+        for chunk, responses in batches:
+            for request, response in zip(chunk, responses):
+                self._record(request, response)
+                yield response
+
+    @staticmethod
+    def _batch_failure(chunk: List[OptimizationRequest], error: BaseException) -> List[OptimizationResponse]:
+        """묶음 단위 오류(워커 종료, 직렬화 실패 등)를 묶음의 각 요청에 대한 실패 응답으로 변환"""
+        return [
+            OptimizationResponse(
+                success=False,
+                original_prompt=request.prompt,
+                message=f"오류가 발생했습니다: {str(error)}"
+            )
+            for request in chunk
+        ]
+
+    def _get_async_runner(self) -> "AsyncRunner":
+        if self.async_runner is not None:
+            return self.async_runner
+
+        # asyncio는 비동기 API를 처음 사용할 때 로드
+        from .aio import get_async_runner
+        return get_async_runner()
+
+    async def aprocess_request(self, request: OptimizationRequest,
+                               timeout: Optional[float] = None) -> OptimizationResponse:
+        """
+        최적화 요청 처리 (이벤트 루프를 막지 않도록 실행기에서 실행)
+
+        Args:
+            request: 최적화 요청
+            timeout: 시간 제한 (초, 동시 실행 대기 포함, None이면 실행기 기본값)
+
+        Returns:
+            최적화 응답
+
+        Raises:
+            TimeoutError: 시간 제한 초과
+        """
+        return await self._get_async_runner().run(self.process_request, request, timeout=timeout)
+
+    async def aanalyze(self, prompt: str, domain: Domain = Domain.AUTO,
+                       optimization_level: OptimizationLevel = OptimizationLevel.BALANCED,
+                       timeout: Optional[float] = None) -> AnalysisResult:
+        """
+        프롬프트 분석 (이벤트 루프를 막지 않도록 실행기에서 실행)
+
+        Args:
+            prompt: 분석할 프롬프트
+            domain: 도메인 (AUTO면 자동 감지)
+            optimization_level: 최적화 레벨
+            timeout: 시간 제한 (초, 동시 실행 대기 포함, None이면 실행기 기본값)
+
+        Returns:
+            분석 결과
+
+        Raises:
+            TimeoutError: 시간 제한 초과
+        """
+        return await self._get_async_runner().run(
+            self.analyzer.analyze, prompt, domain, optimization_level, timeout=timeout
+        )
+
+    async def aoptimize(self, prompt: str, domain: Domain = Domain.AUTO,
+                        optimization_level: OptimizationLevel = OptimizationLevel.BALANCED,
+                        timeout: Optional[float] = None) -> OptimizationResponse:
+        """
+        프롬프트 최적화 (최적화 모드 요청, 이벤트 루프를 막지 않도록 실행기에서 실행)
+
+        Args:
+            prompt: 최적화할 프롬프트
+            domain: 도메인 (AUTO면 자동 감지)
+            optimization_level: 최적화 레벨
+            timeout: 시간 제한 (초, 동시 실행 대기 포함, None이면 실행기 기본값)
+
+        Returns:
+            최적화 응답
+
+        Raises:
+            TimeoutError: 시간 제한 초과
+        """
+        request = OptimizationRequest(
+            prompt=prompt,
+            domain=domain,
+            optimization_level=optimization_level,
+            execution_mode=ExecutionMode.OPTIMIZE
+        )
+        return await self.aprocess_request(request, timeout=timeout)
+
+    async def aprocess_batch(self, requests: Union[Iterable[OptimizationRequest], AsyncIterable[OptimizationRequest]],
+                             timeout: Optional[float] = None) -> AsyncIterator[OptimizationResponse]:
+        """
+        여러 요청을 동시에 처리하고 입력 순서대로 반환
+
+        동시 실행 수는 실행기의 max_concurrency로 제한되며, 입력은 필요한 만큼만 읽습니다.
+
+        Args:
+            requests: 최적화 요청 목록 (비동기 이터러블 가능)
+            timeout: 요청별 시간 제한 (초, None이면 실행기 기본값)
+
+        Returns:
+            응답 비동기 이터레이터 (시간 제한 초과 등 개별 요청의 오류는 실패 응답으로 반환)
+        """
+        def on_error(request: OptimizationRequest, error: Exception) -> OptimizationResponse:
+            if isinstance(error, TimeoutError):
+                message = "처리 시간이 초과되었습니다"
+            else:
+                message = f"오류가 발생했습니다: {str(error)}"
+            return OptimizationResponse(success=False, original_prompt=request.prompt, message=message)
+
+        async for response in self._get_async_runner().map(
+                self.process_request, requests, timeout=timeout, on_error=on_error):
+            yield response
+
+    def _record(self, request: OptimizationRequest, response: OptimizationResponse):
+        """실행 기록 저장"""
+        self.execution_history.append(ExecutionRecord(
+            timestamp=time.time(),
+            success=response.success,
+            execution_time=response.execution_time,
+            domain=response.analysis.domain.value if response.analysis else "unknown",
+            execution_mode=request.execution_mode.value,
+            optimization_level=request.optimization_level.value,
+            prompt_length=len(request.prompt)
+        ))
+
+    def _cache_key(self, request: OptimizationRequest, execution_mode: ExecutionMode,
+                   rule_version: Optional[str]) -> str:
+        """요청 입력과 패턴 버전으로 결과 캐시 키 생성"""
+        tokenizer = self.analyzer.tokenizer or get_tokenizer()
+        return make_cache_key(
+            "claude",
+            request.prompt,
+            request.domain,
+            request.optimization_level,
+            execution_mode,
+            request.template_id,
+            request.template_variables,
+            rule_version,
+            tokenizer.cache_id
+        )
+
     def _determine_execution_mode(self, request: OptimizationRequest) -> ExecutionMode:
         """실행 모드 자동 결정"""
         # 템플릿 ID가 지정된 경우
@@ -141,8 +473,12 @@ class ClaudePromptOptimizer:
         # 기본 최적화 모드
         return ExecutionMode.OPTIMIZE
 
-    def _process_template_mode(self, request: OptimizationRequest, analysis: AnalysisResult) -> Dict[str, Any]:
+    def _process_template_mode(self, request: OptimizationRequest, analysis: AnalysisResult,
+                               template_manager: Optional[TemplateManager] = None) -> Dict[str, Any]:
         """템플릿 모드 처리"""
+        if template_manager is None:
+            template_manager = self.template_manager
+
         result = {
             "template": None,
             "filled_template": None,
@@ -151,10 +487,10 @@ class ClaudePromptOptimizer:
 
         # 템플릿 선택
         if request.template_id:
-            template = self.template_manager.get_template(request.template_id)
+            template = template_manager.get_template(request.template_id)
         else:
             # 최적의 템플릿 추천 (의미 기반 매칭 우선)
-            template = self.template_manager.find_best_template_semantic(
+            template = template_manager.find_best_template_semantic(
                 request.prompt,
                 analysis.domain.value,
                 analysis.detected_intent
@@ -167,15 +503,15 @@ class ClaudePromptOptimizer:
             variables = request.template_variables or {}
             if not variables:
                 # 사용자 입력 기반 변수 추천
-                suggested_vars = self.template_manager.suggest_variables(template.id, request.prompt)
+                suggested_vars = template_manager.suggest_variables(template.id, request.prompt)
                 variables = suggested_vars
 
             # 템플릿 채우기
-            filled_template = self.template_manager.fill_template(template, variables)
+            filled_template = template_manager.fill_template(template, variables)
 
             if filled_template is None:
                 # 변수가 완전히 채워지지 않은 경우 부분 채우기
-                partial_filled, missing_vars = self.template_manager.fill_template_partial(template, variables)
+                partial_filled, missing_vars = template_manager.fill_template_partial(template, variables)
                 result["filled_template"] = partial_filled
                 result["missing_variables"] = missing_vars
                 result["recommendations"].append(f"누락된 변수: {', '.join(missing_vars)}")
@@ -184,7 +520,7 @@ class ClaudePromptOptimizer:
 
         else:
             # 템플릿을 찾지 못한 경우 추천 목록 제공
-            recommendations = self.template_manager.get_template_recommendations(
+            recommendations = template_manager.get_template_recommendations(
                 analysis.domain.value,
                 request.prompt,
                 analysis.complexity_level
@@ -193,9 +529,13 @@ class ClaudePromptOptimizer:
 
         return result
 
-    def _get_template_recommendations(self, request: OptimizationRequest, analysis: AnalysisResult) -> List[Template]:
+    def _get_template_recommendations(self, request: OptimizationRequest, analysis: AnalysisResult,
+                                      template_manager: Optional[TemplateManager] = None) -> List[Template]:
         """템플릿 추천"""
-        return self.template_manager.get_template_recommendations(
+        if template_manager is None:
+            template_manager = self.template_manager
+
+        return template_manager.get_template_recommendations(
             analysis.domain.value,
             request.prompt,
             analysis.complexity_level
@@ -253,7 +593,7 @@ class ClaudePromptOptimizer:
                         "token_reduction_percent": response.optimization.token_reduction_percent,
                         "optimization_score": response.optimization.optimization_score,
                         "applied_techniques": response.optimization.applied_techniques,
-                        "improvement_areas": response.optimization.improvement_areas
+                        "improvement_areas": render_messages(response.optimization.improvement_areas)
                     }
 
                 return result
@@ -287,8 +627,8 @@ class ClaudePromptOptimizer:
                 "scores": analysis.scores,
                 "total_score": analysis.total_score,
                 "token_count": analysis.token_count,
-                "issues": analysis.issues,
-                "suggestions": analysis.suggestions,
+                "issues": render_messages(analysis.issues),
+                "suggestions": render_messages(analysis.suggestions),
                 "summary": self.analyzer.get_analysis_summary(analysis)
             }
 
@@ -351,41 +691,71 @@ class ClaudePromptOptimizer:
 
     def get_statistics(self) -> Dict[str, Any]:
         """실행 통계"""
-        if not self.execution_history:
-            return {
+        summary = self.execution_history.summary()
+        total_executions = summary["total_executions"]
+
+        if not total_executions:
+            statistics = {
                 "total_executions": 0,
                 "average_execution_time": 0.0,
                 "success_rate": 0.0
             }
+            if self.cache is not None:
+                statistics["cache"] = self.cache.stats()
+            return statistics
 
-        total_executions = len(self.execution_history)
-        successful_executions = sum(1 for h in self.execution_history if h["response"].success)
-        total_time = sum(h["response"].execution_time for h in self.execution_history)
-
-        # 도메인별 통계
-        domain_stats = {}
-        for history in self.execution_history:
-            domain = history["response"].analysis.domain.value if history["response"].analysis else "unknown"
-            domain_stats[domain] = domain_stats.get(domain, 0) + 1
-
-        return {
+        successful_executions = summary["successful_executions"]
+        statistics = {
             "total_executions": total_executions,
             "successful_executions": successful_executions,
-            "success_rate": (successful_executions / total_executions * 100) if total_executions > 0 else 0,
-            "average_execution_time": (total_time / total_executions) if total_executions > 0 else 0,
-            "domain_distribution": domain_stats,
-            "last_execution": self.execution_history[-1]["timestamp"] if self.execution_history else None
+            "success_rate": successful_executions / total_executions * 100,
+            "average_execution_time": summary["total_time"] / total_executions,
+            "domain_distribution": summary["domain_distribution"],
+            "last_execution": summary["last_execution"]
         }
 
+        if self.cache is not None:
+            statistics["cache"] = self.cache.stats()
+
+        return statistics
+
+
+# 배치 워커 프로세스의 최적화 엔진 (워커마다 한 번 초기화)
+_batch_optimizer: Optional[ClaudePromptOptimizer] = None
+
+
+def _init_batch_worker(patterns_dir: Optional[str], tokenizer: Tokenizer,
+                       cache: Optional[CacheBackend]):
+    """배치 워커 초기화 (엔진 생성과 도메인 패턴 로드)"""
+    global _batch_optimizer
+    _batch_optimizer = ClaudePromptOptimizer(patterns_dir, tokenizer=tokenizer, cache=cache)
+    _batch_optimizer.ensure_loaded()
+
+    if isinstance(cache, SQLiteCache):
+        import multiprocessing.util
+
+        # 워커 프로세스는 atexit 핸들러를 실행하지 않으므로 종료 시 남은 쓰기를 반영하도록 등록
+        multiprocessing.util.Finalize(cache, cache.flush, exitpriority=10)
+
+
+def _process_batch_chunk(requests: List[OptimizationRequest]) -> List[OptimizationResponse]:
+    """배치 워커에서 요청 묶음 처리"""
+    # 실행 기록은 부모 프로세스에서 집계
+    return [_batch_optimizer.process_request(request) for request in requests]
+
 
 # 전역 인스턴스 (싱글톤)
 _optimizer_instance = None
+_optimizer_lock = threading.Lock()
 
 def get_optimizer() -> ClaudePromptOptimizer:
     """전역 옵티마이저 인스턴스获取"""
     global _optimizer_instance
     if _optimizer_instance is None:
-        _optimizer_instance = ClaudePromptOptimizer()
+        with _optimizer_lock:
+            if _optimizer_instance is None:
+                # 간편 함수는 반복되는 프롬프트가 많으므로 결과 캐시 사용
+                _optimizer_instance = ClaudePromptOptimizer(cache=LRUCache())
     return _optimizer_instance
 
 
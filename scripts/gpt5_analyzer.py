@@ -12,11 +12,18 @@ GPT-5 prompting guide 기반으로 프롬프트를 분석합니다:
 
 import re
 import json
-from dataclasses import dataclass, asdict
+import threading
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Dict, Tuple, Optional
+from typing import Any, List, Dict, Tuple, Optional, FrozenSet, Mapping, Sequence
 from pathlib import Path
 
+from .matcher import KeywordMatcher, RegexPatternSet
+from .pattern_pack import DEFAULT_PATTERNS_DIR, load_compiled, load_pattern_file
+from .pattern_registry import freeze_patterns, get_gpt5_rules
+from .messages import Message, MessageCode, message, render_messages
+from .records import dump_json, frozen_dataclass
+
 
 class ReasoningEffort(Enum):
     """Reasoning effort 레벨"""
@@ -40,7 +47,7 @@ class Severity(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@frozen_dataclass
 class Contradiction:
     """모순 정보"""
     pattern: str
@@ -50,8 +57,39 @@ class Contradiction:
     location: str
     fix_strategy: str
 
-
-@dataclass
+    def to_dict(self) -> Dict:
+        """딕셔너리로 변환"""
+        return {
+            'pattern': self.pattern,
+            'description': self.description,
+            'example': self.example,
+            'severity': self.severity,
+            'location': self.location,
+            'fix_strategy': self.fix_strategy
+        }
+
+
+@dataclass(frozen=True)
+class PromptFeatures:
+    """프롬프트 특성 (1회 추출 후 모든 평가 함수가 공유)"""
+    prompt: str
+    prompt_lower: str
+    length: int
+    has_angle_brackets: bool
+    xml_tags: Tuple[str, ...]  # 여는 태그 이름
+    xml_closing_tags: Tuple[str, ...]  # 닫는 태그 이름
+    keyword_hits: FrozenSet[str]  # 소문자 프롬프트에서 발견된 키워드
+    section_hits: FrozenSet[str]  # 원본 프롬프트에서 발견된 섹션 표시자
+    step_count: int
+    tool_count: int
+    conditional_count: int
+    constraint_count: int
+    # 증분 분석 세션이 미리 계산한 모순 패턴 매치와 금지/필수 키워드 출현 (None이면 새로 탐색)
+    contradiction_matches: Optional[Mapping[str, Tuple[str, int]]] = field(default=None, compare=False)
+    detection_occurrences: Optional[Sequence[Tuple[int, str]]] = field(default=None, compare=False)
+
+
+@frozen_dataclass
 class GPT5AnalysisResult:
     """GPT-5 분석 결과"""
     original_prompt: str
@@ -63,58 +101,298 @@ class GPT5AnalysisResult:
     reasoning_effort_recommendation: str
     verbosity_recommendation: str
     xml_structured: bool
-    issues: List[Dict[str, str]]
-    suggestions: List[str]
+    issues: List[Dict[str, Any]]  # description/fix는 Message 또는 패턴 파일의 문자열
+    suggestions: List[Message]
     complexity_score: float  # 0-10
+    rule_version: Optional[str] = None  # 분석에 사용된 패턴 파일 버전
 
     def to_dict(self) -> Dict:
         """딕셔너리로 변환"""
-        result = asdict(self)
-        # Contradiction 객체들을 딕셔너리로 변환
-        result['contradictions'] = [asdict(c) for c in self.contradictions]
-        return result
+        return {
+            'original_prompt': self.original_prompt,
+            'contradictions': [c.to_dict() for c in self.contradictions],
+            'agentic_score': self.agentic_score,
+            'clarity_score': self.clarity_score,
+            'context_efficiency_score': self.context_efficiency_score,
+            'tool_preamble_quality': self.tool_preamble_quality,
+            'reasoning_effort_recommendation': self.reasoning_effort_recommendation,
+            'verbosity_recommendation': self.verbosity_recommendation,
+            'xml_structured': self.xml_structured,
+            'issues': [{key: str(value) for key, value in issue.items()} for issue in self.issues],
+            'suggestions': render_messages(self.suggestions),
+            'complexity_score': self.complexity_score,
+            'rule_version': self.rule_version
+        }
+
+    def to_json(self) -> str:
+        """JSON 문자열로 변환"""
+        return dump_json(self.to_dict())
+
+
+class GPT5RuleSet:
+    """GPT-5 패턴 파일에서 컴파일한 분석 규칙"""
+
+    # 패턴 파일 내용 버전 (레지스트리에 등록될 때 설정)
+    version: Optional[str] = None
+
+    def __init__(self, patterns: Dict):
+        """
+        초기화
+
+        Args:
+            patterns: 파싱된 GPT-5 패턴 데이터
+        """
+        self.patterns = patterns
+        contradiction_patterns = patterns['contradiction_patterns']
+
+        # 모순 패턴을 단일 정규식으로 컴파일
+        # 소문자로 변환한 프롬프트에 적용하므로 패턴은 소문자로 작성 (IGNORECASE 불필요)
+        self.contradiction_rules = contradiction_patterns['common_contradictions']
+        self.contradiction_regex = RegexPatternSet(
+            (f"r{rule_index}_{pattern_index}", pattern)
+            for rule_index, rule in enumerate(self.contradiction_rules)
+            for pattern_index, pattern in enumerate(rule['pattern'])
+        )
+
+        # 절대 금지/필수 키워드의 위치 인덱스용 오토마톤
+        detection_keywords = contradiction_patterns['detection_keywords']
+        self.prohibitions = detection_keywords['absolute_prohibitions']
+        self.requirements = detection_keywords['absolute_requirements']
+        self.detection_matcher = KeywordMatcher(self.prohibitions + self.requirements)
+
+    def freeze(self) -> "GPT5RuleSet":
+        """
+        패턴 데이터를 읽기 전용 뷰로 교체 (여러 엔진/스레드가 공유할 때 사용)
+
+        Returns:
+            자기 자신
+        """
+        self.patterns = freeze_patterns(self.patterns)
+        self.contradiction_rules = self.patterns['contradiction_patterns']['common_contradictions']
+        self.prohibitions = tuple(self.prohibitions)
+        self.requirements = tuple(self.requirements)
+        return self
+
+
+def load_gpt5_rules(patterns_file: Optional[str] = None) -> GPT5RuleSet:
+    """
+    GPT-5 분석 규칙 로드 (최신 패턴 팩이 있으면 미리 컴파일된 규칙 사용)
+
+    Args:
+        patterns_file: GPT-5 패턴 파일 경로 (None이면 기본 경로 사용)
+
+    Returns:
+        컴파일된 분석 규칙
+    """
+    if patterns_file is None:
+        patterns_file = DEFAULT_PATTERNS_DIR / "gpt5_patterns.json"
+
+    rules = load_compiled(patterns_file, "gpt5_rules")
+    if rules is None:
+        rules = GPT5RuleSet(load_pattern_file(patterns_file))
+    return rules
 
 
 class GPT5PromptAnalyzer:
     """GPT-5 전용 프롬프트 분석기"""
 
-    def __init__(self, patterns_file: Optional[str] = None):
+    # Agentic 구조 평가 키워드
+    TOOL_KEYWORDS = ['tool', 'function', 'api', 'call', '도구', '함수']
+    PERSISTENCE_KEYWORDS = ['continue', 'keep going', 'until', 'completely', '계속', '끝까지']
+    ESCAPE_KEYWORDS = ['if uncertain', 'if unsure', 'best judgment', '불확실하면', '판단']
+    OVER_THOROUGH_KEYWORDS = ['maximize', 'all possible', 'every single', '모든', '완벽하게']
+
+    # 명확성 평가 키워드 (섹션 표시자는 대소문자 구분)
+    SECTION_INDICATORS = ['##', '1.', '2.', 'Step', '단계']
+    AMBIGUOUS_KEYWORDS = ['as needed', 'when appropriate', 'if necessary', '필요하면', '적절히']
+
+    # 컨텍스트 효율성 평가 키워드
+    EXCESSIVE_CONTEXT_KEYWORDS = ['maximize context', 'all possible information', 'gather everything',
+                                  'read all files', '모든 정보', '모든 파일']
+    BALANCED_CONTEXT_KEYWORDS = ['sufficient', 'relevant', 'necessary', '필요한', '관련된']
+
+    # 도구 프리앰블 평가 키워드
+    RESTATE_KEYWORDS = ['rephrase', 'restate', 'clarify goal', '재구성', '명확히']
+    PLAN_KEYWORDS = ['plan', 'outline', 'steps', '계획', '단계']
+    PROGRESS_KEYWORDS = ['progress', 'update', 'status', '진행', '상황']
+
+    # Verbosity 추천 키워드
+    CONCISE_KEYWORDS = ['brief', 'concise', 'short', 'quick', '간단히', '간결하게']
+    DETAILED_KEYWORDS = ['detailed', 'comprehensive', 'thorough', 'explain', '상세히', '자세히']
+
+    # 복잡도 계산 패턴 (단계, 도구, 조건부 로직, 제약사항을 한 번에 스캔)
+    # 전방 탐색으로 감싸 문자를 소비하지 않으므로 카테고리 간 겹치는 매치
+    # (예: 'apif'의 api/if)도 카테고리별 findall과 같은 개수로 셈
+    COMPLEXITY_PATTERN = re.compile(
+        r'(?=(?P<step>(?:step|단계)\s*\d+|^\d+\.|^-\s)'
+        r'|(?P<tool>tool|function|api|도구|함수)'
+        r'|(?P<conditional>if|when|unless|만약|경우)'
+        r'|(?P<constraint>must|should|constraint|제약|필수))',
+        re.IGNORECASE | re.MULTILINE
+    )
+
+    XML_OPEN_TAG_PATTERN = re.compile(r'<(\w+)>')
+    XML_CLOSE_TAG_PATTERN = re.compile(r'</(\w+)>')
+
+    # 평가 키워드 오토마톤 (패턴 파일과 무관하므로 클래스 단위로 한 번만 컴파일)
+    _feature_matchers: Optional[Tuple[KeywordMatcher, KeywordMatcher]] = None
+    _feature_matchers_lock = threading.Lock()
+
+    def __init__(self, patterns_file: Optional[str] = None, rules: Optional[GPT5RuleSet] = None):
         """
         초기화
 
         Args:
             patterns_file: GPT-5 패턴 파일 경로 (None이면 기본 경로 사용)
+            rules: 미리 컴파일된 분석 규칙 (지정 시 patterns_file 무시)
+        """
+        if rules is None:
+            # 같은 패턴 파일을 쓰는 분석기끼리 컴파일된 규칙 공유
+            rules = get_gpt5_rules(patterns_file)
+
+        self.rules = rules
+        self.patterns = rules.patterns
+        self.feature_matcher, self.section_matcher = self._get_feature_matchers()
+
+    @classmethod
+    def _get_feature_matchers(cls) -> Tuple[KeywordMatcher, KeywordMatcher]:
+        """평가 함수들이 사용하는 키워드 오토마톤 (대소문자 무시용, 섹션 표시자용)"""
+        if cls._feature_matchers is None:
+            with cls._feature_matchers_lock:
+                if cls._feature_matchers is None:
+                    feature_matcher = KeywordMatcher(
+                        cls.TOOL_KEYWORDS + cls.PERSISTENCE_KEYWORDS + cls.ESCAPE_KEYWORDS
+                        + cls.OVER_THOROUGH_KEYWORDS + cls.AMBIGUOUS_KEYWORDS
+                        + cls.EXCESSIVE_CONTEXT_KEYWORDS + cls.BALANCED_CONTEXT_KEYWORDS
+                        + cls.RESTATE_KEYWORDS + cls.PLAN_KEYWORDS + cls.PROGRESS_KEYWORDS
+                        + cls.CONCISE_KEYWORDS + cls.DETAILED_KEYWORDS
+                    )
+                    cls._feature_matchers = (feature_matcher, KeywordMatcher(cls.SECTION_INDICATORS))
+        return cls._feature_matchers
+
+    def extract_features(self, prompt: str) -> PromptFeatures:
+        """
+        프롬프트 특성 추출 (소문자 변환, 태그, 키워드, 카운트를 한 번에 계산)
+
+        Args:
+            prompt: 분석할 프롬프트
+
+        Returns:
+            모든 평가 함수가 공유하는 프롬프트 특성
         """
-        if patterns_file is None:
-            # 기본 패턴 파일 경로
-            current_dir = Path(__file__).parent
-            patterns_file = current_dir.parent / "references" / "patterns" / "gpt5_patterns.json"
+        prompt_lower = prompt.lower()
+        counts = self.count_complexity_markers(prompt)
+
+        return PromptFeatures(
+            prompt=prompt,
+            prompt_lower=prompt_lower,
+            length=len(prompt),
+            has_angle_brackets='<' in prompt and '>' in prompt,
+            xml_tags=tuple(self.XML_OPEN_TAG_PATTERN.findall(prompt)),
+            xml_closing_tags=tuple(self.XML_CLOSE_TAG_PATTERN.findall(prompt)),
+            keyword_hits=frozenset(self.feature_matcher.find_all(prompt_lower)),
+            section_hits=frozenset(self.section_matcher.find_all(prompt)),
+            step_count=counts['step'],
+            tool_count=counts['tool'],
+            conditional_count=counts['conditional'],
+            constraint_count=counts['constraint']
+        )
 
-        with open(patterns_file, 'r', encoding='utf-8') as f:
-            self.patterns = json.load(f)
+    def count_complexity_markers(self, prompt: str) -> Dict[str, int]:
+        """
+        복잡도 지표(단계, 도구, 조건부 로직, 제약사항) 개수를 한 번의 순회로 계산
 
-    def detect_contradictions(self, prompt: str) -> List[Contradiction]:
+        Args:
+            prompt: 분석할 프롬프트
+
+        Returns:
+            {'step', 'tool', 'conditional', 'constraint'}별 매치 개수
+        """
+        counts = {'step': 0, 'tool': 0, 'conditional': 0, 'constraint': 0}
+        for match in self.COMPLEXITY_PATTERN.finditer(prompt):
+            counts[match.lastgroup] += 1
+        return counts
+
+    def find_keyword_conflicts(self, prompt_lower: str, window: int = 100,
+                               occurrences: Optional[Sequence[Tuple[int, str]]] = None
+                               ) -> Dict[Tuple[str, str], int]:
+        """
+        같은 문맥(window 이내)에 함께 나타나는 절대 금지/필수 키워드 쌍 탐색
+
+        모든 출현 위치를 인덱싱한 뒤 위치순으로 한 번 훑으며,
+        각 키워드의 가장 최근 출현 위치와 비교합니다.
+        금지 키워드 안에 포함된 필수 키워드(예: 'must not'의 'must')는 제외합니다.
+
+        Args:
+            prompt_lower: 소문자로 변환된 프롬프트
+            window: 같은 문맥으로 볼 최대 거리 (문자 수)
+            occurrences: 위치순으로 정렬된 (위치, 키워드) 출현 목록 (None이면 새로 탐색)
+
+        Returns:
+            {(금지 키워드, 필수 키워드): 처음 발견된 쌍의 시작 위치}
+        """
+        prohibitions = set(self.rules.prohibitions)
+        requirements = set(self.rules.requirements)
+
+        # 시작 위치순, 같은 위치에서는 긴 키워드 우선으로 정렬
+        if occurrences is None:
+            occurrences = sorted(
+                self.rules.detection_matcher.iter_matches(prompt_lower),
+                key=lambda occurrence: (occurrence[0], -len(occurrence[1]))
+            )
+
+        last_prohibition: Dict[str, int] = {}
+        last_requirement: Dict[str, int] = {}
+        conflicts: Dict[Tuple[str, str], int] = {}
+        covered_until = -1
+
+        for position, keyword in occurrences:
+            end = position + len(keyword)
+
+            if keyword in prohibitions:
+                for requirement, requirement_pos in last_requirement.items():
+                    if position - requirement_pos < window:
+                        conflicts.setdefault((keyword, requirement), requirement_pos)
+                last_prohibition[keyword] = position
+                covered_until = max(covered_until, end)
+
+            if keyword in requirements and end > covered_until:
+                for prohibition, prohibition_pos in last_prohibition.items():
+                    if position - prohibition_pos < window:
+                        conflicts.setdefault((prohibition, keyword), prohibition_pos)
+                last_requirement[keyword] = position
+
+        return conflicts
+
+    def detect_contradictions(self, prompt: str,
+                              features: Optional[PromptFeatures] = None) -> List[Contradiction]:
         """
         모순되는 지시사항 탐지
 
         Args:
             prompt: 분석할 프롬프트
+            features: 미리 추출한 프롬프트 특성 (None이면 소문자 변환만 수행)
 
         Returns:
             감지된 모순 리스트
         """
         contradictions = []
-        prompt_lower = prompt.lower()
+        prompt_lower = features.prompt_lower if features is not None else prompt.lower()
 
-        for pattern_info in self.patterns['contradiction_patterns']['common_contradictions']:
+        # 모든 모순 패턴을 한 번의 스캔으로 탐색
+        found = features.contradiction_matches if features is not None else None
+        if found is None:
+            found = self.rules.contradiction_regex.search_all(prompt_lower)
+
+        for rule_index, pattern_info in enumerate(self.rules.contradiction_rules):
             patterns = pattern_info['pattern']
 
             # 두 패턴이 모두 존재하는지 확인
-            matches = []
-            for p in patterns:
-                match = re.search(p, prompt_lower, re.IGNORECASE)
-                if match:
-                    matches.append((match.group(), match.start()))
+            matches = [
+                found[f"r{rule_index}_{pattern_index}"]
+                for pattern_index in range(len(patterns))
+                if f"r{rule_index}_{pattern_index}" in found
+            ]
 
             # 두 패턴이 모두 발견되면 모순
             if len(matches) >= 2:
@@ -128,191 +406,201 @@ class GPT5PromptAnalyzer:
                     fix_strategy=pattern_info['fix_strategy']
                 ))
 
-        # 절대 금지 + 절대 필수 키워드 조합 검사
-        prohibitions = self.patterns['contradiction_patterns']['detection_keywords']['absolute_prohibitions']
-        requirements = self.patterns['contradiction_patterns']['detection_keywords']['absolute_requirements']
-
-        for prohibition in prohibitions:
-            for requirement in requirements:
-                if prohibition in prompt_lower and requirement in prompt_lower:
-                    # 같은 문맥에서 나타나는지 확인 (50자 이내)
-                    prohibition_pos = prompt_lower.find(prohibition)
-                    requirement_pos = prompt_lower.find(requirement)
-
-                    if abs(prohibition_pos - requirement_pos) < 100:
-                        contradictions.append(Contradiction(
-                            pattern=f"{prohibition} vs {requirement}",
-                            description="절대 금지와 절대 필수의 모순",
-                            example=f"문맥에 '{prohibition}'와 '{requirement}'가 함께 나타남",
-                            severity="high",
-                            location=f"위치: {min(prohibition_pos, requirement_pos)}",
-                            fix_strategy="명확한 우선순위 설정 또는 조건부 로직 추가"
-                        ))
+        # 절대 금지 + 절대 필수 키워드 조합 검사 (같은 문맥, 100자 이내)
+        occurrences = features.detection_occurrences if features is not None else None
+        conflicts = self.find_keyword_conflicts(prompt_lower, occurrences=occurrences)
+
+        for prohibition in self.rules.prohibitions:
+            for requirement in self.rules.requirements:
+                position = conflicts.get((prohibition, requirement))
+                if position is not None:
+                    contradictions.append(Contradiction(
+                        pattern=f"{prohibition} vs {requirement}",
+                        description="절대 금지와 절대 필수의 모순",
+                        example=f"문맥에 '{prohibition}'와 '{requirement}'가 함께 나타남",
+                        severity="high",
+                        location=f"위치: {position}",
+                        fix_strategy="명확한 우선순위 설정 또는 조건부 로직 추가"
+                    ))
 
         return contradictions
 
-    def analyze_agentic_structure(self, prompt: str) -> Tuple[float, List[str]]:
+    def analyze_agentic_structure(self, prompt: str,
+                                  features: Optional[PromptFeatures] = None) -> Tuple[float, List[Message]]:
         """
         Agentic 구조 평가
 
         Args:
             prompt: 분석할 프롬프트
+            features: 미리 추출한 프롬프트 특성 (None이면 새로 추출)
 
         Returns:
             (agentic_score, suggestions): 점수(0-10)와 개선 제안
         """
+        if features is None:
+            features = self.extract_features(prompt)
+
         score = 5.0  # 기본 점수
         suggestions = []
+        hits = features.keyword_hits
 
         # 1. 도구 사용 명시 여부 (+2점)
-        tool_keywords = ['tool', 'function', 'api', 'call', '도구', '함수']
-        if any(keyword in prompt.lower() for keyword in tool_keywords):
+        if any(keyword in hits for keyword in self.TOOL_KEYWORDS):
             score += 2
         else:
-            suggestions.append("도구 사용 방법을 명시하면 Agentic 구조가 개선됩니다")
+            suggestions.append(message(MessageCode.DESCRIBE_TOOL_USAGE))
 
         # 2. 지속성 지시 여부 (+2점)
-        persistence_keywords = ['continue', 'keep going', 'until', 'completely', '계속', '끝까지']
-        if any(keyword in prompt.lower() for keyword in persistence_keywords):
+        if any(keyword in hits for keyword in self.PERSISTENCE_KEYWORDS):
             score += 2
         else:
-            suggestions.append("작업 지속성 지시를 추가하면 자율성이 향상됩니다")
+            suggestions.append(message(MessageCode.ADD_PERSISTENCE))
 
         # 3. Escape hatch 존재 여부 (+1점)
-        escape_keywords = ['if uncertain', 'if unsure', 'best judgment', '불확실하면', '판단']
-        if any(keyword in prompt.lower() for keyword in escape_keywords):
+        if any(keyword in hits for keyword in self.ESCAPE_KEYWORDS):
             score += 1
         else:
-            suggestions.append("불확실성 처리 방법(escape hatch)을 추가하세요")
+            suggestions.append(message(MessageCode.ADD_ESCAPE_HATCH))
 
         # 4. 과도한 철저함 강조 (-2점)
-        over_thorough = ['maximize', 'all possible', 'every single', '모든', '완벽하게']
-        if sum(1 for keyword in over_thorough if keyword in prompt.lower()) >= 3:
+        if sum(1 for keyword in self.OVER_THOROUGH_KEYWORDS if keyword in hits) >= 3:
             score -= 2
-            suggestions.append("과도한 철저함 강조는 불필요한 도구 과다 사용을 유발합니다")
+            suggestions.append(message(MessageCode.OVER_THOROUGHNESS))
 
         return max(0, min(10, score)), suggestions
 
-    def analyze_clarity(self, prompt: str) -> Tuple[float, List[str]]:
+    def analyze_clarity(self, prompt: str,
+                        features: Optional[PromptFeatures] = None) -> Tuple[float, List[Message]]:
         """
         명령 명확성 평가
 
         Args:
             prompt: 분석할 프롬프트
+            features: 미리 추출한 프롬프트 특성 (None이면 새로 추출)
 
         Returns:
             (clarity_score, suggestions): 점수(0-10)와 개선 제안
         """
+        if features is None:
+            features = self.extract_features(prompt)
+
         score = 5.0
         suggestions = []
 
         # 1. XML 구조 사용 (+3점)
-        if '<' in prompt and '>' in prompt:
-            xml_tags = re.findall(r'<(\w+)>', prompt)
-            if len(xml_tags) >= 2:
+        if features.has_angle_brackets:
+            if len(features.xml_tags) >= 2:
                 score += 3
             else:
                 score += 1.5
-                suggestions.append("더 체계적인 XML 구조를 사용하세요")
+                suggestions.append(message(MessageCode.IMPROVE_XML_STRUCTURE))
         else:
-            suggestions.append("XML 구조를 사용하면 명확성이 크게 향상됩니다")
+            suggestions.append(message(MessageCode.USE_XML_STRUCTURE))
 
         # 2. 구조화된 섹션 (+2점)
-        section_indicators = ['##', '1.', '2.', 'Step', '단계']
-        if sum(1 for ind in section_indicators if ind in prompt) >= 2:
+        if len(features.section_hits) >= 2:
             score += 2
         else:
-            suggestions.append("번호나 제목으로 섹션을 구분하세요")
+            suggestions.append(message(MessageCode.SEPARATE_SECTIONS))
 
         # 3. 애매한 표현 (-1점)
-        ambiguous = ['as needed', 'when appropriate', 'if necessary', '필요하면', '적절히']
-        ambiguous_count = sum(1 for word in ambiguous if word in prompt.lower())
+        ambiguous_count = sum(1 for word in self.AMBIGUOUS_KEYWORDS if word in features.keyword_hits)
         if ambiguous_count > 2:
             score -= ambiguous_count * 0.5
-            suggestions.append(f"애매한 표현({ambiguous_count}개)을 구체적으로 바꾸세요")
+            suggestions.append(message(MessageCode.REPLACE_AMBIGUOUS, ambiguous_count))
 
         return max(0, min(10, score)), suggestions
 
-    def analyze_context_efficiency(self, prompt: str) -> Tuple[float, List[str]]:
+    def analyze_context_efficiency(self, prompt: str,
+                                   features: Optional[PromptFeatures] = None) -> Tuple[float, List[Message]]:
         """
         컨텍스트 효율성 평가
 
         Args:
             prompt: 분석할 프롬프트
+            features: 미리 추출한 프롬프트 특성 (None이면 새로 추출)
 
         Returns:
             (efficiency_score, suggestions): 점수(0-10)와 개선 제안
         """
+        if features is None:
+            features = self.extract_features(prompt)
+
         score = 7.0  # 기본 점수
         suggestions = []
 
         # 과도한 정보 수집 지시 (-3점)
-        excessive = ['maximize context', 'all possible information', 'gather everything',
-                     'read all files', '모든 정보', '모든 파일']
-        excessive_count = sum(1 for phrase in excessive if phrase in prompt.lower())
+        excessive_count = sum(1 for phrase in self.EXCESSIVE_CONTEXT_KEYWORDS
+                              if phrase in features.keyword_hits)
         if excessive_count > 0:
             score -= excessive_count * 1.5
-            suggestions.append("과도한 컨텍스트 수집 지시는 토큰을 낭비합니다")
+            suggestions.append(message(MessageCode.EXCESSIVE_CONTEXT))
 
         # 균형잡힌 접근 (+2점)
-        balanced = ['sufficient', 'relevant', 'necessary', '필요한', '관련된']
-        if any(word in prompt.lower() for word in balanced):
+        if any(word in features.keyword_hits for word in self.BALANCED_CONTEXT_KEYWORDS):
             score += 2
         else:
-            suggestions.append("'sufficient' 또는 'relevant' 같은 균형잡힌 표현을 사용하세요")
+            suggestions.append(message(MessageCode.USE_BALANCED_WORDING))
 
         return max(0, min(10, score)), suggestions
 
-    def analyze_tool_preamble(self, prompt: str) -> Tuple[float, List[str]]:
+    def analyze_tool_preamble(self, prompt: str,
+                              features: Optional[PromptFeatures] = None) -> Tuple[float, List[Message]]:
         """
         도구 프리앰블 품질 평가
 
         Args:
             prompt: 분석할 프롬프트
+            features: 미리 추출한 프롬프트 특성 (None이면 새로 추출)
 
         Returns:
             (quality_score, suggestions): 점수(0-10)와 개선 제안
         """
+        if features is None:
+            features = self.extract_features(prompt)
+
         score = 3.0  # 기본 점수 (프리앰블 없으면 낮음)
         suggestions = []
+        hits = features.keyword_hits
 
         # 목표 재구성 요청 (+2점)
-        restate_keywords = ['rephrase', 'restate', 'clarify goal', '재구성', '명확히']
-        if any(keyword in prompt.lower() for keyword in restate_keywords):
+        if any(keyword in hits for keyword in self.RESTATE_KEYWORDS):
             score += 2
         else:
-            suggestions.append("사용자 목표를 재구성하도록 요청하세요")
+            suggestions.append(message(MessageCode.ASK_RESTATE_GOAL))
 
         # 계획 작성 요청 (+2점)
-        plan_keywords = ['plan', 'outline', 'steps', '계획', '단계']
-        if any(keyword in prompt.lower() for keyword in plan_keywords):
+        if any(keyword in hits for keyword in self.PLAN_KEYWORDS):
             score += 2
         else:
-            suggestions.append("구조화된 계획을 작성하도록 요청하세요")
+            suggestions.append(message(MessageCode.ASK_PLAN))
 
         # 진행 상황 업데이트 요청 (+3점)
-        progress_keywords = ['progress', 'update', 'status', '진행', '상황']
-        if any(keyword in prompt.lower() for keyword in progress_keywords):
+        if any(keyword in hits for keyword in self.PROGRESS_KEYWORDS):
             score += 3
         else:
-            suggestions.append("진행 상황 업데이트를 요청하세요")
+            suggestions.append(message(MessageCode.ASK_PROGRESS))
 
         return max(0, min(10, score)), suggestions
 
-    def calculate_complexity(self, prompt: str) -> float:
+    def calculate_complexity(self, prompt: str, features: Optional[PromptFeatures] = None) -> float:
         """
         프롬프트 복잡도 계산
 
         Args:
             prompt: 분석할 프롬프트
+            features: 미리 추출한 프롬프트 특성 (None이면 새로 추출)
 
         Returns:
             복잡도 점수 (0-10)
         """
+        if features is None:
+            features = self.extract_features(prompt)
+
         score = 0.0
 
         # 1. 길이 기반 (0-2점)
-        length = len(prompt)
+        length = features.length
         if length < 100:
             score += 0.5
         elif length < 300:
@@ -323,20 +611,16 @@ class GPT5PromptAnalyzer:
             score += 2.0
 
         # 2. 단계 수 (0-2점)
-        steps = len(re.findall(r'(?:step|단계)\s*\d+|^\d+\.|^-\s', prompt, re.IGNORECASE | re.MULTILINE))
-        score += min(2.0, steps * 0.4)
+        score += min(2.0, features.step_count * 0.4)
 
         # 3. 도구 사용 (0-2점)
-        tool_mentions = len(re.findall(r'(?:tool|function|api|도구|함수)', prompt, re.IGNORECASE))
-        score += min(2.0, tool_mentions * 0.5)
+        score += min(2.0, features.tool_count * 0.5)
 
         # 4. 조건부 로직 (0-2점)
-        conditionals = len(re.findall(r'(?:if|when|unless|만약|경우)', prompt, re.IGNORECASE))
-        score += min(2.0, conditionals * 0.4)
+        score += min(2.0, features.conditional_count * 0.4)
 
         # 5. 제약사항 (0-2점)
-        constraints = len(re.findall(r'(?:must|should|constraint|제약|필수)', prompt, re.IGNORECASE))
-        score += min(2.0, constraints * 0.4)
+        score += min(2.0, features.constraint_count * 0.4)
 
         return min(10.0, score)
 
@@ -359,25 +643,28 @@ class GPT5PromptAnalyzer:
         else:
             return ReasoningEffort.HIGH
 
-    def recommend_verbosity(self, prompt: str, complexity: float) -> Verbosity:
+    def recommend_verbosity(self, prompt: str, complexity: float,
+                            features: Optional[PromptFeatures] = None) -> Verbosity:
         """
         프롬프트 특성 기반 verbosity 추천
 
         Args:
             prompt: 분석할 프롬프트
             complexity: 복잡도 점수
+            features: 미리 추출한 프롬프트 특성 (None이면 새로 추출)
 
         Returns:
             추천 verbosity
         """
+        if features is None:
+            features = self.extract_features(prompt)
+
         # 간결함 요청 키워드
-        concise_keywords = ['brief', 'concise', 'short', 'quick', '간단히', '간결하게']
-        if any(keyword in prompt.lower() for keyword in concise_keywords):
+        if any(keyword in features.keyword_hits for keyword in self.CONCISE_KEYWORDS):
             return Verbosity.LOW
 
         # 상세함 요청 키워드
-        detailed_keywords = ['detailed', 'comprehensive', 'thorough', 'explain', '상세히', '자세히']
-        if any(keyword in prompt.lower() for keyword in detailed_keywords):
+        if any(keyword in features.keyword_hits for keyword in self.DETAILED_KEYWORDS):
             return Verbosity.HIGH
 
         # 복잡도 기반
@@ -388,50 +675,56 @@ class GPT5PromptAnalyzer:
         else:
             return Verbosity.HIGH
 
-    def is_xml_structured(self, prompt: str) -> bool:
+    def is_xml_structured(self, prompt: str, features: Optional[PromptFeatures] = None) -> bool:
         """
         XML 구조 사용 여부 확인
 
         Args:
             prompt: 분석할 프롬프트
+            features: 미리 추출한 프롬프트 특성 (None이면 새로 추출)
 
         Returns:
             XML 구조 사용 여부
         """
-        # 최소 2개 이상의 XML 태그 쌍이 있어야 함
-        opening_tags = re.findall(r'<(\w+)>', prompt)
-        closing_tags = re.findall(r'</(\w+)>', prompt)
+        if features is None:
+            features = self.extract_features(prompt)
 
-        return len(opening_tags) >= 2 and len(closing_tags) >= 2
+        # 최소 2개 이상의 XML 태그 쌍이 있어야 함
+        return len(features.xml_tags) >= 2 and len(features.xml_closing_tags) >= 2
 
-    def analyze(self, prompt: str) -> GPT5AnalysisResult:
+    def analyze(self, prompt: str, features: Optional[PromptFeatures] = None) -> GPT5AnalysisResult:
         """
         전체 분석 수행
 
         Args:
             prompt: 분석할 프롬프트
+            features: 미리 추출한 프롬프트 특성 (None이면 새로 추출)
 
         Returns:
             GPT-5 분석 결과
         """
+        # 0. 프롬프트 특성 추출 (모든 평가가 공유)
+        if features is None:
+            features = self.extract_features(prompt)
+
         # 1. 모순 탐지
-        contradictions = self.detect_contradictions(prompt)
+        contradictions = self.detect_contradictions(prompt, features)
 
         # 2. 각 영역 분석
-        agentic_score, agentic_suggestions = self.analyze_agentic_structure(prompt)
-        clarity_score, clarity_suggestions = self.analyze_clarity(prompt)
-        context_score, context_suggestions = self.analyze_context_efficiency(prompt)
-        tool_preamble_score, tool_suggestions = self.analyze_tool_preamble(prompt)
+        agentic_score, agentic_suggestions = self.analyze_agentic_structure(prompt, features)
+        clarity_score, clarity_suggestions = self.analyze_clarity(prompt, features)
+        context_score, context_suggestions = self.analyze_context_efficiency(prompt, features)
+        tool_preamble_score, tool_suggestions = self.analyze_tool_preamble(prompt, features)
 
         # 3. 복잡도 계산
-        complexity = self.calculate_complexity(prompt)
+        complexity = self.calculate_complexity(prompt, features)
 
         # 4. 파라미터 추천
         reasoning_effort = self.recommend_reasoning_effort(complexity)
-        verbosity = self.recommend_verbosity(prompt, complexity)
+        verbosity = self.recommend_verbosity(prompt, complexity, features)
 
         # 5. XML 구조 확인
-        xml_structured = self.is_xml_structured(prompt)
+        xml_structured = self.is_xml_structured(prompt, features)
 
         # 6. 이슈 및 제안 통합
         issues = []
@@ -450,24 +743,24 @@ class GPT5PromptAnalyzer:
             issues.append({
                 'type': 'agentic_structure',
                 'severity': 'medium',
-                'description': f'Agentic 구조 점수가 낮습니다 ({agentic_score:.1f}/10)',
-                'fix': 'Agentic 패턴을 추가하세요'
+                'description': message(MessageCode.LOW_AGENTIC_SCORE, agentic_score),
+                'fix': message(MessageCode.ADD_AGENTIC_PATTERNS)
             })
 
         if clarity_score < 6:
             issues.append({
                 'type': 'clarity',
                 'severity': 'medium',
-                'description': f'명확성 점수가 낮습니다 ({clarity_score:.1f}/10)',
-                'fix': 'XML 구조나 명확한 섹션 구분을 추가하세요'
+                'description': message(MessageCode.LOW_CLARITY_SCORE, clarity_score),
+                'fix': message(MessageCode.ADD_XML_OR_SECTIONS)
             })
 
         if context_score < 6:
             issues.append({
                 'type': 'context_efficiency',
                 'severity': 'low',
-                'description': f'컨텍스트 효율성이 낮습니다 ({context_score:.1f}/10)',
-                'fix': '균형잡힌 컨텍스트 수집 지시를 사용하세요'
+                'description': message(MessageCode.LOW_CONTEXT_EFFICIENCY, context_score),
+                'fix': message(MessageCode.USE_BALANCED_CONTEXT)
             })
 
         # 모든 제안 통합
@@ -488,7 +781,8 @@ class GPT5PromptAnalyzer:
             xml_structured=xml_structured,
             issues=issues,
             suggestions=all_suggestions,
-            complexity_score=complexity
+            complexity_score=complexity,
+            rule_version=self.rules.version
         )
 
 
@@ -5,41 +5,191 @@ GPT-5 프롬프트 분석 및 최적화 통합 엔진
 분석과 최적화를 하나의 파이프라인으로 실행하는 통합 API 제공
 """
 
-from typing import Dict, Optional
-from dataclasses import dataclass, asdict
+import threading
+from typing import TYPE_CHECKING, Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Optional, Union
+from dataclasses import dataclass, replace
 
-from .gpt5_analyzer import GPT5PromptAnalyzer, GPT5AnalysisResult, format_analysis_result
+from .gpt5_analyzer import GPT5PromptAnalyzer, GPT5AnalysisResult, GPT5RuleSet, format_analysis_result
 from .gpt5_optimizer import GPT5PromptOptimizer, GPT5OptimizationResult, format_optimization_result
+from .cache import CacheBackend, make_cache_key
+from .pattern_registry import DEFAULT_GPT5_PATTERNS_FILE, PatternWatcher, get_gpt5_rules, get_watcher
+from .records import dump_json, frozen_dataclass
 
+if TYPE_CHECKING:
+    from .aio import AsyncRunner
 
-@dataclass
+
+@frozen_dataclass
 class GPT5PipelineResult:
     """GPT-5 파이프라인 전체 결과"""
     original_prompt: str
     analysis: GPT5AnalysisResult
     optimization: GPT5OptimizationResult
+    rule_version: Optional[str] = None  # 파이프라인에 사용된 패턴 파일 버전
 
     def to_dict(self) -> Dict:
         """딕셔너리로 변환"""
         return {
             'original_prompt': self.original_prompt,
             'analysis': self.analysis.to_dict(),
-            'optimization': self.optimization.to_dict()
+            'optimization': self.optimization.to_dict(),
+            'rule_version': self.rule_version
         }
 
+    def to_json(self) -> str:
+        """JSON 문자열로 변환"""
+        return dump_json(self.to_dict())
+
+
+def _copy_result(result: Any) -> Any:
+    """
+    캐시에 저장하거나 캐시에서 꺼낸 결과 복사
+
+    호출자가 결과를 수정해도 캐시 항목이 바뀌지 않도록 변경 가능한 컨테이너(목록, 딕셔너리)를
+    복사합니다. 메시지와 모순 정보는 변경할 수 없는 객체이므로 복사하지 않습니다.
+
+    Args:
+        result: 복사할 분석, 최적화 또는 파이프라인 결과
+
+    Returns:
+        캐시 항목과 컨테이너를 공유하지 않는 결과
+    """
+    if isinstance(result, GPT5AnalysisResult):
+        return replace(
+            result,
+            contradictions=list(result.contradictions),
+            issues=[dict(issue) for issue in result.issues],
+            suggestions=list(result.suggestions)
+        )
+    if isinstance(result, GPT5OptimizationResult):
+        return replace(
+            result,
+            improvements=list(result.improvements),
+            parameter_config=dict(result.parameter_config),
+            added_features=list(result.added_features)
+        )
+    if isinstance(result, GPT5PipelineResult):
+        return replace(
+            result,
+            analysis=_copy_result(result.analysis),
+            optimization=_copy_result(result.optimization)
+        )
+    return result
+
+
+@dataclass(frozen=True)
+class GPT5EngineState:
+    """엔진이 한 요청을 처리하는 동안 사용하는 규칙 스냅샷"""
+    rules: GPT5RuleSet
+    analyzer: GPT5PromptAnalyzer
+    optimizer: GPT5PromptOptimizer
+
+    @property
+    def rule_version(self) -> Optional[str]:
+        return self.rules.version
+
 
 class GPT5Engine:
     """GPT-5 통합 엔진"""
 
-    def __init__(self, patterns_file: Optional[str] = None):
+    def __init__(self, patterns_file: Optional[str] = None, hot_reload: bool = False,
+                 cache: Optional[CacheBackend] = None, async_runner: Optional["AsyncRunner"] = None):
         """
         초기화
 
         Args:
             patterns_file: GPT-5 패턴 파일 경로 (None이면 기본 경로 사용)
+            hot_reload: True이면 패턴 파일 변경 시 규칙을 자동으로 교체
+            cache: 결과 캐시 (프롬프트 해시 + 패턴 버전 기준, None이면 캐시하지 않음)
+            async_runner: 비동기 API가 사용할 실행기 (None이면 전역 실행기)
+        """
+        self.patterns_file = patterns_file
+        self.cache = cache
+        self.async_runner = async_runner
+        self._reload_lock = threading.Lock()
+        # 패턴 파일은 전역 레지스트리에서 한 번만 로드해 분석기/최적화기가 공유
+        self._state = self._build_state(get_gpt5_rules(patterns_file))
+
+        if hot_reload:
+            self.enable_hot_reload()
+
+    @staticmethod
+    def _build_state(rules: GPT5RuleSet) -> GPT5EngineState:
+        return GPT5EngineState(
+            rules=rules,
+            analyzer=GPT5PromptAnalyzer(rules=rules),
+            optimizer=GPT5PromptOptimizer(patterns=rules.patterns)
+        )
+
+    @property
+    def rules(self) -> GPT5RuleSet:
+        return self._state.rules
+
+    @property
+    def analyzer(self) -> GPT5PromptAnalyzer:
+        return self._state.analyzer
+
+    @property
+    def optimizer(self) -> GPT5PromptOptimizer:
+        return self._state.optimizer
+
+    @property
+    def rule_version(self) -> Optional[str]:
+        """현재 사용 중인 패턴 파일 버전"""
+        return self._state.rule_version
+
+    def reload(self) -> bool:
         """
-        self.analyzer = GPT5PromptAnalyzer(patterns_file)
-        self.optimizer = GPT5PromptOptimizer(patterns_file)
+        패턴 파일이 바뀐 경우 규칙을 다시 컴파일해 교체
+
+        새 규칙은 완전히 만들어진 뒤 참조 하나로 교체되므로
+        처리 중인 요청은 시작할 때의 규칙으로 끝까지 실행됩니다.
+
+        Returns:
+            규칙이 교체되었는지 여부
+        """
+        # 바뀌지 않은 경우(대부분)는 잠금 없이 확인
+        if get_gpt5_rules(self.patterns_file) is self._state.rules:
+            return False
+
+        with self._reload_lock:
+            rules = get_gpt5_rules(self.patterns_file)
+            if rules is self._state.rules:
+                return False
+            self._state = self._build_state(rules)
+            return True
+
+    def enable_hot_reload(self, watcher: Optional[PatternWatcher] = None):
+        """
+        패턴 파일 감시 시작
+
+        Args:
+            watcher: 사용할 감시자 (None이면 전역 감시자)
+        """
+        patterns_file = self.patterns_file
+        if patterns_file is None:
+            patterns_file = DEFAULT_GPT5_PATTERNS_FILE
+
+        watcher = watcher if watcher is not None else get_watcher()
+        watcher.watch([patterns_file], self.reload)
+
+    def disable_hot_reload(self, watcher: Optional[PatternWatcher] = None):
+        """패턴 파일 감시 중지"""
+        watcher = watcher if watcher is not None else get_watcher()
+        watcher.unwatch(self.reload)
+
+    def _cached(self, kind: str, prompt: str, state: GPT5EngineState, compute: Callable[[], Any]) -> Any:
+        """캐시가 설정되어 있으면 (종류, 프롬프트, 패턴 버전) 기준으로 결과 재사용"""
+        if self.cache is None:
+            return compute()
+
+        key = make_cache_key("gpt5", kind, prompt, state.rule_version)
+        result = self.cache.get(key)
+        if result is None:
+            result = compute()
+            self.cache.set(key, _copy_result(result))
+            return result
+        return _copy_result(result)
 
     def analyze(self, prompt: str) -> GPT5AnalysisResult:
         """
@@ -51,7 +201,8 @@ class GPT5Engine:
         Returns:
             GPT-5 분석 결과
         """
-        return self.analyzer.analyze(prompt)
+        state = self._state
+        return self._cached("analysis", prompt, state, lambda: state.analyzer.analyze(prompt))
 
     def optimize(self, prompt: str) -> GPT5OptimizationResult:
         """
@@ -63,13 +214,16 @@ class GPT5Engine:
         Returns:
             GPT-5 최적화 결과
         """
-        # 먼저 분석
-        analysis = self.analyzer.analyze(prompt)
+        state = self._state
+
+        def compute() -> GPT5OptimizationResult:
+            # 먼저 분석
+            analysis = state.analyzer.analyze(prompt)
 
-        # 분석 결과로 최적화
-        optimization = self.optimizer.optimize(analysis)
+            # 분석 결과로 최적화
+            return state.optimizer.optimize(analysis)
 
-        return optimization
+        return self._cached("optimization", prompt, state, compute)
 
     def analyze_and_optimize(self, prompt: str) -> GPT5PipelineResult:
         """
@@ -81,17 +235,133 @@ class GPT5Engine:
         Returns:
             전체 파이프라인 결과
         """
-        # 분석
-        analysis = self.analyzer.analyze(prompt)
+        state = self._state
 
-        # 최적화
-        optimization = self.optimizer.optimize(analysis)
+        def compute() -> GPT5PipelineResult:
+            # 분석
+            analysis = state.analyzer.analyze(prompt)
 
-        return GPT5PipelineResult(
-            original_prompt=prompt,
-            analysis=analysis,
-            optimization=optimization
-        )
+            # 최적화
+            optimization = state.optimizer.optimize(analysis)
+
+            return GPT5PipelineResult(
+                original_prompt=prompt,
+                analysis=analysis,
+                optimization=optimization,
+                rule_version=state.rule_version
+            )
+
+        return self._cached("pipeline", prompt, state, compute)
+
+    def _get_async_runner(self) -> "AsyncRunner":
+        if self.async_runner is not None:
+            return self.async_runner
+
+        # asyncio는 비동기 API를 처음 사용할 때 로드
+        from .aio import get_async_runner
+        return get_async_runner()
+
+    async def aanalyze(self, prompt: str, timeout: Optional[float] = None) -> GPT5AnalysisResult:
+        """
+        프롬프트 분석 (이벤트 루프를 막지 않도록 실행기에서 실행)
+
+        Args:
+            prompt: 분석할 프롬프트
+            timeout: 시간 제한 (초, 동시 실행 대기 포함, None이면 실행기 기본값)
+
+        Returns:
+            GPT-5 분석 결과
+
+        Raises:
+            TimeoutError: 시간 제한 초과
+        """
+        return await self._get_async_runner().run(self.analyze, prompt, timeout=timeout)
+
+    async def aoptimize(self, prompt: str, timeout: Optional[float] = None) -> GPT5OptimizationResult:
+        """
+        프롬프트 최적화 (이벤트 루프를 막지 않도록 실행기에서 실행)
+
+        Args:
+            prompt: 최적화할 프롬프트
+            timeout: 시간 제한 (초, 동시 실행 대기 포함, None이면 실행기 기본값)
+
+        Returns:
+            GPT-5 최적화 결과
+
+        Raises:
+            TimeoutError: 시간 제한 초과
+        """
+        return await self._get_async_runner().run(self.optimize, prompt, timeout=timeout)
+
+    async def aanalyze_and_optimize(self, prompt: str, timeout: Optional[float] = None) -> GPT5PipelineResult:
+        """
+        분석과 최적화 전체 파이프라인 실행 (이벤트 루프를 막지 않도록 실행기에서 실행)
+
+        Args:
+            prompt: 분석 및 최적화할 프롬프트
+            timeout: 시간 제한 (초, 동시 실행 대기 포함, None이면 실행기 기본값)
+
+        Returns:
+            전체 파이프라인 결과
+
+        Raises:
+            TimeoutError: 시간 제한 초과
+        """
+        return await self._get_async_runner().run(self.analyze_and_optimize, prompt, timeout=timeout)
+
+    async def aprocess_batch(self, prompts: Union[Iterable[str], AsyncIterable[str]],
+                             timeout: Optional[float] = None,
+                             return_exceptions: bool = False) -> AsyncIterator[Any]:
+        """
+        여러 프롬프트의 전체 파이프라인을 동시에 실행하고 입력 순서대로 반환
+
+        Args:
+            prompts: 프롬프트 목록 (비동기 이터러블 가능)
+            timeout: 프롬프트별 시간 제한 (초, None이면 실행기 기본값)
+            return_exceptions: True이면 프롬프트별 오류(시간 제한 포함)를 예외 객체로 반환
+
+        Returns:
+            GPT5PipelineResult (또는 예외 객체) 비동기 이터레이터
+        """
+        on_error = (lambda prompt, error: error) if return_exceptions else None
+        async for result in self._get_async_runner().map(
+                self.analyze_and_optimize, prompts, timeout=timeout, on_error=on_error):
+            yield result
+
+    def get_cache_statistics(self) -> Optional[Dict[str, Any]]:
+        """결과 캐시 통계 (캐시가 없으면 None)"""
+        return self.cache.stats() if self.cache is not None else None
+
+
+# 간편 API용 엔진 캐시: {패턴 파일: 엔진}
+_engines: Dict[Optional[str], GPT5Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(patterns_file: Optional[str] = None) -> GPT5Engine:
+    """
+    패턴 파일별로 캐시된 엔진 반환
+
+    패턴 파일 내용이 바뀐 경우 엔진의 규칙을 교체합니다.
+    바뀌지 않은 경우는 잠금 없이 stat 한 번으로 확인하며, 감시 스레드는 시작하지 않습니다.
+
+    Args:
+        patterns_file: 패턴 파일 경로 (None이면 기본 경로 사용)
+
+    Returns:
+        GPT-5 통합 엔진
+    """
+    engine = _engines.get(patterns_file)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(patterns_file)
+            if engine is None:
+                engine = GPT5Engine(patterns_file)
+                _engines[patterns_file] = engine
+                return engine
+
+    engine.reload()
+    return engine
 
 
 def format_pipeline_result(result: GPT5PipelineResult, include_analysis: bool = True) -> str:
@@ -230,7 +500,7 @@ def analyze_prompt(prompt: str, patterns_file: Optional[str] = None) -> str:
     Returns:
         포맷팅된 분석 결과
     """
-    engine = GPT5Engine(patterns_file)
+    engine = get_engine(patterns_file)
     result = engine.analyze(prompt)
     return format_analysis_result(result)
 
@@ -246,7 +516,7 @@ def optimize_prompt(prompt: str, patterns_file: Optional[str] = None) -> str:
     Returns:
         포맷팅된 최적화 결과
     """
-    engine = GPT5Engine(patterns_file)
+    engine = get_engine(patterns_file)
     result = engine.optimize(prompt)
     return format_optimization_result(result)
 
@@ -263,7 +533,7 @@ def analyze_and_optimize_prompt(prompt: str, patterns_file: Optional[str] = None
     Returns:
         포맷팅된 전체 결과
     """
-    engine = GPT5Engine(patterns_file)
+    engine = get_engine(patterns_file)
     result = engine.analyze_and_optimize(prompt)
     return format_pipeline_result(result, include_analysis)
 
@@ -272,6 +542,8 @@ def analyze_and_optimize_prompt(prompt: str, patterns_file: Optional[str] = None
 __all__ = [
     'GPT5Engine',
     'GPT5PipelineResult',
+    'GPT5EngineState',
+    'get_engine',
     'analyze_prompt',
     'optimize_prompt',
     'analyze_and_optimize_prompt',
@@ -12,14 +12,17 @@ GPT-5 prompting guide 기반으로 프롬프트를 최적화합니다:
 
 import re
 import json
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional
+from typing import List, Dict, Mapping, Optional
 from pathlib import Path
 
 from .gpt5_analyzer import GPT5AnalysisResult, Contradiction
+from .pattern_pack import DEFAULT_PATTERNS_DIR
+from .pattern_registry import get_registry
+from .messages import Message, MessageCode, message, render_messages
+from .records import dump_json, frozen_dataclass
 
 
-@dataclass
+@frozen_dataclass
 class GPT5OptimizationResult:
     """GPT-5 최적화 결과"""
     original_prompt: str
@@ -27,35 +30,54 @@ class GPT5OptimizationResult:
     xml_structured_prompt: str
     reasoning_effort: str
     verbosity: str
-    improvements: List[str]
+    improvements: List[Message]
     parameter_config: Dict[str, str]
     removed_contradictions: int
     added_features: List[str]
+    rule_version: Optional[str] = None  # 최적화에 사용된 패턴 파일 버전
 
     def to_dict(self) -> Dict:
         """딕셔너리로 변환"""
-        return asdict(self)
+        return {
+            'original_prompt': self.original_prompt,
+            'optimized_prompt': self.optimized_prompt,
+            'xml_structured_prompt': self.xml_structured_prompt,
+            'reasoning_effort': self.reasoning_effort,
+            'verbosity': self.verbosity,
+            'improvements': render_messages(self.improvements),
+            'parameter_config': dict(self.parameter_config),
+            'removed_contradictions': self.removed_contradictions,
+            'added_features': list(self.added_features),
+            'rule_version': self.rule_version
+        }
+
+    def to_json(self) -> str:
+        """JSON 문자열로 변환"""
+        return dump_json(self.to_dict())
 
 
 class GPT5PromptOptimizer:
     """GPT-5 전용 최적화기"""
 
-    def __init__(self, patterns_file: Optional[str] = None):
+    def __init__(self, patterns_file: Optional[str] = None, patterns: Optional[Mapping] = None):
         """
         초기화
 
         Args:
             patterns_file: GPT-5 패턴 파일 경로 (None이면 기본 경로 사용)
+            patterns: 이미 로드된 패턴 데이터 (지정 시 patterns_file 무시)
         """
-        if patterns_file is None:
-            # 기본 패턴 파일 경로
-            current_dir = Path(__file__).parent
-            patterns_file = current_dir.parent / "references" / "patterns" / "gpt5_patterns.json"
+        if patterns is None:
+            if patterns_file is None:
+                # 기본 패턴 파일 경로
+                patterns_file = DEFAULT_PATTERNS_DIR / "gpt5_patterns.json"
+
+            # 전역 레지스트리에서 읽기 전용 패턴 공유 (파일 I/O는 내용이 바뀔 때만)
+            patterns = get_registry().get_patterns(patterns_file)
 
-        with open(patterns_file, 'r', encoding='utf-8') as f:
-            self.patterns = json.load(f)
+        self.patterns = patterns
 
-    def remove_contradictions(self, prompt: str, contradictions: List[Contradiction]) -> tuple[str, List[str]]:
+    def remove_contradictions(self, prompt: str, contradictions: List[Contradiction]) -> tuple[str, List[Message]]:
         """
         모순 제거 및 통합
 
@@ -74,17 +96,17 @@ class GPT5PromptOptimizer:
             if "never.*without" in contradiction.pattern and "auto.*without" in contradiction.pattern:
                 # 우선순위 명시로 수정
                 modified_prompt = self._fix_permission_contradiction(modified_prompt)
-                fixes.append(f"모순 제거: {contradiction.description} → 우선순위 명시")
+                fixes.append(message(MessageCode.CONTRADICTION_PRIORITIZED, contradiction.description))
 
             elif "always confirm" in contradiction.pattern and "proceed without" in contradiction.pattern:
                 # 조건부 로직으로 수정
                 modified_prompt = self._fix_confirmation_contradiction(modified_prompt)
-                fixes.append(f"모순 제거: {contradiction.description} → 조건부 확인 로직")
+                fixes.append(message(MessageCode.CONTRADICTION_CONDITIONAL, contradiction.description))
 
             elif "thoroughly" in contradiction.pattern or "maximize" in contradiction.pattern:
                 # 균형잡힌 표현으로 수정
                 modified_prompt = self._fix_thoroughness_contradiction(modified_prompt)
-                fixes.append(f"모순 제거: {contradiction.description} → 균형잡힌 접근")
+                fixes.append(message(MessageCode.CONTRADICTION_BALANCED, contradiction.description))
 
         return modified_prompt, fixes
 
@@ -127,7 +149,7 @@ class GPT5PromptOptimizer:
         )
         return prompt
 
-    def apply_xml_structure(self, prompt: str, analysis: GPT5AnalysisResult) -> tuple[str, List[str]]:
+    def apply_xml_structure(self, prompt: str, analysis: GPT5AnalysisResult) -> tuple[str, List[Message]]:
         """
         XML 구조 적용
 
@@ -144,11 +166,11 @@ class GPT5PromptOptimizer:
         if analysis.xml_structured:
             # 기존 XML 구조 개선
             xml_prompt = prompt
-            improvements.append("기존 XML 구조 유지 및 개선")
+            improvements.append(message(MessageCode.XML_STRUCTURE_KEPT))
         else:
             # 새로운 XML 구조 생성
             xml_prompt = self._create_xml_structure(prompt, analysis)
-            improvements.append("XML 구조 생성")
+            improvements.append(message(MessageCode.XML_STRUCTURE_CREATED))
 
         return xml_prompt, improvements
 
@@ -245,7 +267,7 @@ class GPT5PromptOptimizer:
         """Escape hatch 생성"""
         return "If 70% confident in the solution, proceed with best judgment and document assumptions."
 
-    def add_tool_preambles(self, prompt: str, analysis: GPT5AnalysisResult) -> tuple[str, List[str]]:
+    def add_tool_preambles(self, prompt: str, analysis: GPT5AnalysisResult) -> tuple[str, List[Message]]:
         """
         도구 프리앰블 추가
 
@@ -260,7 +282,7 @@ class GPT5PromptOptimizer:
 
         # 도구 프리앰블이 이미 있는지 확인
         if analysis.tool_preamble_quality >= 7:
-            return prompt, ["기존 도구 프리앰블 충분"]
+            return prompt, [message(MessageCode.TOOL_PREAMBLE_SUFFICIENT)]
 
         # 프리앰블 추가
         preamble_section = "\n\n## Tool Usage Guidelines\n\n"
@@ -275,11 +297,11 @@ class GPT5PromptOptimizer:
             preamble_section += f"- {example}\n"
 
         enhanced_prompt = prompt + preamble_section
-        improvements.append("도구 프리앰블 추가 (목표 재구성, 계획, 진행 상황 업데이트)")
+        improvements.append(message(MessageCode.TOOL_PREAMBLE_ADDED))
 
         return enhanced_prompt, improvements
 
-    def apply_agentic_patterns(self, prompt: str, analysis: GPT5AnalysisResult) -> tuple[str, List[str]]:
+    def apply_agentic_patterns(self, prompt: str, analysis: GPT5AnalysisResult) -> tuple[str, List[Message]]:
         """
         Agentic 패턴 적용
 
@@ -309,11 +331,11 @@ class GPT5PromptOptimizer:
             agentic_section += f"- {prompt_pattern}\n"
 
         enhanced_prompt = prompt + agentic_section
-        improvements.append(f"Agentic 패턴 적용: {eagerness} ({pattern['description']})")
+        improvements.append(message(MessageCode.AGENTIC_PATTERN_APPLIED, eagerness, pattern['description']))
 
         return enhanced_prompt, improvements
 
-    def optimize_verbosity(self, prompt: str, analysis: GPT5AnalysisResult) -> tuple[str, List[str]]:
+    def optimize_verbosity(self, prompt: str, analysis: GPT5AnalysisResult) -> tuple[str, List[Message]]:
         """
         Verbosity 최적화
 
@@ -332,24 +354,24 @@ class GPT5PromptOptimizer:
             verbosity_instruction += "- Be concise and direct\n"
             verbosity_instruction += "- Focus on essential information only\n"
             verbosity_instruction += "- Avoid unnecessary explanations\n"
-            improvements.append("Verbosity 최적화: 간결한 응답")
+            improvements.append(message(MessageCode.VERBOSITY_LOW))
 
         elif analysis.verbosity_recommendation == "high":
             verbosity_instruction += "- Provide detailed explanations\n"
             verbosity_instruction += "- Include examples and alternatives\n"
             verbosity_instruction += "- Explain reasoning and background\n"
-            improvements.append("Verbosity 최적화: 상세한 응답")
+            improvements.append(message(MessageCode.VERBOSITY_HIGH))
 
         else:
             verbosity_instruction += "- Provide balanced explanations\n"
             verbosity_instruction += "- Include context where helpful\n"
-            improvements.append("Verbosity 최적화: 균형잡힌 응답")
+            improvements.append(message(MessageCode.VERBOSITY_MEDIUM))
 
         enhanced_prompt = prompt + verbosity_instruction
 
         return enhanced_prompt, improvements
 
-    def fix_anti_patterns(self, prompt: str) -> tuple[str, List[str]]:
+    def fix_anti_patterns(self, prompt: str) -> tuple[str, List[Message]]:
         """
         Anti-pattern 수정
 
@@ -373,7 +395,7 @@ class GPT5PromptOptimizer:
                     modified_prompt,
                     flags=re.IGNORECASE
                 )
-                fixes.append(f"Anti-pattern 수정: {anti_pattern['description']}")
+                fixes.append(message(MessageCode.ANTI_PATTERN_FIXED, anti_pattern['description']))
 
         # 2. Escape hatch 추가
         anti_pattern = self.patterns['anti_patterns']['missing_escape_hatches']
@@ -386,7 +408,7 @@ class GPT5PromptOptimizer:
                     modified_prompt,
                     flags=re.IGNORECASE
                 )
-                fixes.append(f"Anti-pattern 수정: {anti_pattern['description']}")
+                fixes.append(message(MessageCode.ANTI_PATTERN_FIXED, anti_pattern['description']))
 
         # 3. 명확한 도구 정의
         anti_pattern = self.patterns['anti_patterns']['ambiguous_tool_definitions']
@@ -399,7 +421,7 @@ class GPT5PromptOptimizer:
                     modified_prompt,
                     flags=re.IGNORECASE
                 )
-                fixes.append(f"Anti-pattern 수정: {anti_pattern['description']}")
+                fixes.append(message(MessageCode.ANTI_PATTERN_FIXED, anti_pattern['description']))
 
         return modified_prompt, fixes
 
@@ -470,7 +492,8 @@ class GPT5PromptOptimizer:
             improvements=all_improvements,
             parameter_config=parameter_config,
             removed_contradictions=len(analysis.contradictions),
-            added_features=added_features
+            added_features=added_features,
+            rule_version=analysis.rule_version
         )
 
 
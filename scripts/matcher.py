@@ -0,0 +1,309 @@
+"""
+Keyword Matcher
+다중 키워드/정규식 매처
+
+- KeywordMatcher: Aho-Corasick 오토마톤으로 여러 키워드를 한 번의 순회로 매칭
+- RegexPatternSet: 여러 정규식을 이름 있는 그룹의 단일 alternation으로 컴파일
+- KeywordIndex: 텍스트 편집에 맞춰 편집 구간 주변만 다시 스캔하는 키워드 출현 인덱스
+
+키워드·패턴 수와 관계없이 프롬프트를 한 번만 순회합니다.
+"""
+
+import re
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """Aho-Corasick 오토마톤 기반 다중 키워드 매처"""
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        초기화
+
+        Args:
+            keywords: 찾을 키워드 목록 (중복과 빈 문자열은 무시)
+        """
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(k for k in keywords if k))
+        self._build()
+
+    def _build(self):
+        """트라이 구성 후 실패 링크를 따라 결정적 전이표(DFA) 생성"""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[str, ...]] = [()]
+
+        # 1. 트라이 구성
+        for keyword in self.keywords:
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append(())
+                state = next_state
+            outputs[state] = outputs[state] + (keyword,)
+
+        # 2. BFS로 실패 링크를 계산하면서 전이표를 완성
+        # 키워드에 등장하지 않는 문자는 항상 루트(0)로 돌아가므로 전이표에서 생략
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = delta[fail[state]]
+            # 실패 상태의 전이를 먼저 상속한 뒤 자신의 전이로 덮어씀
+            transitions = dict(fallback)
+            for char, next_state in goto[state].items():
+                fail[next_state] = fallback.get(char, 0)
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+                transitions[char] = next_state
+                queue.append(next_state)
+            delta[state] = transitions
+
+        # 빌드 후에는 변경하지 않으므로 여러 스레드가 잠금 없이 공유
+        self._delta = tuple(delta)
+        self._outputs = tuple(outputs)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        모든 키워드 출현을 (시작 위치, 키워드) 형태로 반환
+
+        Args:
+            text: 검색할 텍스트
+
+        Returns:
+            끝 위치 순서로 정렬된 (시작 위치, 키워드) 이터레이터
+        """
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+
+        for end, char in enumerate(text, 1):
+            state = delta[state].get(char, 0)
+            for keyword in outputs[state]:
+                yield end - len(keyword), keyword
+
+    def find_all(self, text: str) -> Set[str]:
+        """
+        텍스트에 등장하는 키워드 집합 반환
+
+        Args:
+            text: 검색할 텍스트
+
+        Returns:
+            한 번 이상 등장한 키워드 집합
+        """
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        hits = set()
+
+        for char in text:
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                hits.update(outputs[state])
+
+        return hits
+
+    def count_all(self, text: str) -> Dict[str, int]:
+        """
+        키워드별 출현 횟수 반환 (겹치는 출현 포함)
+
+        Args:
+            text: 검색할 텍스트
+
+        Returns:
+            {키워드: 출현 횟수} (등장한 키워드만 포함)
+        """
+        counts: Dict[str, int] = {}
+        for _, keyword in self.iter_matches(text):
+            counts[keyword] = counts.get(keyword, 0) + 1
+        return counts
+
+
+def _occurrence_order(occurrence: Tuple[int, str]) -> Tuple[int, int]:
+    """출현 정렬 기준: 시작 위치순, 같은 위치에서는 긴 키워드 우선"""
+    return occurrence[0], -len(occurrence[1])
+
+
+class KeywordIndex:
+    """
+    텍스트 편집에 따라 갱신되는 키워드 출현 인덱스
+
+    모든 출현 위치를 정렬된 목록으로 보관하고, 편집이 일어나면
+    편집 구간과 앞뒤 (최대 키워드 길이 - 1)자만 다시 스캔합니다.
+    편집 구간과 겹치지 않는 출현은 위치만 이동하므로 결과는 전체 재스캔과 같습니다.
+    """
+
+    def __init__(self, matcher: KeywordMatcher, text: str):
+        """
+        초기화
+
+        Args:
+            matcher: 키워드 오토마톤
+            text: 초기 텍스트
+        """
+        self.matcher = matcher
+        # 편집 위치에서 이만큼 떨어진 출현은 편집의 영향을 받지 않음
+        self.reach = max((len(k) for k in matcher.keywords), default=0) - 1
+        self.occurrences: List[Tuple[int, str]] = []
+        self._starts: List[int] = []
+        self.counts: Dict[str, int] = {}
+        self.reset(text)
+
+    def reset(self, text: str):
+        """텍스트 전체를 다시 스캔"""
+        self.occurrences = sorted(self.matcher.iter_matches(text), key=_occurrence_order)
+        self._starts = [position for position, _ in self.occurrences]
+        self.counts = {}
+        for _, keyword in self.occurrences:
+            self.counts[keyword] = self.counts.get(keyword, 0) + 1
+
+    @property
+    def hits(self) -> Set[str]:
+        """한 번 이상 등장한 키워드 집합"""
+        return set(self.counts)
+
+    def update(self, text: str, start: int, end: int, new_end: int):
+        """
+        편집 반영
+
+        Args:
+            text: 편집 후 전체 텍스트
+            start: 편집 시작 위치
+            end: 편집 전 텍스트에서 교체된 구간의 끝
+            new_end: 편집 후 텍스트에서 새로 들어간 구간의 끝
+        """
+        reach = self.reach
+        if reach < 0:
+            return
+        delta = new_end - end
+        occurrences = self.occurrences
+        counts = self.counts
+
+        # 시작 위치가 start - reach보다 앞인 출현은 편집 구간에 닿지 않음
+        low = bisect_left(self._starts, start - reach)
+        high = bisect_left(self._starts, end)
+
+        kept = []
+        for occurrence in occurrences[low:high]:
+            position, keyword = occurrence
+            if position + len(keyword) <= start:
+                kept.append(occurrence)
+            else:
+                # 편집 구간과 겹친 출현 제거
+                remaining = counts[keyword] - 1
+                if remaining:
+                    counts[keyword] = remaining
+                else:
+                    del counts[keyword]
+
+        # 편집 구간과 겹치는 새 출현만 추가
+        window_start = max(0, start - reach)
+        window = text[window_start:new_end + reach]
+        for offset, keyword in self.matcher.iter_matches(window):
+            position = window_start + offset
+            if position < new_end and position + len(keyword) > start:
+                kept.append((position, keyword))
+                counts[keyword] = counts.get(keyword, 0) + 1
+        kept.sort(key=_occurrence_order)
+
+        shifted = [(position + delta, keyword) for position, keyword in occurrences[high:]]
+        self.occurrences = occurrences[:low] + kept + shifted
+        self._starts = [position for position, _ in self.occurrences]
+
+
+def _alternation(patterns: Tuple[Tuple[str, str], ...], flags: int) -> "re.Pattern":
+    """
+    (이름, 정규식) 목록을 이름 있는 그룹의 단일 alternation으로 컴파일
+
+    전방 탐색(lookahead)으로 감싸 문자를 소비하지 않으므로
+    탐욕적 패턴(.*)이 다른 패턴의 매치를 가리지 않음
+    """
+    alternation = "|".join(f"(?P<{name}>{pattern})" for name, pattern in patterns)
+    return re.compile(f"(?=(?:{alternation}))", flags)
+
+
+class RegexPatternSet:
+    """이름 있는 그룹의 단일 alternation으로 컴파일된 정규식 집합"""
+
+    # 남은 패턴 조합별 alternation 캐시 크기
+    SUBSET_CACHE_SIZE = 256
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]], flags: int = 0):
+        """
+        초기화
+
+        Args:
+            patterns: (이름, 정규식) 목록. 이름은 파이썬 식별자여야 함
+            flags: 모든 패턴에 공통으로 적용할 re 플래그
+        """
+        self.flags = flags
+        self.patterns: Dict[str, "re.Pattern"] = {
+            name: re.compile(pattern, flags) for name, pattern in patterns
+        }
+        self._regex = self._compile(tuple(self.patterns)) if self.patterns else None
+        # 남은 패턴 이름 튜플 → alternation (첫 스캔 이후 아직 찾지 못한 패턴용)
+        self._subsets: Dict[Tuple[str, ...], "re.Pattern"] = {}
+
+    def _compile(self, names: Tuple[str, ...]) -> "re.Pattern":
+        return _alternation(tuple((name, self.patterns[name].pattern) for name in names), self.flags)
+
+    def _subset_regex(self, names: Tuple[str, ...]) -> "re.Pattern":
+        """남은 패턴들의 alternation (조합별로 한 번만 컴파일)"""
+        regex = self._subsets.get(names)
+        if regex is None:
+            if len(self._subsets) >= self.SUBSET_CACHE_SIZE:
+                self._subsets = {}
+            regex = self._compile(names)
+            self._subsets[names] = regex
+        return regex
+
+    def __getstate__(self):
+        # 조합별 alternation 캐시는 저장하지 않음 (패턴 팩 등)
+        state = self.__dict__.copy()
+        state['_subsets'] = {}
+        return state
+
+    def search_all(self, text: str) -> Dict[str, Tuple[str, int]]:
+        """
+        각 패턴의 첫 번째 매치를 탐색
+
+        패턴별로 re.search를 실행한 것과 같은 결과를 반환합니다.
+        한 위치에서는 alternation의 첫 패턴만 보고되므로, 패턴을 찾을 때마다
+        아직 찾지 못한 패턴들의 alternation으로 그 위치부터 한 번 더 스캔합니다.
+        스캔 횟수는 찾은 패턴 수 + 1로, 텍스트 길이나 매치 위치 수와 무관합니다.
+
+        Args:
+            text: 검색할 텍스트
+
+        Returns:
+            {패턴 이름: (매치 문자열, 시작 위치)} (매치된 패턴만 포함)
+        """
+        found: Dict[str, Tuple[str, int]] = {}
+        if self._regex is None:
+            return found
+
+        regex = self._regex
+        remaining = tuple(self.patterns)
+        position = 0
+        while True:
+            match = regex.search(text, position)
+            if match is None:
+                break
+
+            name = match.lastgroup
+            position = match.start()
+            found[name] = (match.group(name), position)
+
+            remaining = tuple(other for other in remaining if other != name)
+            if not remaining:
+                break
+            regex = self._subset_regex(remaining)
+
+        return found
@@ -0,0 +1,227 @@
+"""
+Message Catalog
+분석/최적화 결과의 이슈, 제안, 개선사항 메시지 카탈로그
+
+결과 객체는 메시지 문자열 대신 정수 코드와 매개변수를 가진 Message를 저장하고,
+문자열은 출력하거나 직렬화할 때만 만듭니다.
+같은 메시지는 공유 인스턴스 하나를 사용하므로 결과 객체가 작아지고,
+코퍼스 보고서는 문자열 비교 없이 코드로 이슈를 분류/집계할 수 있습니다.
+
+코드 값은 저장된 결과와 보고서에서 사용되므로 한 번 정한 값은 바꾸지 않습니다.
+
+사용 예:
+    issue = message(MessageCode.PROMPT_TOO_SHORT)
+    issue.code        # MessageCode.PROMPT_TOO_SHORT (101)
+    str(issue)        # '프롬프트가 너무 짧아 명확성 부족'
+    Counter(issue.code for issue in result.issues)
+"""
+
+from enum import IntEnum
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+class MessageCode(IntEnum):
+    """메시지 코드"""
+
+    # Claude 분석 이슈
+    PROMPT_TOO_SHORT = 101
+    NOT_A_REQUEST = 102
+    CONTEXT_INSUFFICIENT = 103
+    EXAMPLES_MISSING = 104
+    ROLE_UNDEFINED = 105
+    FORMAT_UNSPECIFIED = 106
+    CONSTRAINTS_UNSPECIFIED = 107
+
+    # Claude 분석 제안
+    SPECIFY_GOALS = 201
+    ASK_CLEARLY = 202
+    PROVIDE_BACKGROUND = 203
+    INCLUDE_EXAMPLES = 204
+    ASSIGN_ROLE = 205
+    SPECIFY_FORMAT = 206
+    SPECIFY_CONSTRAINTS = 207
+    ADD_METRICS = 208
+    ADD_USE_CASES = 209
+    DESCRIBE_USAGE = 210
+
+    # Claude 최적화 개선사항
+    GOAL_ADDED = 301
+    VAGUE_EXPRESSION_REMOVED = 302
+    REQUEST_FORM_ADDED = 303
+    ROLE_DEFINED = 304
+    CONTEXT_ADDED = 305
+    EXAMPLE_REQUEST_ADDED = 306
+    STRUCTURED_FORMAT = 307
+    KEY_POINTS_FORMAT = 308
+    CONCISE_FORMAT = 309
+    OUTPUT_FORMAT_ADDED = 310
+    CONSTRAINT_ADDED = 311
+
+    # GPT-5 분석 제안
+    DESCRIBE_TOOL_USAGE = 401
+    ADD_PERSISTENCE = 402
+    ADD_ESCAPE_HATCH = 403
+    OVER_THOROUGHNESS = 404
+    IMPROVE_XML_STRUCTURE = 405
+    USE_XML_STRUCTURE = 406
+    SEPARATE_SECTIONS = 407
+    REPLACE_AMBIGUOUS = 408
+    EXCESSIVE_CONTEXT = 409
+    USE_BALANCED_WORDING = 410
+    ASK_RESTATE_GOAL = 411
+    ASK_PLAN = 412
+    ASK_PROGRESS = 413
+
+    # GPT-5 분석 이슈 (설명, 해결방법)
+    LOW_AGENTIC_SCORE = 501
+    LOW_CLARITY_SCORE = 502
+    LOW_CONTEXT_EFFICIENCY = 503
+    ADD_AGENTIC_PATTERNS = 511
+    ADD_XML_OR_SECTIONS = 512
+    USE_BALANCED_CONTEXT = 513
+
+    # GPT-5 최적화 개선사항
+    CONTRADICTION_PRIORITIZED = 601
+    CONTRADICTION_CONDITIONAL = 602
+    CONTRADICTION_BALANCED = 603
+    XML_STRUCTURE_KEPT = 604
+    XML_STRUCTURE_CREATED = 605
+    TOOL_PREAMBLE_SUFFICIENT = 606
+    TOOL_PREAMBLE_ADDED = 607
+    AGENTIC_PATTERN_APPLIED = 608
+    VERBOSITY_LOW = 609
+    VERBOSITY_HIGH = 610
+    VERBOSITY_MEDIUM = 611
+    ANTI_PATTERN_FIXED = 612
+
+
+# 코드 → 메시지 형식 문자열 (str.format 위치 인자)
+MESSAGE_TEMPLATES: Dict[MessageCode, str] = {
+    MessageCode.PROMPT_TOO_SHORT: "프롬프트가 너무 짧아 명확성 부족",
+    MessageCode.NOT_A_REQUEST: "명확한 요청 형태가 아님",
+    MessageCode.CONTEXT_INSUFFICIENT: "충분한 배경 정보 부족",
+    MessageCode.EXAMPLES_MISSING: "구체적인 예시 부재",
+    MessageCode.ROLE_UNDEFINED: "AI 역할이 정의되지 않음",
+    MessageCode.FORMAT_UNSPECIFIED: "출력 형식이 지정되지 않음",
+    MessageCode.CONSTRAINTS_UNSPECIFIED: "피해야 할 사항이 명시되지 않음",
+
+    MessageCode.SPECIFY_GOALS: "더 구체적인 목표와 요구사항을 명시해주세요",
+    MessageCode.ASK_CLEARLY: "무엇을 원하는지 명확히 요청해주세요",
+    MessageCode.PROVIDE_BACKGROUND: "작업의 배경과 관련 정보를 더 제공해주세요",
+    MessageCode.INCLUDE_EXAMPLES: "기대하는 결과물의 예시를 포함해주세요",
+    MessageCode.ASSIGN_ROLE: "AI에게 특정 역할을 부여해주세요 (예: '전문가로서', '관리자 관점에서')",
+    MessageCode.SPECIFY_FORMAT: "원하는 결과물의 형식이나 구조를 명시해주세요",
+    MessageCode.SPECIFY_CONSTRAINTS: "원치 않는 결과나 피해야 할 사항을 명시해주세요",
+    MessageCode.ADD_METRICS: "더 구체적인 수치나 목표를 추가해보세요",
+    MessageCode.ADD_USE_CASES: "실제 사용 사례를 포함해보세요",
+    MessageCode.DESCRIBE_USAGE: "결과물의 활용 방법을 명시해보세요",
+
+    MessageCode.GOAL_ADDED: "구체적인 목표 추가",
+    MessageCode.VAGUE_EXPRESSION_REMOVED: "애매한 표현 '{0}' 제거",
+    MessageCode.REQUEST_FORM_ADDED: "명확한 요청 형식 추가",
+    MessageCode.ROLE_DEFINED: "역할 정의: {0}",
+    MessageCode.CONTEXT_ADDED: "실용적인 컨텍스트 추가",
+    MessageCode.EXAMPLE_REQUEST_ADDED: "구체적인 예시 요청 추가",
+    MessageCode.STRUCTURED_FORMAT: "구조화된 형식 지정",
+    MessageCode.KEY_POINTS_FORMAT: "핵심 포인트별 정리",
+    MessageCode.CONCISE_FORMAT: "간결한 형식 지정",
+    MessageCode.OUTPUT_FORMAT_ADDED: "출력 형식 지정",
+    MessageCode.CONSTRAINT_ADDED: "제약 조건 추가",
+
+    MessageCode.DESCRIBE_TOOL_USAGE: "도구 사용 방법을 명시하면 Agentic 구조가 개선됩니다",
+    MessageCode.ADD_PERSISTENCE: "작업 지속성 지시를 추가하면 자율성이 향상됩니다",
+    MessageCode.ADD_ESCAPE_HATCH: "불확실성 처리 방법(escape hatch)을 추가하세요",
+    MessageCode.OVER_THOROUGHNESS: "과도한 철저함 강조는 불필요한 도구 과다 사용을 유발합니다",
+    MessageCode.IMPROVE_XML_STRUCTURE: "더 체계적인 XML 구조를 사용하세요",
+    MessageCode.USE_XML_STRUCTURE: "XML 구조를 사용하면 명확성이 크게 향상됩니다",
+    MessageCode.SEPARATE_SECTIONS: "번호나 제목으로 섹션을 구분하세요",
+    MessageCode.REPLACE_AMBIGUOUS: "애매한 표현({0}개)을 구체적으로 바꾸세요",
+    MessageCode.EXCESSIVE_CONTEXT: "과도한 컨텍스트 수집 지시는 토큰을 낭비합니다",
+    MessageCode.USE_BALANCED_WORDING: "'sufficient' 또는 'relevant' 같은 균형잡힌 표현을 사용하세요",
+    MessageCode.ASK_RESTATE_GOAL: "사용자 목표를 재구성하도록 요청하세요",
+    MessageCode.ASK_PLAN: "구조화된 계획을 작성하도록 요청하세요",
+    MessageCode.ASK_PROGRESS: "진행 상황 업데이트를 요청하세요",
+
+    MessageCode.LOW_AGENTIC_SCORE: "Agentic 구조 점수가 낮습니다 ({0:.1f}/10)",
+    MessageCode.LOW_CLARITY_SCORE: "명확성 점수가 낮습니다 ({0:.1f}/10)",
+    MessageCode.LOW_CONTEXT_EFFICIENCY: "컨텍스트 효율성이 낮습니다 ({0:.1f}/10)",
+    MessageCode.ADD_AGENTIC_PATTERNS: "Agentic 패턴을 추가하세요",
+    MessageCode.ADD_XML_OR_SECTIONS: "XML 구조나 명확한 섹션 구분을 추가하세요",
+    MessageCode.USE_BALANCED_CONTEXT: "균형잡힌 컨텍스트 수집 지시를 사용하세요",
+
+    MessageCode.CONTRADICTION_PRIORITIZED: "모순 제거: {0} → 우선순위 명시",
+    MessageCode.CONTRADICTION_CONDITIONAL: "모순 제거: {0} → 조건부 확인 로직",
+    MessageCode.CONTRADICTION_BALANCED: "모순 제거: {0} → 균형잡힌 접근",
+    MessageCode.XML_STRUCTURE_KEPT: "기존 XML 구조 유지 및 개선",
+    MessageCode.XML_STRUCTURE_CREATED: "XML 구조 생성",
+    MessageCode.TOOL_PREAMBLE_SUFFICIENT: "기존 도구 프리앰블 충분",
+    MessageCode.TOOL_PREAMBLE_ADDED: "도구 프리앰블 추가 (목표 재구성, 계획, 진행 상황 업데이트)",
+    MessageCode.AGENTIC_PATTERN_APPLIED: "Agentic 패턴 적용: {0} ({1})",
+    MessageCode.VERBOSITY_LOW: "Verbosity 최적화: 간결한 응답",
+    MessageCode.VERBOSITY_HIGH: "Verbosity 최적화: 상세한 응답",
+    MessageCode.VERBOSITY_MEDIUM: "Verbosity 최적화: 균형잡힌 응답",
+    MessageCode.ANTI_PATTERN_FIXED: "Anti-pattern 수정: {0}",
+}
+
+
+class Message:
+    """메시지 코드와 매개변수 (문자열은 str()로 변환할 때 생성)"""
+
+    __slots__ = ("code", "params")
+
+    def __init__(self, code: MessageCode, params: Tuple[Any, ...] = ()):
+        object.__setattr__(self, "code", code)
+        object.__setattr__(self, "params", params)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @property
+    def text(self) -> str:
+        """메시지 문자열"""
+        template = MESSAGE_TEMPLATES[self.code]
+        return template.format(*self.params) if self.params else template
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        if self.params:
+            return f"Message(MessageCode.{self.code.name}, {self.params!r})"
+        return f"Message(MessageCode.{self.code.name})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Message):
+            return NotImplemented
+        return self.code == other.code and self.params == other.params
+
+    def __hash__(self) -> int:
+        return hash((self.code, self.params))
+
+    def __reduce__(self):
+        return Message, (self.code, self.params)
+
+
+# 매개변수가 없는 메시지는 코드마다 인스턴스 하나를 공유
+_SHARED_MESSAGES: Dict[MessageCode, Message] = {code: Message(code) for code in MessageCode}
+
+
+def message(code: MessageCode, *params: Any) -> Message:
+    """
+    메시지 생성
+
+    Args:
+        code: 메시지 코드
+        *params: 메시지 형식 문자열에 들어갈 값
+
+    Returns:
+        메시지 (매개변수가 없으면 공유 인스턴스)
+    """
+    if params:
+        return Message(code, params)
+    return _SHARED_MESSAGES[code]
+
+
+def render_messages(messages: Iterable[Any]) -> List[str]:
+    """메시지 목록을 문자열 목록으로 변환 (이미 문자열인 항목은 그대로)"""
+    return [str(item) for item in messages]
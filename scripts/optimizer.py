@@ -6,26 +6,56 @@ Claude 4 가이드 기반 프롬프트 최적화 엔진
 import re
 import json
 from typing import Dict, List, Tuple, Any, Optional
-from dataclasses import dataclass
 from .analyzer import AnalysisResult, Domain, OptimizationLevel
+from .messages import Message, MessageCode, message, render_messages
+from .records import dump_json, frozen_dataclass
+from .tokens import Tokenizer, get_tokenizer
 
 
-@dataclass
+@frozen_dataclass
 class OptimizationResult:
     """최적화 결과"""
     original_prompt: str
     optimized_prompt: str
-    improvement_areas: List[str]
+    improvement_areas: List[Message]
     token_reduction: int
     token_reduction_percent: float
     optimization_score: float
     applied_techniques: List[str]
 
+    def to_dict(self) -> Dict[str, Any]:
+        """딕셔너리로 변환"""
+        return {
+            'original_prompt': self.original_prompt,
+            'optimized_prompt': self.optimized_prompt,
+            'improvement_areas': render_messages(self.improvement_areas),
+            'token_reduction': self.token_reduction,
+            'token_reduction_percent': self.token_reduction_percent,
+            'optimization_score': self.optimization_score,
+            'applied_techniques': list(self.applied_techniques)
+        }
+
+    def to_json(self) -> str:
+        """JSON 문자열로 변환"""
+        return dump_json(self.to_dict())
+
 
 class PromptOptimizer:
     """Claude 4 프롬프트 최적화 엔진"""
 
-    def __init__(self):
+    # 최적화 점수에 반영하는 개선사항 (프롬프트에 내용을 추가한 경우)
+    ADDITIVE_IMPROVEMENTS = frozenset({
+        MessageCode.GOAL_ADDED,
+        MessageCode.REQUEST_FORM_ADDED,
+        MessageCode.CONTEXT_ADDED,
+        MessageCode.EXAMPLE_REQUEST_ADDED,
+        MessageCode.CONSTRAINT_ADDED
+    })
+
+    def __init__(self, tokenizer: Optional[Tokenizer] = None):
+        # 토큰 카운터 (None이면 전역 토큰 카운터 사용)
+        self.tokenizer = tokenizer
+
         # 역할 템플릿
         self.role_templates = {
             "development": {
@@ -101,7 +131,26 @@ class PromptOptimizer:
             (r'실제\s*사례를\s*통해', '예시와 함께'),
         ]
 
-    def optimize_clarity(self, prompt: str, analysis: AnalysisResult) -> Tuple[str, List[str]]:
+        # 중복 표현 패턴
+        self.duplicated_patterns = [
+            (r'자세히\s*설명해줘서\s*감사합니다', '설명해주세요'),
+            (r'알려주셔서\s*감사합니다', '알려주세요'),
+            (r'부탁드립니다\.?\s*감사합니다', '부탁드립니다'),
+            (r'친절한\s*설명에\s*감사드립니다', '설명해주세요'),
+        ]
+
+        self._compile_token_patterns()
+
+    def _compile_token_patterns(self):
+        """토큰 최적화 패턴과 중복 표현 패턴을 규칙별 정규식과 하나의 검사용 정규식으로 컴파일"""
+        rules = self.token_optimization_patterns + self.duplicated_patterns
+
+        # 치환 문자열은 그룹 참조 없이 그대로 사용
+        self.token_rules = [(re.compile(pattern), replacement) for pattern, replacement in rules]
+        # 치환할 곳이 있는지 한 번의 스캔으로 확인
+        self.token_pattern = re.compile("|".join(f"(?:{pattern})" for pattern, _ in rules))
+
+    def optimize_clarity(self, prompt: str, analysis: AnalysisResult) -> Tuple[str, List[Message]]:
         """명확성 최적화"""
         optimized = prompt
         improvements = []
@@ -110,24 +159,24 @@ class PromptOptimizer:
         if analysis.scores.get("clarity", 0) < 4:
             if len(prompt.split()) < 5:
                 optimized = f"구체적인 목표를 가지고 {optimized}"
-                improvements.append("구체적인 목표 추가")
+                improvements.append(message(MessageCode.GOAL_ADDED))
 
             # 애매한 표현 제거
             vague_expressions = ["좀", "좀 더", "조금", "약간", "대충", "大概り"]
             for expr in vague_expressions:
                 if expr in optimized:
                     optimized = optimized.replace(expr, "")
-                    improvements.append(f"애매한 표현 '{expr}' 제거")
+                    improvements.append(message(MessageCode.VAGUE_EXPRESSION_REMOVED, expr))
 
         # 명확한 요청 형태로 변환
         if not any(ending in optimized for ending in ["주세요", "해주세요", "해줘", "부탁드립니다"]):
             if "?" not in optimized:
                 optimized += "를 제공해주세요"
-                improvements.append("명확한 요청 형식 추가")
+                improvements.append(message(MessageCode.REQUEST_FORM_ADDED))
 
         return optimized, improvements
 
-    def optimize_role(self, prompt: str, domain: Domain, analysis: AnalysisResult) -> Tuple[str, List[str]]:
+    def optimize_role(self, prompt: str, domain: Domain, analysis: AnalysisResult) -> Tuple[str, List[Message]]:
         """역할 정의 최적화"""
         optimized = prompt
         improvements = []
@@ -148,11 +197,11 @@ class PromptOptimizer:
                 role = domain_roles.get("expert", "전문가로서")
 
             optimized = f"{role} {optimized}"
-            improvements.append(f"역할 정의: {role}")
+            improvements.append(message(MessageCode.ROLE_DEFINED, role))
 
         return optimized, improvements
 
-    def optimize_context(self, prompt: str, domain: Domain, analysis: AnalysisResult) -> Tuple[str, List[str]]:
+    def optimize_context(self, prompt: str, domain: Domain, analysis: AnalysisResult) -> Tuple[str, List[Message]]:
         """컨텍스트 최적화"""
         optimized = prompt
         improvements = []
@@ -169,11 +218,11 @@ class PromptOptimizer:
             context = context_templates.get(domain, "")
             if context and context not in optimized:
                 optimized = f"{context} {optimized}"
-                improvements.append("실용적인 컨텍스트 추가")
+                improvements.append(message(MessageCode.CONTEXT_ADDED))
 
         return optimized, improvements
 
-    def optimize_examples(self, prompt: str, analysis: AnalysisResult) -> Tuple[str, List[str]]:
+    def optimize_examples(self, prompt: str, analysis: AnalysisResult) -> Tuple[str, List[Message]]:
         """예시 최적화"""
         optimized = prompt
         improvements = []
@@ -182,11 +231,11 @@ class PromptOptimizer:
         if analysis.scores.get("examples", 0) < 4:
             if "예시" not in optimized and "예" not in optimized:
                 optimized += " 구체적인 예시를 포함해주세요"
-                improvements.append("구체적인 예시 요청 추가")
+                improvements.append(message(MessageCode.EXAMPLE_REQUEST_ADDED))
 
         return optimized, improvements
 
-    def optimize_format(self, prompt: str, analysis: AnalysisResult) -> Tuple[str, List[str]]:
+    def optimize_format(self, prompt: str, analysis: AnalysisResult) -> Tuple[str, List[Message]]:
         """형식 최적화"""
         optimized = prompt
         improvements = []
@@ -196,21 +245,21 @@ class PromptOptimizer:
             # 복잡도에 따른 형식 추천
             if analysis.complexity_level == "high":
                 format_guide = "구조화된 형식으로 각 항목을 명확히 구분해서"
-                improvements.append("구조화된 형식 지정")
+                improvements.append(message(MessageCode.STRUCTURED_FORMAT))
             elif analysis.complexity_level == "medium":
                 format_guide = "핵심 포인트별로 정리해서"
-                improvements.append("핵심 포인트별 정리")
+                improvements.append(message(MessageCode.KEY_POINTS_FORMAT))
             else:
                 format_guide = "명확하고 간결하게"
-                improvements.append("간결한 형식 지정")
+                improvements.append(message(MessageCode.CONCISE_FORMAT))
 
             if "형식" not in optimized and "구조" not in optimized:
                 optimized += f" {format_guide}"
-                improvements.append("출력 형식 지정")
+                improvements.append(message(MessageCode.OUTPUT_FORMAT_ADDED))
 
         return optimized, improvements
 
-    def optimize_constraints(self, prompt: str, analysis: AnalysisResult) -> Tuple[str, List[str]]:
+    def optimize_constraints(self, prompt: str, analysis: AnalysisResult) -> Tuple[str, List[Message]]:
         """제약 조건 최적화"""
         optimized = prompt
         improvements = []
@@ -241,49 +290,39 @@ class PromptOptimizer:
             for constraint in constraints:
                 if constraint and constraint not in optimized:
                     optimized += f", {constraint}"
-                    improvements.append("제약 조건 추가")
+                    improvements.append(message(MessageCode.CONSTRAINT_ADDED))
 
         return optimized, improvements
 
     def optimize_tokens(self, prompt: str) -> Tuple[str, int]:
         """토큰 효율성 최적화"""
+        # 대부분의 프롬프트는 치환 대상이 없으므로 한 번의 스캔으로 종료
+        if self.token_pattern.search(prompt) is None:
+            return prompt, 0
+
+        replacements = []
+
+        def replace(match) -> str:
+            replacements.append((match.group(), replacement))
+            return replacement
+
+        # 규칙 순서대로 치환 (앞 규칙의 치환 결과에 뒤 규칙이 다시 적용될 수 있음)
         optimized = prompt
-        original_tokens = self.estimate_tokens(prompt)
-        total_reduction = 0
-
-        # 토큰 최적화 패턴 적용
-        for pattern, replacement in self.token_optimization_patterns:
-            if re.search(pattern, optimized):
-                before_tokens = self.estimate_tokens(optimized)
-                optimized = re.sub(pattern, replacement, optimized)
-                after_tokens = self.estimate_tokens(optimized)
-                reduction = before_tokens - after_tokens
-                total_reduction += reduction
-
-        # 중복 표현 제거
-        duplicated_patterns = [
-            (r'자세히\s*설명해줘서\s*감사합니다', '설명해주세요'),
-            (r'알려주셔서\s*감사합니다', '알려주세요'),
-            (r'부탁드립니다\.?\s*감사합니다', '부탁드립니다'),
-            (r'친절한\s*설명에\s*감사드립니다', '설명해주세요'),
-        ]
+        for pattern, replacement in self.token_rules:
+            optimized = pattern.sub(replace, optimized)
 
-        for pattern, replacement in duplicated_patterns:
-            if re.search(pattern, optimized):
-                before_tokens = self.estimate_tokens(optimized)
-                optimized = re.sub(pattern, replacement, optimized)
-                after_tokens = self.estimate_tokens(optimized)
-                total_reduction += (before_tokens - after_tokens)
+        # 치환 구간 기준 토큰 절감량 계산 (휴리스틱 추정기는 전체 재스캔 없음)
+        total_reduction = self._get_tokenizer().rewrite_reduction(prompt, optimized, replacements)
 
         return optimized, total_reduction
 
+    def _get_tokenizer(self) -> Tokenizer:
+        """사용할 토큰 카운터 반환"""
+        return self.tokenizer if self.tokenizer is not None else get_tokenizer()
+
     def estimate_tokens(self, text: str) -> int:
-        """간단한 토큰 수 추정"""
-        korean_chars = len(re.findall(r'[가-힣]', text))
-        english_words = len(re.findall(r'\b[a-zA-Z]+\b', text))
-        korean_tokens = korean_chars / 1.5
-        english_tokens = english_words * 1.3
-        return int(korean_tokens + english_tokens)
+        """토큰 수 추정"""
+        return self._get_tokenizer().count(text)
 
     def optimize(self, analysis: AnalysisResult) -> OptimizationResult:
         """전체 최적화 수행"""
@@ -346,7 +385,7 @@ class PromptOptimizer:
         reduction_percent = (actual_reduction / original_tokens * 100) if original_tokens > 0 else 0
 
         # 품질 향상 점수 (분석 개선 + 토큰 절감)
-        analysis_improvement = len([imp for imp in all_improvements if "추가" in imp or "향상" in imp])
+        analysis_improvement = len([imp for imp in all_improvements if imp.code in self.ADDITIVE_IMPROVEMENTS])
         token_efficiency = min(5, max(1, int(reduction_percent / 10)))
         optimization_score = min(5, (analysis_improvement + token_efficiency) / 2)
 
@@ -0,0 +1,121 @@
+"""
+Parallel Processing
+입력 순서를 유지하는 프로세스 풀 묶음 처리
+
+입력을 chunksize개씩 묶어 워커 프로세스에 전달하고, 처리 중인 묶음 수를 제한해
+입력 크기와 관계없이 메모리 사용량을 일정하게 유지합니다.
+결과는 입력 순서대로 (묶음, 결과 목록) 단위로 반환됩니다.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+def iter_chunks(items: Iterable[Any], chunksize: int) -> Iterator[List[Any]]:
+    """
+    입력을 chunksize개씩 묶어 반환 (입력은 필요한 만큼만 읽음)
+
+    Args:
+        items: 입력 목록 (이터레이터 가능)
+        chunksize: 묶음 크기
+
+    Returns:
+        묶음 이터레이터
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize는 1 이상이어야 합니다")
+
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map_chunks(function: Callable[[List[Any]], List[Any]], items: Iterable[Any],
+               workers: Optional[int] = None, chunksize: int = 32,
+               max_pending: Optional[int] = None,
+               initializer: Optional[Callable[..., None]] = None, initargs: Sequence[Any] = (),
+               context=None,
+               on_error: Optional[Callable[[List[Any], BaseException], List[Any]]] = None
+               ) -> Iterator[Tuple[List[Any], List[Any]]]:
+    """
+    입력 묶음을 프로세스 풀에서 처리하고 입력 순서대로 반환
+
+    Args:
+        function: 묶음 처리 함수 (모듈 최상위 함수여야 함, 묶음 → 결과 목록)
+        items: 입력 목록 (이터레이터 가능)
+        workers: 워커 프로세스 수 (None이면 CPU 수, 1 이하면 현재 프로세스에서 순차 처리)
+        chunksize: 워커에 한 번에 전달할 입력 수
+        max_pending: 동시에 처리 중인 최대 묶음 수 (None이면 워커 수의 2배)
+        initializer: 워커 초기화 함수 (순차 처리 시 현재 프로세스에서 한 번 호출)
+        initargs: 워커 초기화 함수 인자
+        context: 워커를 만들 multiprocessing 컨텍스트 (None이면 기본 컨텍스트)
+        on_error: 묶음 단위 오류(워커 종료, 직렬화 실패 등) 시 결과 목록을 만드는 함수
+                  (None이면 예외를 그대로 전파)
+
+    Returns:
+        (묶음, 결과 목록) 이터레이터
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    chunks = iter_chunks(items, chunksize)
+
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for chunk in chunks:
+            yield chunk, _collect(chunk, lambda: function(chunk), on_error)
+        return
+
+    if max_pending is None:
+        max_pending = workers * 2
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=initializer,
+        initargs=tuple(initargs)
+    )
+
+    # 제출 순서대로 (묶음, 결과 future)
+    pending = deque()
+
+    try:
+        for chunk in chunks:
+            try:
+                future = executor.submit(function, chunk)
+            except BrokenExecutor as e:
+                # 워커가 비정상 종료된 풀에는 더 제출할 수 없으므로 남은 묶음도 오류로 처리
+                future = Future()
+                future.set_exception(e)
+            pending.append((chunk, future))
+
+            if len(pending) >= max_pending:
+                chunk, future = pending.popleft()
+                yield chunk, _collect(chunk, future.result, on_error)
+
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, _collect(chunk, future.result, on_error)
+    finally:
+        # 소비자가 중간에 멈춘 경우 아직 시작하지 않은 묶음은 취소
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _collect(chunk: List[Any], compute: Callable[[], List[Any]],
+             on_error: Optional[Callable[[List[Any], BaseException], List[Any]]]) -> List[Any]:
+    """묶음 결과 계산 (묶음 단위 오류는 on_error로 변환)"""
+    try:
+        return compute()
+    except Exception as e:
+        if on_error is None:
+            raise
+        return on_error(chunk, e)
@@ -0,0 +1,301 @@
+"""
+Pattern Pack
+패턴 파일(references/patterns/*.json)을 미리 컴파일한 바이너리 팩
+
+빌드 단계에서 JSON 파싱, 문자열 인터닝, 오토마톤/정규식 컴파일을 미리 수행해
+하나의 파일로 저장합니다. 런타임은 팩 파일을 한 번 읽어 바로 사용하므로
+짧게 실행되는 워커 프로세스의 초기화 비용이 줄어듭니다.
+
+원본 JSON이 팩 빌드 이후 변경되면(mtime/크기/내용 해시 불일치) 자동으로 JSON을 직접 읽습니다.
+내용 해시는 프로세스마다 파일별로 한 번만 확인합니다.
+팩을 빌드한 파이썬 버전이나 팩에 pickle되는 모듈의 소스가 현재와 다르면 팩을 사용하지 않습니다.
+
+빌드:
+    python -m scripts.pattern_pack [패턴 디렉토리] [-o 출력 파일]
+
+주의: 팩은 pickle 기반이므로 직접 빌드한 신뢰할 수 있는 파일만 사용하세요.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import struct
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+# 팩 파일 형식
+PACK_MAGIC = b"CPOPACK\x00"
+PACK_FORMAT_VERSION = 3
+PACK_FILENAME = "patterns.pack"
+_HEADER = struct.Struct("<8sI16s32s")  # magic, 형식 버전, 파이썬 버전 태그, 코드 해시
+
+# 팩에 pickle되는 객체(매처, 정규식 집합, GPT-5 규칙)를 정의하는 모듈
+# 이 파일들이 바뀌면 이전에 빌드한 팩은 자동으로 무시됨
+_PICKLED_SOURCES = ("matcher.py", "gpt5_analyzer.py", "pattern_registry.py", "pattern_pack.py")
+
+# 기본 패턴 디렉토리
+DEFAULT_PATTERNS_DIR = Path(__file__).parent.parent / "references" / "patterns"
+
+# 로드된 팩 캐시: {팩 경로: ((mtime_ns, size), 팩)}
+_pack_cache: Dict[str, Tuple[Tuple[int, int], Optional["PatternPack"]]] = {}
+
+
+class PatternPack:
+    """미리 컴파일된 패턴 팩"""
+
+    def __init__(self, sources: Dict[str, Dict[str, Any]], data: Dict[str, Dict],
+                 compiled: Dict[str, Any]):
+        """
+        초기화
+
+        Args:
+            sources: {패턴 이름: {'mtime_ns', 'size', 'sha256'}} 원본 파일 정보
+            data: {패턴 이름: 파싱된 JSON 데이터}
+            compiled: {키: 미리 컴파일된 객체} (예: 'gpt5_rules:gpt5_patterns')
+        """
+        self.sources = sources
+        self.data = data
+        self.compiled = compiled
+        # 내용 해시를 확인한 원본 파일: {절대 경로: (mtime_ns, size)}
+        self._verified: Dict[str, Tuple[int, int]] = {}
+
+    def is_fresh(self, patterns_file) -> bool:
+        """
+        원본 패턴 파일이 팩 빌드 이후 변경되지 않았는지 확인
+
+        mtime/크기가 기록과 같으면 처음 한 번만 파일을 읽어 sha256까지 비교하고,
+        이후에는 같은 mtime/크기인 동안 stat만 확인합니다.
+        """
+        source = self.sources.get(Path(patterns_file).stem)
+        if source is None:
+            return False
+
+        path = os.path.abspath(patterns_file)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        if stat_key != (source['mtime_ns'], source['size']):
+            return False
+        if self._verified.get(path) == stat_key:
+            return True
+
+        try:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return False
+
+        if digest != source['sha256']:
+            return False
+        self._verified[path] = stat_key
+        return True
+
+
+def _python_tag() -> bytes:
+    """팩을 빌드/로드하는 파이썬 구현과 버전 (예: cpython-311)"""
+    return (sys.implementation.cache_tag or f"{sys.implementation.name}-{sys.version_info[0]}{sys.version_info[1]}").encode('ascii')
+
+
+@lru_cache(maxsize=1)
+def _code_digest() -> bytes:
+    """팩에 pickle되는 객체를 정의하는 소스 파일들의 sha256"""
+    digest = hashlib.sha256()
+    package_dir = Path(__file__).parent
+    for name in _PICKLED_SOURCES:
+        digest.update(name.encode('ascii') + b"\0")
+        digest.update((package_dir / name).read_bytes())
+    return digest.digest()
+
+
+def _copy(value):
+    """팩의 JSON 데이터 복사 (호출자마다 독립된 dict/list)"""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+def _intern(value):
+    """JSON 데이터의 문자열을 인터닝 (팩 안에서 같은 문자열을 한 번만 저장)"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [_intern(item) for item in value]
+    if isinstance(value, dict):
+        return {sys.intern(key): _intern(item) for key, item in value.items()}
+    return value
+
+
+def build_pattern_pack(patterns_dir: Optional[str] = None, output: Optional[str] = None) -> Path:
+    """
+    패턴 디렉토리의 JSON 파일을 컴파일해 팩 파일 생성
+
+    Args:
+        patterns_dir: 패턴 디렉토리 (None이면 기본 경로)
+        output: 출력 파일 경로 (None이면 패턴 디렉토리의 patterns.pack)
+
+    Returns:
+        생성된 팩 파일 경로
+    """
+    # 순환 import 방지를 위해 빌드 시점에 import
+    from .gpt5_analyzer import GPT5RuleSet
+
+    patterns_dir = Path(patterns_dir) if patterns_dir is not None else DEFAULT_PATTERNS_DIR
+    output = Path(output) if output is not None else patterns_dir / PACK_FILENAME
+
+    sources = {}
+    data = {}
+    compiled = {}
+
+    for pattern_file in sorted(patterns_dir.glob("*.json")):
+        raw = pattern_file.read_bytes()
+        stat = pattern_file.stat()
+        name = pattern_file.stem
+
+        sources[name] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': hashlib.sha256(raw).hexdigest()
+        }
+        data[name] = _intern(json.loads(raw.decode('utf-8')))
+
+        # GPT-5 패턴 파일은 분석 규칙(정규식, 오토마톤)까지 미리 컴파일
+        if 'contradiction_patterns' in data[name]:
+            compiled[f"gpt5_rules:{name}"] = GPT5RuleSet(data[name])
+
+    payload = pickle.dumps(
+        {'sources': sources, 'data': data, 'compiled': compiled},
+        protocol=pickle.HIGHEST_PROTOCOL
+    )
+
+    # 부분적으로 쓰인 팩이 읽히지 않도록 임시 파일에 쓴 뒤 교체
+    temp_output = output.with_name(output.name + ".tmp")
+    with open(temp_output, 'wb') as f:
+        f.write(_HEADER.pack(PACK_MAGIC, PACK_FORMAT_VERSION, _python_tag(), _code_digest()))
+        f.write(payload)
+    os.replace(temp_output, output)
+
+    return output
+
+
+def load_pattern_pack(path) -> Optional[PatternPack]:
+    """
+    팩 파일 로드 (한 번의 read)
+
+    Args:
+        path: 팩 파일 경로
+
+    Returns:
+        로드된 팩 (파일이 없거나 형식 버전, 파이썬 버전, 코드 해시가 다르면 None)
+    """
+    try:
+        with open(path, 'rb') as f:
+            blob = f.read()
+    except OSError:
+        return None
+
+    if len(blob) < _HEADER.size:
+        return None
+
+    magic, version = struct.unpack_from("<8sI", blob)
+    if magic != PACK_MAGIC or version != PACK_FORMAT_VERSION:
+        return None
+
+    # 다른 파이썬 버전이나 다른 코드로 빌드한 팩은 pickle된 객체 구조가 다를 수 있음
+    _, _, python_tag, code_digest = _HEADER.unpack_from(blob)
+    if python_tag.rstrip(b"\0") != _python_tag() or code_digest != _code_digest():
+        return None
+
+    try:
+        content = pickle.loads(memoryview(blob)[_HEADER.size:])
+    except Exception as e:
+        print(f"Warning: Failed to load pattern pack {path}: {e}", file=sys.stderr)
+        return None
+
+    return PatternPack(content['sources'], content['data'], content['compiled'])
+
+
+def find_pattern_pack(patterns_file) -> Optional[PatternPack]:
+    """
+    패턴 파일을 포함하는 최신 팩 탐색 (같은 디렉토리의 patterns.pack)
+
+    Args:
+        patterns_file: 원본 패턴 파일 경로
+
+    Returns:
+        패턴 파일이 변경되지 않은 경우 팩, 아니면 None
+    """
+    pack_path = os.path.join(os.path.dirname(os.path.abspath(patterns_file)), PACK_FILENAME)
+
+    try:
+        stat = os.stat(pack_path)
+    except OSError:
+        return None
+
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    cached = _pack_cache.get(pack_path)
+    if cached is not None and cached[0] == stat_key:
+        pack = cached[1]
+    else:
+        pack = load_pattern_pack(pack_path)
+        _pack_cache[pack_path] = (stat_key, pack)
+
+    if pack is None or not pack.is_fresh(patterns_file):
+        return None
+
+    return pack
+
+
+def load_pattern_file(patterns_file) -> Dict:
+    """
+    패턴 파일 로드 (최신 팩이 있으면 팩에서, 없으면 JSON 파싱)
+
+    Args:
+        patterns_file: 패턴 JSON 파일 경로
+
+    Returns:
+        패턴 데이터 (호출마다 새로 만든 dict이므로 수정해도 다른 호출자에게 영향 없음)
+    """
+    pack = find_pattern_pack(patterns_file)
+    if pack is not None:
+        return _copy(pack.data[Path(patterns_file).stem])
+
+    with open(patterns_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_compiled(patterns_file, key: str) -> Optional[Any]:
+    """
+    팩에 미리 컴파일된 객체 조회
+
+    Args:
+        patterns_file: 원본 패턴 파일 경로
+        key: 컴파일 객체 종류 (예: 'gpt5_rules')
+
+    Returns:
+        미리 컴파일된 객체 (최신 팩이 없으면 None)
+    """
+    pack = find_pattern_pack(patterns_file)
+    if pack is None:
+        return None
+    return pack.compiled.get(f"{key}:{Path(patterns_file).stem}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="패턴 팩 빌드")
+    parser.add_argument("patterns_dir", nargs="?", default=None, help="패턴 디렉토리 (기본: references/patterns)")
+    parser.add_argument("-o", "--output", default=None, help="출력 파일 (기본: <패턴 디렉토리>/patterns.pack)")
+    args = parser.parse_args()
+
+    pack_path = build_pattern_pack(args.patterns_dir, args.output)
+    print(f"패턴 팩 생성 완료: {pack_path}")
@@ -0,0 +1,328 @@
+"""
+Pattern Registry
+프로세스 전역 패턴 레지스트리
+
+패턴 파일을 (절대 경로, 내용 해시) 단위로 한 번만 읽고 컴파일해 모든 엔진이 공유합니다.
+파일 내용이 바뀌면 그 경로의 이전 해시로 등록된 데이터는 제거합니다.
+등록된 데이터는 읽기 전용이므로 여러 스레드에서 동시에 사용해도 안전합니다.
+
+- 조회 시에는 stat 한 번으로 파일 변경 여부만 확인
+- mtime/크기가 바뀐 경우에만 파일을 다시 읽어 해시를 계산
+- 내용이 같으면(해시 동일) 기존 컴파일 결과를 그대로 재사용
+
+PatternWatcher는 백그라운드 스레드에서 패턴 파일 변경을 감지해
+등록된 엔진이 규칙을 다시 컴파일하고 원자적으로 교체하도록 알립니다.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import weakref
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .pattern_pack import DEFAULT_PATTERNS_DIR, find_pattern_pack
+
+
+# 기본 GPT-5 패턴 파일
+DEFAULT_GPT5_PATTERNS_FILE = DEFAULT_PATTERNS_DIR / "gpt5_patterns.json"
+
+
+def freeze_patterns(value):
+    """JSON 데이터를 읽기 전용 구조로 변환 (dict → MappingProxyType, list → tuple)"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: freeze_patterns(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_patterns(item) for item in value)
+    return value
+
+
+class PatternRegistry:
+    """(경로, 내용 해시) 기준 패턴 레지스트리"""
+
+    def __init__(self):
+        """초기화"""
+        self._lock = threading.Lock()
+        # {절대 경로: ((mtime_ns, size), sha256)}
+        self._fingerprints: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        # {(절대 경로, sha256): 읽기 전용 패턴 데이터}
+        self._patterns: Dict[Tuple[str, str], object] = {}
+        # {(절대 경로, sha256): GPT-5 분석 규칙}
+        self._gpt5_rules: Dict[Tuple[str, str], object] = {}
+
+    def fingerprint(self, patterns_file) -> Tuple[str, str]:
+        """
+        패턴 파일의 레지스트리 키 계산
+
+        Args:
+            patterns_file: 패턴 파일 경로
+
+        Returns:
+            (절대 경로, sha256)
+        """
+        path = os.path.abspath(patterns_file)
+        stat = os.stat(path)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._fingerprints.get(path)
+        if cached is not None and cached[0] == stat_key:
+            return path, cached[1]
+
+        # 최신 팩은 기록된 해시를 이미 확인했으므로 다시 계산하지 않음
+        pack = find_pattern_pack(path)
+        if pack is not None:
+            digest = pack.sources[Path(path).stem]['sha256']
+        else:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+
+        if cached is not None and cached[1] != digest:
+            # 내용이 바뀐 파일의 이전 버전 컴파일 결과 제거 (hot reload마다 누적되지 않도록)
+            with self._lock:
+                self._patterns.pop((path, cached[1]), None)
+                self._gpt5_rules.pop((path, cached[1]), None)
+        self._fingerprints[path] = (stat_key, digest)
+        return path, digest
+
+    @staticmethod
+    def _read(path: str) -> Tuple[str, Dict, Optional[object]]:
+        """
+        패턴 파일을 한 번 읽어 내용 해시와 데이터를 함께 반환
+
+        해시와 데이터가 같은 바이트에서 나오므로, 조회 중에 파일이 바뀌어도
+        새 내용이 이전 해시로 등록되지 않습니다.
+
+        Returns:
+            (sha256, 패턴 데이터, 팩에 미리 컴파일된 GPT-5 규칙 또는 None)
+        """
+        stem = Path(path).stem
+        pack = find_pattern_pack(path)
+        if pack is not None:
+            # 최신 팩의 데이터와 해시는 같은 원본에서 만들어졌고 해시는 확인됨
+            return pack.sources[stem]['sha256'], pack.data[stem], pack.compiled.get(f"gpt5_rules:{stem}")
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        return hashlib.sha256(raw).hexdigest(), json.loads(raw.decode('utf-8')), None
+
+    def _is_current(self, key: Tuple[str, str]) -> bool:
+        """키가 파일의 최신 내용 해시인지 확인 (잠금 안에서 호출)"""
+        fingerprint = self._fingerprints.get(key[0])
+        return fingerprint is not None and fingerprint[1] == key[1]
+
+    def version(self, patterns_files: Iterable) -> str:
+        """
+        패턴 파일들의 내용 버전 계산
+
+        Args:
+            patterns_files: 패턴 파일 경로 목록 (존재하지 않는 파일도 허용)
+
+        Returns:
+            내용 해시 기반 12자리 버전 문자열
+        """
+        digests = []
+        for patterns_file in patterns_files:
+            try:
+                digests.append(self.fingerprint(patterns_file)[1])
+            except OSError:
+                digests.append("-")
+
+        if len(digests) == 1:
+            return digests[0][:12]
+        return hashlib.sha256("\n".join(digests).encode('ascii')).hexdigest()[:12]
+
+    def get_patterns(self, patterns_file):
+        """
+        읽기 전용 패턴 데이터 조회
+
+        Args:
+            patterns_file: 패턴 파일 경로
+
+        Returns:
+            읽기 전용 패턴 데이터 (dict → MappingProxyType, list → tuple)
+        """
+        key = self.fingerprint(patterns_file)
+        patterns = self._patterns.get(key)
+        if patterns is not None:
+            return patterns
+
+        with self._lock:
+            patterns = self._patterns.get(key)
+            if patterns is None:
+                digest, data, _ = self._read(key[0])
+                patterns = freeze_patterns(data)
+                # 해시 계산 이후 파일이 바뀌었으면 읽은 내용의 해시가 최신이 아니므로 등록하지 않음
+                if self._is_current((key[0], digest)):
+                    self._patterns[key] = patterns
+        return patterns
+
+    def get_gpt5_rules(self, patterns_file=None):
+        """
+        GPT-5 분석 규칙 조회 (같은 내용의 파일은 한 번만 컴파일)
+
+        Args:
+            patterns_file: GPT-5 패턴 파일 경로 (None이면 기본 경로 사용)
+
+        Returns:
+            읽기 전용 GPT5RuleSet
+        """
+        # 순환 import 방지를 위해 조회 시점에 import
+        from .gpt5_analyzer import GPT5RuleSet
+
+        if patterns_file is None:
+            patterns_file = DEFAULT_GPT5_PATTERNS_FILE
+
+        key = self.fingerprint(patterns_file)
+        rules = self._gpt5_rules.get(key)
+        if rules is not None:
+            return rules
+
+        with self._lock:
+            rules = self._gpt5_rules.get(key)
+            if rules is None:
+                digest, data, compiled = self._read(key[0])
+                rules = (compiled if compiled is not None else GPT5RuleSet(data)).freeze()
+                rules.version = digest[:12]
+                if self._is_current((key[0], digest)):
+                    self._gpt5_rules[key] = rules
+        return rules
+
+    def clear(self):
+        """등록된 패턴 모두 제거"""
+        with self._lock:
+            self._fingerprints.clear()
+            self._patterns.clear()
+            self._gpt5_rules.clear()
+
+
+class PatternWatcher:
+    """
+    패턴 파일 변경 감시자
+
+    interval초마다 감시 대상 파일의 버전(stat → 변경 시 내용 해시)을 확인하고,
+    버전이 바뀐 경우 등록된 콜백을 호출합니다. 콜백은 감시 스레드에서 실행되므로
+    규칙 재컴파일이 요청 처리 스레드를 막지 않습니다.
+    """
+
+    def __init__(self, interval: float = 1.0, registry: Optional[PatternRegistry] = None):
+        """
+        초기화
+
+        Args:
+            interval: 확인 주기 (초)
+            registry: 버전 계산에 사용할 레지스트리 (None이면 전역 레지스트리)
+        """
+        self.interval = interval
+        self.registry = registry if registry is not None else _registry
+        self._lock = threading.Lock()
+        # [(파일 목록, 콜백 참조, 마지막으로 확인한 버전)]
+        self._watches: List[list] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def watch(self, patterns_files: Iterable, callback: Callable[[], object]):
+        """
+        감시 대상 등록
+
+        Args:
+            patterns_files: 감시할 패턴 파일 목록
+            callback: 버전이 바뀌었을 때 호출할 함수 (바운드 메서드는 약한 참조로 보관)
+        """
+        patterns_files = tuple(os.path.abspath(f) for f in patterns_files)
+        if hasattr(callback, '__self__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+
+        with self._lock:
+            self._watches.append([patterns_files, ref, self.registry.version(patterns_files)])
+        self.start()
+
+    def unwatch(self, callback: Callable[[], object]):
+        """감시 대상 해제"""
+        with self._lock:
+            self._watches = [watch for watch in self._watches if watch[1]() not in (None, callback)]
+
+    def check(self) -> int:
+        """
+        감시 대상을 한 번 확인
+
+        Returns:
+            콜백을 호출한 감시 대상 수
+        """
+        with self._lock:
+            # 엔진이 해제된 감시 대상 정리
+            self._watches = [watch for watch in self._watches if watch[1]() is not None]
+            watches = list(self._watches)
+
+        reloaded = 0
+        for watch in watches:
+            patterns_files, ref, last_version = watch
+            version = self.registry.version(patterns_files)
+            if version == last_version:
+                continue
+
+            # 편집 중 깨진 파일로 매번 경고하지 않도록 실패해도 버전은 갱신
+            watch[2] = version
+            callback = ref()
+            if callback is None:
+                continue
+            try:
+                callback()
+                reloaded += 1
+            except Exception as e:
+                print(f"Warning: Failed to reload patterns {', '.join(patterns_files)}: {e}", file=sys.stderr)
+
+        return reloaded
+
+    def start(self):
+        """백그라운드 감시 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="pattern-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """백그라운드 감시 스레드 중지"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+
+# 전역 레지스트리
+_registry = PatternRegistry()
+
+# 전역 감시자 (hot reload를 처음 사용할 때 생성)
+_watcher: Optional[PatternWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def get_registry() -> PatternRegistry:
+    """전역 패턴 레지스트리 반환"""
+    return _registry
+
+
+def get_watcher() -> PatternWatcher:
+    """전역 패턴 감시자 반환"""
+    global _watcher
+    if _watcher is None:
+        with _watcher_lock:
+            if _watcher is None:
+                _watcher = PatternWatcher()
+    return _watcher
+
+
+def get_gpt5_rules(patterns_file: Optional[str] = None):
+    """전역 레지스트리에서 GPT-5 분석 규칙 조회"""
+    return _registry.get_gpt5_rules(patterns_file)
@@ -0,0 +1,59 @@
+"""
+Result Records
+대량으로 만들어지는 결과 객체용 불변 데이터클래스
+
+분석/최적화 결과는 배치 처리에서 수백만 개가 메모리에 유지되므로
+인스턴스별 __dict__ 없이 __slots__에 필드를 저장하는 불변 데이터클래스로 정의합니다.
+dataclass(frozen=True, slots=True)와 같지만 Python 3.8부터 동작하고,
+pickle 상태를 필드 값 튜플로 저장해 이전 버전의 결과(__dict__ 상태)도 읽을 수 있습니다.
+"""
+
+import json
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Tuple
+
+
+def _getstate(self) -> Tuple[Any, ...]:
+    return tuple(getattr(self, name) for name in self.__slots__)
+
+
+def _setstate(self, state):
+    # 이전 버전에서 저장한 결과(캐시 파일 등)는 __dict__ 딕셔너리 상태
+    if isinstance(state, dict):
+        for name in self.__slots__:
+            object.__setattr__(self, name, state.get(name))
+    else:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
+def frozen_dataclass(cls):
+    """
+    __slots__를 사용하는 불변 데이터클래스 데코레이터
+
+    Args:
+        cls: 필드 주석이 있는 클래스
+
+    Returns:
+        필드마다 슬롯을 가진 새 데이터클래스
+    """
+    cls = dataclass(frozen=True)(cls)
+    names = tuple(field.name for field in fields(cls))
+
+    # 필드 기본값은 __init__에 들어 있으므로 클래스 속성에서 제거하고 슬롯으로 대체
+    namespace = {
+        key: value for key, value in cls.__dict__.items()
+        if key not in names and key not in ("__dict__", "__weakref__")
+    }
+    namespace["__slots__"] = names
+    namespace.setdefault("__getstate__", _getstate)
+    namespace.setdefault("__setstate__", _setstate)
+
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+def dump_json(record: Dict[str, Any]) -> str:
+    """to_dict() 결과를 JSON 문자열로 변환"""
+    return json.dumps(record, ensure_ascii=False)
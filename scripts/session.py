@@ -0,0 +1,434 @@
+"""
+Analysis Session
+편집 중인 프롬프트의 증분 분석 세션
+
+에디터처럼 프롬프트가 조금씩 바뀌며 반복 분석되는 경우,
+이전 분석의 매치 상태를 유지하고 편집된 구간과 그 주변 문맥만 다시 스캔합니다.
+
+- 키워드 매치: KeywordIndex가 편집 구간 ± (최대 키워드 길이 - 1)자만 재스캔
+- 토큰 수, 복잡도 지표, XML 태그, 모순 패턴: 줄 단위로 계산해 두고 편집된 줄만 재계산
+- 근접 규칙(금지/필수 키워드 충돌)은 유지된 출현 목록으로 다시 평가
+
+세션의 분석 결과는 같은 프롬프트를 분석기로 처음부터 분석한 결과와 같습니다.
+소문자 변환으로 길이가 바뀌는 문자(예: 'İ')가 포함되면 위치 대응이 깨지므로
+해당 프롬프트는 전체 분석으로 처리합니다.
+
+사용 예:
+    session = GPT5AnalysisSession(prompt)
+    result = session.update(TextEdit(120, 125, "must"))
+    result = session.set_text(editor_buffer)
+"""
+
+import re
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .analyzer import AnalysisResult, Domain, OptimizationLevel, PromptAnalyzer
+from .gpt5_analyzer import GPT5AnalysisResult, GPT5PromptAnalyzer, PromptFeatures
+from .matcher import KeywordIndex
+from .tokens import ScriptCounts, TokenEstimator, count_scripts, get_tokenizer
+
+
+NEWLINE_PATTERN = re.compile(r'\n')
+
+# 다음 내용 줄(공백이 아닌 문자가 있는 줄)의 끝
+CONTENT_LINE_PATTERN = re.compile(r'\S[^\n]*')
+
+# 줄을 넘어 매치될 수 있는 정규식 요소 (모순 패턴에 포함되면 줄 단위 탐색을 사용하지 않음)
+MULTILINE_PATTERN_TOKENS = ('\\s', '\\S', '\\W', '\\D', '\\n', '\\A', '\\Z', '\\x', '\\u', '\\0',
+                            '[^', '^', '$', '(?s', '(?m', '(?<', '\n')
+
+
+@dataclass(frozen=True)
+class TextEdit:
+    """텍스트 편집 (text[start:end]를 text로 교체)"""
+    start: int
+    end: int
+    text: str = ""
+
+    def apply(self, text: str) -> str:
+        """편집을 적용한 텍스트 반환"""
+        return text[:self.start] + self.text + text[self.end:]
+
+
+def _common_prefix_length(a: str, b: str, limit: int) -> int:
+    """두 문자열의 공통 접두사 길이 (limit 이하, 슬라이스 비교 이진 탐색)"""
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    """두 문자열의 공통 접미사 길이 (limit 이하, 슬라이스 비교 이진 탐색)"""
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:] == b[len(b) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def diff_text(old: str, new: str) -> Optional[TextEdit]:
+    """
+    두 텍스트의 차이를 하나의 편집으로 계산 (공통 접두사/접미사 제외)
+
+    Args:
+        old: 이전 텍스트
+        new: 새 텍스트
+
+    Returns:
+        old를 new로 바꾸는 편집 (같으면 None)
+    """
+    if old == new:
+        return None
+
+    limit = min(len(old), len(new))
+    prefix = _common_prefix_length(old, new, limit)
+    suffix = _common_suffix_length(old, new, limit - prefix)
+    return TextEdit(prefix, len(old) - suffix, new[prefix:len(new) - suffix])
+
+
+def _is_line_local(pattern: str) -> bool:
+    """정규식이 한 줄 안에서만 매치되는지 (보수적으로) 확인"""
+    return not any(token in pattern for token in MULTILINE_PATTERN_TOKENS)
+
+
+class LineRegions:
+    """
+    줄 단위 영역별 계산 결과
+
+    텍스트를 '\\n' 기준 줄로 나누고 줄마다 compute(text, start, end) 값을 보관합니다.
+    편집이 일어나면 편집된 줄만 다시 계산하고 뒤쪽 줄은 시작 위치만 이동합니다.
+
+    lookahead=True이면 각 줄의 값이 뒤따르는 공백 줄을 넘어 다음 내용 줄까지 참조할 수 있는
+    것으로 보고, 편집된 줄 앞의 공백 줄들과 그 앞의 내용 줄 하나도 함께 다시 계산합니다.
+    """
+
+    def __init__(self, compute: Callable[[str, int, int], object], lookahead: bool = False):
+        """
+        초기화
+
+        Args:
+            compute: 줄의 값 계산 함수 (전체 텍스트, 줄 시작, 줄 끝('\\n' 포함))
+            lookahead: 줄의 값이 다음 내용 줄까지 참조하는지 여부
+        """
+        self.compute = compute
+        self.lookahead = lookahead
+        self.starts: List[int] = [0]
+        self.values: List[object] = []
+
+    def reset(self, text: str):
+        """모든 줄을 다시 계산"""
+        self.starts = [0] + [match.end() for match in NEWLINE_PATTERN.finditer(text)]
+        ends = self.starts[1:] + [len(text)]
+        self.values = [self.compute(text, start, end) for start, end in zip(self.starts, ends)]
+
+    def update(self, text: str, start: int, end: int, new_end: int) -> Tuple[List[object], List[object]]:
+        """
+        편집 반영
+
+        Args:
+            text: 편집 후 전체 텍스트
+            start: 편집 시작 위치
+            end: 편집 전 텍스트에서 교체된 구간의 끝
+            new_end: 편집 후 텍스트에서 새로 들어간 구간의 끝
+
+        Returns:
+            (제거된 줄의 값 목록, 새로 계산된 줄의 값 목록)
+        """
+        starts = self.starts
+        delta = new_end - end
+
+        # 편집 구간에 걸친 줄 (end가 줄 시작이면 앞 줄의 '\n'이 교체된 것이므로 그 줄도 포함)
+        first = bisect_right(starts, start) - 1
+        last = bisect_right(starts, end) - 1
+
+        if self.lookahead:
+            while first > 0 and text[starts[first - 1]:starts[first]].isspace():
+                first -= 1
+            if first > 0:
+                first -= 1
+
+        region_start = starts[first]
+        is_last_line = last + 1 == len(starts)
+        region_end = len(text) if is_last_line else starts[last + 1] + delta
+
+        new_starts = [region_start] + [
+            match.end() for match in NEWLINE_PATTERN.finditer(text, region_start, region_end)
+        ]
+        if not is_last_line:
+            # 영역의 마지막 '\n' 뒤는 이동된 다음 줄의 시작
+            new_starts.pop()
+
+        new_ends = new_starts[1:] + [region_end]
+        added = [self.compute(text, line_start, line_end)
+                 for line_start, line_end in zip(new_starts, new_ends)]
+        removed = self.values[first:last + 1]
+
+        self.starts = starts[:first] + new_starts + [line_start + delta for line_start in starts[last + 1:]]
+        self.values = self.values[:first] + added + self.values[last + 1:]
+        return removed, added
+
+
+class _IncrementalSession(ABC):
+    """증분 분석 세션 공통 동작 (편집 적용, 소문자 텍스트 유지)"""
+
+    def __init__(self, prompt: str):
+        self._text = ""
+        self._lower = ""
+        # 소문자 변환 후에도 위치가 그대로 대응하는지 여부
+        self._aligned = False
+        self._reset(prompt)
+
+    @property
+    def text(self) -> str:
+        """현재 프롬프트"""
+        return self._text
+
+    def update(self, edit: TextEdit):
+        """
+        편집을 적용하고 분석
+
+        Args:
+            edit: 현재 프롬프트에 적용할 편집
+
+        Returns:
+            편집 후 프롬프트의 분석 결과
+        """
+        start, end = edit.start, edit.end
+        if not 0 <= start <= end <= len(self._text):
+            raise ValueError(f"Invalid edit range: {start}-{end} (text length {len(self._text)})")
+
+        text = edit.apply(self._text)
+        new_end = start + len(edit.text)
+        lower = text.lower()
+
+        # 소문자 변환이 편집 구간 밖에 영향을 주면(예: 그리스어 어말 시그마) 전체 재계산
+        if (self._aligned and len(lower) == len(text)
+                and lower[:start] == self._lower[:start] and lower[new_end:] == self._lower[end:]):
+            self._text = text
+            self._lower = lower
+            self._apply(start, end, new_end)
+        else:
+            self._reset(text)
+
+        return self.analyze()
+
+    def set_text(self, text: str):
+        """
+        프롬프트를 교체하고 분석 (이전 텍스트와의 차이만 편집으로 적용)
+
+        Args:
+            text: 새 프롬프트 (예: 에디터 버퍼 전체)
+
+        Returns:
+            새 프롬프트의 분석 결과
+        """
+        edit = diff_text(self._text, text)
+        if edit is None:
+            return self.analyze()
+        return self.update(edit)
+
+    def _reset(self, text: str):
+        self._text = text
+        self._lower = text.lower()
+        self._aligned = len(self._lower) == len(text)
+        if self._aligned:
+            self._rebuild()
+
+    @abstractmethod
+    def _rebuild(self):
+        """현재 텍스트 전체로 매치 상태를 다시 계산"""
+
+    @abstractmethod
+    def _apply(self, start: int, end: int, new_end: int):
+        """편집 구간(이전 텍스트의 start:end → 새 텍스트의 start:new_end)만 매치 상태에 반영"""
+
+    @abstractmethod
+    def analyze(self):
+        """현재 프롬프트 분석"""
+
+
+class AnalysisSession(_IncrementalSession):
+    """Claude 프롬프트 분석기(PromptAnalyzer)의 증분 분석 세션"""
+
+    def __init__(self, prompt: str = "", analyzer: Optional[PromptAnalyzer] = None,
+                 domain: Domain = Domain.AUTO,
+                 optimization_level: OptimizationLevel = OptimizationLevel.BALANCED):
+        """
+        초기화
+
+        Args:
+            prompt: 초기 프롬프트
+            analyzer: 사용할 분석기 (None이면 새로 생성)
+            domain: 도메인 (AUTO면 자동 감지)
+            optimization_level: 최적화 레벨
+        """
+        self.analyzer = analyzer if analyzer is not None else PromptAnalyzer()
+        self.domain = domain
+        self.optimization_level = optimization_level
+        self._keywords = KeywordIndex(self.analyzer.keyword_matcher, "")
+        # 줄별 문자 종류 개수 (토큰 추정기를 사용할 때 토큰 수 계산에 사용)
+        self._lines = LineRegions(lambda text, start, end: count_scripts(text[start:end]))
+        self._script_counts = ScriptCounts()
+        super().__init__(prompt)
+
+    def _rebuild(self):
+        self._keywords.reset(self._lower)
+        self._lines.reset(self._text)
+        self._script_counts = sum(self._lines.values, ScriptCounts())
+
+    def _apply(self, start: int, end: int, new_end: int):
+        self._keywords.update(self._lower, start, end, new_end)
+        removed, added = self._lines.update(self._text, start, end, new_end)
+        self._script_counts = (self._script_counts
+                               - sum(removed, ScriptCounts()) + sum(added, ScriptCounts()))
+
+    def analyze(self) -> AnalysisResult:
+        """현재 프롬프트 분석"""
+        if not self._aligned:
+            return self.analyzer.analyze(self._text, self.domain, self.optimization_level)
+
+        # 줄별 문자 종류 개수는 추정기 토큰 수에만 사용 가능 (BPE 등은 전체 계산)
+        tokenizer = self.analyzer.tokenizer if self.analyzer.tokenizer is not None else get_tokenizer()
+        token_count = None
+        if isinstance(tokenizer, TokenEstimator):
+            token_count = tokenizer.tokens_from_counts(self._script_counts)
+
+        return self.analyzer.analyze(
+            self._text, self.domain, self.optimization_level,
+            hits=self._keywords.hits, token_count=token_count
+        )
+
+
+class GPT5AnalysisSession(_IncrementalSession):
+    """GPT-5 프롬프트 분석기(GPT5PromptAnalyzer)의 증분 분석 세션"""
+
+    # 복잡도 지표 카테고리 (줄별 개수 튜플의 순서)
+    COMPLEXITY_KINDS = ('step', 'tool', 'conditional', 'constraint')
+
+    def __init__(self, prompt: str = "", analyzer: Optional[GPT5PromptAnalyzer] = None):
+        """
+        초기화
+
+        Args:
+            prompt: 초기 프롬프트
+            analyzer: 사용할 분석기 (None이면 새로 생성)
+        """
+        self.analyzer = analyzer if analyzer is not None else GPT5PromptAnalyzer()
+        rules = self.analyzer.rules
+
+        self._features = KeywordIndex(self.analyzer.feature_matcher, "")
+        self._sections = KeywordIndex(self.analyzer.section_matcher, "")
+        self._detections = KeywordIndex(rules.detection_matcher, "")
+
+        # 모든 모순 패턴이 한 줄 안에서만 매치되면 줄 단위로 탐색
+        self._line_contradictions = all(
+            _is_line_local(compiled.pattern) for compiled in rules.contradiction_regex.patterns.values()
+        )
+
+        # 복잡도 패턴의 단계 표시('step\n3', '-\n')는 공백을 따라 다음 내용 줄까지 이어질 수 있음
+        self._lines = LineRegions(self._compute_line, lookahead=True)
+        self._complexity_counts = [0, 0, 0, 0]
+        super().__init__(prompt)
+
+    def _compute_line(self, text: str, start: int, end: int):
+        """줄별 (복잡도 지표 개수, 여는 태그, 닫는 태그, 모순 패턴 매치) 계산"""
+        analyzer = self.analyzer
+
+        # 줄에서 시작하는 매치는 다음 내용 줄의 끝을 넘지 않음
+        content = CONTENT_LINE_PATTERN.search(text, end)
+        horizon = content.end() if content is not None else len(text)
+
+        counts = {'step': 0, 'tool': 0, 'conditional': 0, 'constraint': 0}
+        for match in analyzer.COMPLEXITY_PATTERN.finditer(text, start, horizon):
+            if match.start() >= end:
+                break
+            counts[match.lastgroup] += 1
+
+        line = text[start:end]
+        found = None
+        if self._line_contradictions:
+            found = analyzer.rules.contradiction_regex.search_all(self._lower[start:end])
+
+        return (
+            tuple(counts[kind] for kind in self.COMPLEXITY_KINDS),
+            tuple(analyzer.XML_OPEN_TAG_PATTERN.findall(line)),
+            tuple(analyzer.XML_CLOSE_TAG_PATTERN.findall(line)),
+            found
+        )
+
+    def _rebuild(self):
+        self._features.reset(self._lower)
+        self._sections.reset(self._text)
+        self._detections.reset(self._lower)
+        self._lines.reset(self._text)
+        self._complexity_counts = [sum(value[0][i] for value in self._lines.values) for i in range(4)]
+
+    def _apply(self, start: int, end: int, new_end: int):
+        self._features.update(self._lower, start, end, new_end)
+        self._sections.update(self._text, start, end, new_end)
+        self._detections.update(self._lower, start, end, new_end)
+
+        removed, added = self._lines.update(self._text, start, end, new_end)
+        counts = self._complexity_counts
+        for value in removed:
+            for i, count in enumerate(value[0]):
+                counts[i] -= count
+        for value in added:
+            for i, count in enumerate(value[0]):
+                counts[i] += count
+
+    def _contradiction_matches(self) -> Dict[str, Tuple[str, int]]:
+        """줄별 모순 패턴 매치를 전체 텍스트 기준으로 병합 (패턴별 첫 매치)"""
+        regex = self.analyzer.rules.contradiction_regex
+        if not self._line_contradictions:
+            return regex.search_all(self._lower)
+
+        found: Dict[str, Tuple[str, int]] = {}
+        for line_start, value in zip(self._lines.starts, self._lines.values):
+            for name, (matched, position) in value[3].items():
+                if name not in found:
+                    found[name] = (matched, line_start + position)
+            if len(found) == len(regex.patterns):
+                break
+        return found
+
+    def features(self) -> PromptFeatures:
+        """현재 프롬프트의 특성 (전체 추출과 같은 값)"""
+        if not self._aligned:
+            return self.analyzer.extract_features(self._text)
+
+        text = self._text
+        values = self._lines.values
+        counts = self._complexity_counts
+
+        return PromptFeatures(
+            prompt=text,
+            prompt_lower=self._lower,
+            length=len(text),
+            has_angle_brackets='<' in text and '>' in text,
+            xml_tags=tuple(tag for value in values for tag in value[1]),
+            xml_closing_tags=tuple(tag for value in values for tag in value[2]),
+            keyword_hits=frozenset(self._features.counts),
+            section_hits=frozenset(self._sections.counts),
+            step_count=counts[0],
+            tool_count=counts[1],
+            conditional_count=counts[2],
+            constraint_count=counts[3],
+            contradiction_matches=self._contradiction_matches(),
+            detection_occurrences=self._detections.occurrences
+        )
+
+    def analyze(self) -> GPT5AnalysisResult:
+        """현재 프롬프트 분석"""
+        return self.analyzer.analyze(self._text, self.features())
@@ -0,0 +1,187 @@
+"""
+Execution Statistics
+스레드 간에 공유하는 엔진의 실행 통계와 최근 실행 기록
+
+여러 스레드가 같은 엔진으로 요청을 처리할 때 공유 목록이나 잠금 없이 통계를 기록합니다.
+스레드마다 자기 샤드(카운터 묶음)만 갱신하고, 조회할 때 모든 샤드를 합산합니다.
+잠금은 스레드가 처음 기록할 때(샤드 등록)와 조회할 때만 사용합니다.
+
+- 조회 결과는 다른 스레드가 기록하는 중이면 직전 값일 수 있지만 손실되는 기록은 없습니다.
+- 종료된 스레드의 샤드는 새 샤드를 등록할 때 하나로 합쳐지므로
+  요청마다 스레드를 만드는 서버에서도 샤드 수는 살아 있는 스레드 수로 유지됩니다.
+
+ExecutionHistory는 최근 실행만 고정 크기 링 버퍼에 작은 레코드로 보관하고,
+누적 통계는 기록할 때 갱신하므로 오래 실행되는 워커에서도 메모리 사용량이 일정하고
+통계 조회 비용이 기록 수와 무관합니다.
+"""
+
+import threading
+import weakref
+from collections import deque
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+
+# 기본 실행 기록 보관 개수
+DEFAULT_HISTORY_SIZE = 1000
+
+
+class _StatisticsShard:
+    """한 스레드의 실행 통계 (소유 스레드만 갱신)"""
+
+    __slots__ = ("_thread", "total", "successes", "total_time", "domains", "last_timestamp")
+
+    def __init__(self, thread: Optional[threading.Thread] = None):
+        self._thread = weakref.ref(thread) if thread is not None else None
+        self.total = 0
+        self.successes = 0
+        self.total_time = 0.0
+        self.domains: Dict[str, int] = {}
+        self.last_timestamp: Optional[float] = None
+
+    def is_alive(self) -> bool:
+        """소유 스레드가 아직 기록할 수 있는지 여부"""
+        thread = self._thread() if self._thread is not None else None
+        return thread is not None and thread.is_alive()
+
+    def merge(self, other: "_StatisticsShard"):
+        """다른 샤드의 통계를 합산"""
+        self.total += other.total
+        self.successes += other.successes
+        self.total_time += other.total_time
+        # 소유 스레드가 갱신 중일 수 있으므로 복사본을 순회
+        for domain, count in dict(other.domains).items():
+            self.domains[domain] = self.domains.get(domain, 0) + count
+        if other.last_timestamp is not None and (
+                self.last_timestamp is None or other.last_timestamp > self.last_timestamp):
+            self.last_timestamp = other.last_timestamp
+
+
+class ExecutionStatistics:
+    """스레드별 샤드로 잠금 없이 기록하는 실행 통계"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[_StatisticsShard] = []
+        # 종료된 스레드들의 합산 통계
+        self._retired = _StatisticsShard()
+
+    def _shard(self) -> _StatisticsShard:
+        """현재 스레드의 샤드 (처음 기록할 때 등록)"""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _StatisticsShard(threading.current_thread())
+            with self._lock:
+                shards = []
+                for existing in self._shards:
+                    if existing.is_alive():
+                        shards.append(existing)
+                    else:
+                        self._retired.merge(existing)
+                shards.append(shard)
+                self._shards = shards
+            self._local.shard = shard
+        return shard
+
+    def record(self, success: bool, execution_time: float, domain: str, timestamp: float):
+        """
+        실행 한 건 기록
+
+        Args:
+            success: 성공 여부
+            execution_time: 실행 시간 (초)
+            domain: 분석된 도메인 (분석 결과가 없으면 'unknown')
+            timestamp: 기록 시각
+        """
+        shard = self._shard()
+        shard.total += 1
+        if success:
+            shard.successes += 1
+        shard.total_time += execution_time
+        shard.domains[domain] = shard.domains.get(domain, 0) + 1
+        shard.last_timestamp = timestamp
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        모든 스레드의 통계 합산
+
+        Returns:
+            total_executions, successful_executions, total_time,
+            domain_distribution, last_execution 딕셔너리
+        """
+        total = _StatisticsShard()
+        with self._lock:
+            total.merge(self._retired)
+            for shard in self._shards:
+                total.merge(shard)
+
+        return {
+            "total_executions": total.total,
+            "successful_executions": total.successes,
+            "total_time": total.total_time,
+            "domain_distribution": total.domains,
+            "last_execution": total.last_timestamp
+        }
+
+
+class ExecutionRecord(NamedTuple):
+    """실행 기록 한 건 (프롬프트와 결과 본문은 보관하지 않음)"""
+    timestamp: float
+    success: bool
+    execution_time: float
+    domain: str               # 분석된 도메인 (분석 결과가 없으면 'unknown')
+    execution_mode: str
+    optimization_level: str
+    prompt_length: int        # 원본 프롬프트 길이 (문자 수)
+
+
+class ExecutionHistory:
+    """최근 실행 기록 링 버퍼와 전체 누적 통계"""
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY_SIZE):
+        """
+        초기화
+
+        Args:
+            capacity: 보관할 최근 기록 수 (0이면 기록은 보관하지 않고 통계만 집계)
+        """
+        if capacity < 0:
+            raise ValueError("capacity는 0 이상이어야 합니다")
+
+        self.capacity = capacity
+        # deque.append는 스레드 간에 안전하고, 가득 차면 가장 오래된 기록을 O(1)로 버림
+        self._records: "deque[ExecutionRecord]" = deque(maxlen=capacity)
+        self._statistics = ExecutionStatistics()
+
+    def append(self, record: ExecutionRecord):
+        """실행 기록 추가 (누적 통계도 함께 갱신)"""
+        self._records.append(record)
+        self._statistics.record(record.success, record.execution_time, record.domain, record.timestamp)
+
+    def records(self) -> List[ExecutionRecord]:
+        """보관 중인 기록 (오래된 순서)"""
+        while True:
+            try:
+                return list(self._records)
+            except RuntimeError:
+                # 복사하는 동안 다른 스레드가 기록을 추가한 경우 다시 복사
+                continue
+
+    def summary(self) -> Dict[str, Any]:
+        """버퍼에서 밀려난 기록을 포함한 전체 누적 통계 (ExecutionStatistics.summary 참조)"""
+        return self._statistics.summary()
+
+    def clear(self):
+        """기록과 누적 통계 초기화"""
+        self._records.clear()
+        # 샤드는 스레드별로 등록되므로 통계 객체를 통째로 교체
+        self._statistics = ExecutionStatistics()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[ExecutionRecord]:
+        return iter(self.records())
+
+    def __getitem__(self, index: int) -> ExecutionRecord:
+        return self._records[index]
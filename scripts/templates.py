@@ -5,10 +5,108 @@ Template Manager for Claude Prompt Optimizer
 
 import json
 import os
-from typing import Dict, List, Any, Optional
+import re
+import sys
+from functools import lru_cache
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from .pattern_pack import load_pattern_file
+
+
+# 템플릿 변수 자리표시자 ({변수명})
+PLACEHOLDER_PATTERN = re.compile(r'\{([^{}]+)\}')
+
+
+class TemplateProgram:
+    """
+    리터럴 조각과 변수 슬롯으로 컴파일된 템플릿
+
+    템플릿 문자열을 한 번만 분해해 두고, 채울 때는 슬롯 값 목록을 만든 뒤
+    str.format 한 번으로 결과를 조립합니다. 누락된 변수도 같은 슬롯 목록에서 계산합니다.
+    """
+
+    def __init__(self, source: str, variables: Tuple[str, ...] = ()):
+        """
+        초기화
+
+        Args:
+            source: 템플릿 문자열
+            variables: 템플릿이 선언한 변수 목록 (누락 변수 보고 순서)
+        """
+        self.source = source
+        literals = []
+        slots = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            literals.append(source[position:match.start()])
+            slots.append(match.group(1))
+            position = match.end()
+        literals.append(source[position:])
+
+        self.slots: Tuple[str, ...] = tuple(slots)
+        # 채우지 못한 슬롯은 자리표시자를 그대로 남김
+        self.placeholders: Tuple[str, ...] = tuple("{" + slot + "}" for slot in slots)
+        # 선언된 변수 중 템플릿에 실제로 등장하는 것만 누락 검사 대상
+        slot_names = set(slots)
+        self.required: Tuple[str, ...] = tuple(dict.fromkeys(v for v in variables if v in slot_names))
+
+        # 리터럴의 중괄호를 이스케이프하고 슬롯을 위치 인자로 바꾼 format 문자열
+        format_parts = [literals[0].replace("{", "{{").replace("}", "}}")]
+        for index, literal in enumerate(literals[1:]):
+            format_parts.append("{" + str(index) + "}")
+            format_parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        self._format = "".join(format_parts).format
+
+    def render(self, variables: Dict[str, str]) -> Tuple[str, List[str]]:
+        """
+        변수 값을 채운 결과와 누락된 변수 목록을 한 번에 계산
+
+        Args:
+            variables: {변수명: 값}
+
+        Returns:
+            (채워진 문자열, 누락된 변수 목록)
+        """
+        get = variables.get
+        filled = self._format(*[get(slot, placeholder)
+                                for slot, placeholder in zip(self.slots, self.placeholders)])
+        missing = [var for var in self.required if var not in variables]
+        return filled, missing
+
+    def render_many(self, variables_list: Iterable[Dict[str, str]],
+                    partial: bool = False) -> Iterator[Any]:
+        """
+        여러 변수 집합으로 같은 템플릿을 반복해서 채우기
+
+        Args:
+            variables_list: {변수명: 값} 목록
+            partial: True이면 (채워진 문자열, 누락된 변수 목록)을,
+                     False이면 완전히 채워진 문자열(누락 시 None)을 반환
+
+        Returns:
+            입력 순서대로의 결과 이터레이터
+        """
+        fmt = self._format
+        slot_pairs = tuple(zip(self.slots, self.placeholders))
+        required = self.required
+
+        for variables in variables_list:
+            get = variables.get
+            filled = fmt(*[get(slot, placeholder) for slot, placeholder in slot_pairs])
+            missing = [var for var in required if var not in variables]
+            if partial:
+                yield filled, missing
+            else:
+                yield None if missing else filled
+
+
+@lru_cache(maxsize=1024)
+def compile_template(source: str, variables: Tuple[str, ...] = ()) -> TemplateProgram:
+    """템플릿 문자열 컴파일 (같은 문자열/변수 목록은 한 번만 컴파일)"""
+    return TemplateProgram(source, variables)
+
 
 @dataclass
 class Template:
@@ -23,10 +121,31 @@ class Template:
     example_usage: str
     complexity: str  # low, medium, high
 
+    def __post_init__(self):
+        # 로드 시점에 미리 컴파일
+        self.compile()
+
+    def compile(self) -> TemplateProgram:
+        """
+        템플릿 컴파일 (같은 template/variables는 컴파일 캐시에서 반환)
+
+        Returns:
+            컴파일된 템플릿
+        """
+        return compile_template(self.template, tuple(self.variables))
+
+    @property
+    def program(self) -> TemplateProgram:
+        """컴파일된 템플릿 (template/variables가 바뀌면 다시 컴파일)"""
+        return self.compile()
+
 
 class TemplateManager:
     """템플릿 관리 시스템"""
 
+    # 도메인 패턴 파일 이름 (references/patterns/<domain>.json)
+    DOMAINS = ["development", "marketing", "content", "business"]
+
     def __init__(self, patterns_dir: str = None):
         if patterns_dir is None:
             # 기본 패턴 디렉토리 경로
@@ -41,16 +160,13 @@ class TemplateManager:
 
     def load_patterns(self):
         """도메인별 패턴 파일 로드"""
-        domains = ["development", "marketing", "content", "business"]
-
-        for domain in domains:
-            pattern_file = os.path.join(self.patterns_dir, f"{domain}.json")
+        for domain, pattern_file in zip(self.DOMAINS, self.pattern_files()):
             if os.path.exists(pattern_file):
                 try:
-                    with open(pattern_file, 'r', encoding='utf-8') as f:
-                        self.domain_patterns[domain] = json.load(f)
+                    # 최신 패턴 팩이 있으면 JSON 파싱 없이 로드
+                    self.domain_patterns[domain] = load_pattern_file(pattern_file)
                 except Exception as e:
-                    print(f"Warning: Failed to load {domain} patterns: {e}")
+                    print(f"Warning: Failed to load {domain} patterns: {e}", file=sys.stderr)
                     self.domain_patterns[domain] = {}
             else:
                 self.domain_patterns[domain] = {}
@@ -58,6 +174,10 @@ class TemplateManager:
         # 기본 템플릿 생성
         self.generate_default_templates()
 
+    def pattern_files(self) -> List[str]:
+        """도메인 패턴 파일 경로 목록"""
+        return [os.path.join(self.patterns_dir, f"{domain}.json") for domain in self.DOMAINS]
+
     def generate_default_templates(self):
         """기본 템플릿 생성"""
         default_templates = [
@@ -289,17 +409,7 @@ class TemplateManager:
 
     def fill_template(self, template: Template, variables: Dict[str, str]) -> str:
         """템플릿에 변수 값 채우기 (완전히 채워진 경우만)"""
-        filled = template.template
-
-        for var_name, var_value in variables.items():
-            placeholder = "{" + var_name + "}"
-            filled = filled.replace(placeholder, var_value)
-
-        # 채워지지 않은 변수 확인
-        remaining_vars = []
-        for var in template.variables:
-            if "{" + var + "}" in filled:
-                remaining_vars.append(var)
+        filled, remaining_vars = template.program.render(variables)
 
         # 변수가 남아있으면 None 반환 (불완전한 템플릿)
         if remaining_vars:
@@ -309,19 +419,22 @@ class TemplateManager:
 
     def fill_template_partial(self, template: Template, variables: Dict[str, str]) -> tuple:
         """템플릿에 변수 값 부분적으로 채우기 + 누락된 변수 반환"""
-        filled = template.template
-
-        for var_name, var_value in variables.items():
-            placeholder = "{" + var_name + "}"
-            filled = filled.replace(placeholder, var_value)
-
-        # 채워지지 않은 변수 목록
-        remaining_vars = []
-        for var in template.variables:
-            if "{" + var + "}" in filled:
-                remaining_vars.append(var)
-
-        return filled, remaining_vars
+        return template.program.render(variables)
+
+    def fill_template_bulk(self, template: Template, variables_list: Iterable[Dict[str, str]],
+                           partial: bool = False) -> Iterator[Any]:
+        """
+        하나의 템플릿을 여러 변수 집합으로 채우기
+
+        Args:
+            template: 채울 템플릿
+            variables_list: {변수명: 값} 목록 (제너레이터 가능)
+            partial: True이면 fill_template_partial, False이면 fill_template과 같은 형식으로 반환
+
+        Returns:
+            입력 순서대로의 결과 이터레이터
+        """
+        return template.program.render_many(variables_list, partial)
 
     def get_missing_variables(self, template: Template, variables: Dict[str, str]) -> List[str]:
         """누락된 변수 목록 반환"""
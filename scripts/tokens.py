@@ -0,0 +1,346 @@
+"""
+Token Counting
+분석기와 최적화기가 공유하는 토큰 카운터
+
+- Tokenizer: 토큰 카운터 인터페이스
+- TokenEstimator: 단일 패스 휴리스틱 추정기 (기본값)
+  한 번의 정규식 스캔으로 한글, 영어 단어, 숫자, CJK(한자/가나), 구두점을 모두 셉니다.
+- BPETokenizer: 로컬 vocab/merges 파일 기반 순수 파이썬 BPE (정확한 토큰 수)
+
+set_tokenizer()로 전역 백엔드를 교체할 수 있습니다.
+"""
+
+import base64
+import hashlib
+import re
+import struct
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# 문자 종류별 단일 스캔 패턴
+# 영어 단어는 기존 추정식과 같이 단어 경계(\b)로 구분된 경우만 셈
+SCRIPT_PATTERN = re.compile(
+    r'(?P<hangul>[가-힣]+)'
+    r'|(?P<latin>\b[a-zA-Z]+\b)'
+    r'|(?P<digit>\d+)'
+    r'|(?P<cjk>[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+)'
+    r'|(?P<punct>[^\w\s]+)'
+)
+
+
+@dataclass(frozen=True)
+class ScriptCounts:
+    """문자 종류별 개수"""
+    hangul: int = 0  # 한글 글자 수
+    latin: int = 0  # 영어 단어 수
+    digit: int = 0  # 숫자 묶음 수
+    cjk: int = 0  # 한자/가나 글자 수
+    punct: int = 0  # 구두점/기호 글자 수
+
+    def __add__(self, other: "ScriptCounts") -> "ScriptCounts":
+        return ScriptCounts(
+            hangul=self.hangul + other.hangul,
+            latin=self.latin + other.latin,
+            digit=self.digit + other.digit,
+            cjk=self.cjk + other.cjk,
+            punct=self.punct + other.punct
+        )
+
+    def __sub__(self, other: "ScriptCounts") -> "ScriptCounts":
+        return ScriptCounts(
+            hangul=self.hangul - other.hangul,
+            latin=self.latin - other.latin,
+            digit=self.digit - other.digit,
+            cjk=self.cjk - other.cjk,
+            punct=self.punct - other.punct
+        )
+
+
+@lru_cache(maxsize=4096)
+def count_scripts(text: str) -> ScriptCounts:
+    """
+    문자 종류별 개수를 한 번의 스캔으로 계산 (문자열 기준 메모이제이션)
+
+    Args:
+        text: 대상 텍스트
+
+    Returns:
+        문자 종류별 개수
+    """
+    counts = {'hangul': 0, 'latin': 0, 'digit': 0, 'cjk': 0, 'punct': 0}
+
+    for match in SCRIPT_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == 'latin' or kind == 'digit':
+            # 단어/숫자는 묶음 단위로 셈
+            counts[kind] += 1
+        else:
+            counts[kind] += match.end() - match.start()
+
+    return ScriptCounts(**counts)
+
+
+class Tokenizer(ABC):
+    """토큰 카운터 인터페이스"""
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """텍스트의 토큰 수 계산"""
+
+    @property
+    def cache_id(self) -> str:
+        """결과 캐시 키에 넣는 토큰 카운터 식별자 (설정이 다르면 다른 값)"""
+        return f"{type(self).__module__}.{type(self).__qualname__}"
+
+    def count_tokens(self, texts: Sequence[str]) -> List[int]:
+        """여러 텍스트의 토큰 수를 한 번에 계산"""
+        return [self.count(text) for text in texts]
+
+    def rewrite_reduction(self, original: str, rewritten: str,
+                          replacements: Sequence[Tuple[str, str]]) -> int:
+        """
+        치환으로 줄어든 토큰 수 계산
+
+        Args:
+            original: 치환 전 텍스트
+            rewritten: 치환 후 텍스트
+            replacements: (치환된 구간, 치환 문자열) 목록
+
+        Returns:
+            줄어든 토큰 수
+        """
+        return self.count(original) - self.count(rewritten)
+
+
+class TokenEstimator(Tokenizer):
+    """문자 종류 기반 토큰 수 추정기"""
+
+    def tokens_from_counts(self, counts: ScriptCounts) -> int:
+        """
+        문자 종류별 개수로부터 토큰 수 계산
+
+        한글: 1.5자당 1토큰, 영어: 1단어당 1.3토큰
+        숫자/CJK/구두점은 기존 추정치와의 호환을 위해 개수만 집계하고 합산하지 않음
+        """
+        korean_tokens = counts.hangul / 1.5
+        english_tokens = counts.latin * 1.3
+        return int(korean_tokens + english_tokens)
+
+    def estimate(self, text: str) -> int:
+        """텍스트의 토큰 수 추정"""
+        return self.tokens_from_counts(count_scripts(text))
+
+    def estimate_batch(self, texts: Iterable[str]) -> List[int]:
+        """여러 텍스트의 토큰 수를 한 번에 추정"""
+        return [self.tokens_from_counts(count_scripts(text)) for text in texts]
+
+    def count(self, text: str) -> int:
+        return self.estimate(text)
+
+    def count_tokens(self, texts: Sequence[str]) -> List[int]:
+        return self.estimate_batch(texts)
+
+    def rewrite_reduction(self, original: str, rewritten: str,
+                          replacements: Sequence[Tuple[str, str]]) -> int:
+        """
+        치환 전후 문자열을 한 번씩 스캔해 계산
+
+        치환 구간만 세면 구간 경계에서 영어 단어가 합쳐지거나 나뉘는 경우(예: 'abc제가 ...xyz')를
+        놓치므로 전체 문자열 추정치의 차이를 사용합니다.
+        """
+        if not replacements:
+            return 0
+        return self.estimate(original) - self.estimate(rewritten)
+
+
+def _bytes_to_unicode() -> Dict[int, str]:
+    """GPT-2 byte-level BPE의 바이트 → 출력 가능한 유니코드 문자 매핑"""
+    printable = (list(range(ord("!"), ord("~") + 1))
+                 + list(range(ord("¡"), ord("¬") + 1))
+                 + list(range(ord("®"), ord("ÿ") + 1)))
+    mapping = {byte: chr(byte) for byte in printable}
+    offset = 0
+    for byte in range(256):
+        if byte not in mapping:
+            mapping[byte] = chr(256 + offset)
+            offset += 1
+    return mapping
+
+
+class BPETokenizer(Tokenizer):
+    """
+    로컬 vocab/merges 파일 기반 byte-level BPE 토크나이저
+
+    지원 형식:
+    - tiktoken 형식: 한 줄에 "<base64 토큰> <rank>" (예: cl100k_base.tiktoken)
+    - GPT-2 merges.txt 형식: 한 줄에 병합 쌍 "a b" (우선순위 순)
+
+    파일은 생성 시 한 번만 읽어 {토큰 바이트: rank} 테이블로 보관하고,
+    사전 분할된 조각(piece)별 토큰 수는 LRU 캐시에 저장합니다.
+    """
+
+    # cl100k_base 사전 분할 패턴의 re 호환 근사
+    # (\p{L} → [^\W\d_], \p{N} → \d)
+    DEFAULT_PRETOKENIZE_PATTERN = (
+        r"(?i:'s|'t|'re|'ve|'m|'ll|'d)"
+        r"|(?:[^\r\n\w]|_)?[^\W\d_]+"
+        r"|\d{1,3}"
+        r"| ?(?:[^\s\w]|_)+[\r\n]*"
+        r"|\s*[\r\n]+"
+        r"|\s+(?!\S)"
+        r"|\s+"
+    )
+
+    def __init__(self, ranks: Dict[bytes, int], pattern: Optional[str] = None,
+                 cache_size: int = 65536):
+        """
+        초기화
+
+        Args:
+            ranks: {토큰 바이트: 병합 우선순위} 테이블
+            pattern: 사전 분할 정규식 (None이면 cl100k 근사 패턴)
+            cache_size: 조각별 토큰 수 LRU 캐시 크기
+        """
+        self.ranks = ranks
+        self.pretokenize_pattern = re.compile(pattern or self.DEFAULT_PRETOKENIZE_PATTERN)
+        self.cache_size = cache_size
+        self._count_piece = lru_cache(maxsize=cache_size)(self._bpe_count)
+
+    @property
+    def cache_id(self) -> str:
+        """rank 테이블과 사전 분할 패턴의 sha256 (처음 조회할 때 한 번 계산)"""
+        cache_id = self.__dict__.get('_cache_id')
+        if cache_id is None:
+            digest = hashlib.sha256(self.pretokenize_pattern.pattern.encode('utf-8'))
+            for token, rank in sorted(self.ranks.items(), key=lambda item: (item[1], item[0])):
+                digest.update(struct.pack('<qI', rank, len(token)))
+                digest.update(token)
+            cache_id = f"{super().cache_id}:{digest.hexdigest()}"
+            self._cache_id = cache_id
+        return cache_id
+
+    def __getstate__(self):
+        # LRU 캐시 래퍼는 pickle할 수 없으므로 제외 (프로세스 풀 워커로 전달할 때)
+        state = self.__dict__.copy()
+        del state['_count_piece']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._count_piece = lru_cache(maxsize=self.cache_size)(self._bpe_count)
+
+    @classmethod
+    def from_file(cls, path: str, pattern: Optional[str] = None,
+                  cache_size: int = 65536) -> "BPETokenizer":
+        """
+        vocab/merges 파일에서 토크나이저 생성 (형식 자동 감지)
+
+        Args:
+            path: tiktoken 형식 또는 GPT-2 merges.txt 형식 파일 경로
+            pattern: 사전 분할 정규식
+            cache_size: 조각별 토큰 수 LRU 캐시 크기
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = [line.rstrip('\n') for line in f if line.strip()]
+
+        # GPT-2 merges.txt의 첫 줄 버전 헤더만 제외 ('# #' 같은 줄은 실제 병합 규칙)
+        if lines and lines[0].startswith('#version'):
+            lines = lines[1:]
+
+        first = lines[0].split() if lines else []
+        if len(first) == 2 and first[1].isdigit():
+            ranks = cls._parse_tiktoken(lines)
+        else:
+            ranks = cls._parse_merges(lines)
+
+        return cls(ranks, pattern, cache_size)
+
+    @staticmethod
+    def _parse_tiktoken(lines: List[str]) -> Dict[bytes, int]:
+        """tiktoken 형식 파싱"""
+        ranks = {}
+        for line in lines:
+            token, rank = line.split()
+            ranks[base64.b64decode(token)] = int(rank)
+        return ranks
+
+    @staticmethod
+    def _parse_merges(lines: List[str]) -> Dict[bytes, int]:
+        """GPT-2 merges.txt 형식 파싱 (단일 바이트 0-255 다음으로 병합 순서대로 rank 부여)"""
+        byte_decoder = {char: byte for byte, char in _bytes_to_unicode().items()}
+        ranks = {bytes([byte]): byte for byte in range(256)}
+
+        for line in lines:
+            left, right = line.split(' ')
+            merged = bytes(byte_decoder[char] for char in left + right)
+            ranks.setdefault(merged, len(ranks))
+
+        return ranks
+
+    def _bpe_count(self, piece: bytes) -> int:
+        """조각 하나를 BPE 병합한 뒤의 토큰 수"""
+        ranks = self.ranks
+        if piece in ranks:
+            return 1
+
+        parts = [piece[i:i + 1] for i in range(len(piece))]
+        while len(parts) > 1:
+            # 가장 우선순위가 높은(rank가 낮은) 인접 쌍을 병합
+            best_rank = None
+            best_index = -1
+            for index in range(len(parts) - 1):
+                rank = ranks.get(parts[index] + parts[index + 1])
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank = rank
+                    best_index = index
+
+            if best_rank is None:
+                break
+
+            parts[best_index:best_index + 2] = [parts[best_index] + parts[best_index + 1]]
+
+        return len(parts)
+
+    def count(self, text: str) -> int:
+        count_piece = self._count_piece
+        return sum(count_piece(piece.encode('utf-8'))
+                   for piece in self.pretokenize_pattern.findall(text))
+
+
+# 전역 토큰 카운터 (기본: 휴리스틱 추정기)
+_default_estimator = TokenEstimator()
+_tokenizer: Tokenizer = _default_estimator
+
+
+def get_estimator() -> TokenEstimator:
+    """기본 휴리스틱 추정기 반환"""
+    return _default_estimator
+
+
+def get_tokenizer() -> Tokenizer:
+    """현재 전역 토큰 카운터 반환"""
+    return _tokenizer
+
+
+def set_tokenizer(tokenizer: Optional[Tokenizer]):
+    """
+    전역 토큰 카운터 교체
+
+    Args:
+        tokenizer: 사용할 토큰 카운터 (None이면 휴리스틱 추정기로 복원)
+    """
+    global _tokenizer
+    _tokenizer = tokenizer if tokenizer is not None else _default_estimator
+
+
+def estimate_tokens(text: str) -> int:
+    """전역 토큰 카운터로 토큰 수 계산"""
+    return _tokenizer.count(text)
+
+
+def estimate_tokens_batch(texts: Sequence[str]) -> List[int]:
+    """전역 토큰 카운터로 여러 텍스트의 토큰 수 계산"""
+    return _tokenizer.count_tokens(texts)
@@ -0,0 +1,97 @@
+"""asyncio 실행기 테스트"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scripts.aio import AsyncRunner
+from scripts.core import ClaudePromptOptimizer, OptimizationRequest
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=8)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_run_raises_builtin_timeout(executor):
+    runner = AsyncRunner(max_concurrency=2, executor=executor)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(runner.run(time.sleep, 0.5, timeout=0.05))
+
+
+def test_batch_timeout_becomes_failure_response(executor):
+    optimizer = ClaudePromptOptimizer(async_runner=AsyncRunner(max_concurrency=2, executor=executor))
+    process_request = optimizer.process_request
+
+    def slow(request):
+        if request.prompt == "slow":
+            time.sleep(0.5)
+        return process_request(request)
+
+    optimizer.process_request = slow
+    requests = [OptimizationRequest(prompt=prompt) for prompt in ("코드 리뷰 해줘", "slow")]
+    fast, timed_out = asyncio.run(collect(optimizer.aprocess_batch(requests, timeout=0.1)))
+
+    assert fast.success
+    assert not timed_out.success
+    assert timed_out.message == "처리 시간이 초과되었습니다"
+
+
+def test_cancelled_task_releases_its_slot(executor):
+    runner = AsyncRunner(max_concurrency=1, executor=executor)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(runner.run(release.wait))
+        await asyncio.sleep(0.05)
+        blocked.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await blocked
+
+        # 첫 작업의 스레드는 아직 실행 중이지만 동시 실행 한도는 반환됨
+        return await runner.run(lambda: "done", timeout=1.0)
+
+    try:
+        assert asyncio.run(scenario()) == "done"
+    finally:
+        release.set()
+
+
+def test_map_preserves_input_order(executor):
+    runner = AsyncRunner(max_concurrency=4, executor=executor)
+
+    def work(index):
+        # 앞의 입력일수록 늦게 끝남
+        time.sleep(0.01 * (8 - index))
+        return index
+
+    assert asyncio.run(collect(runner.map(work, range(8)))) == list(range(8))
+
+
+def test_map_respects_concurrency_cap(executor):
+    runner = AsyncRunner(max_concurrency=3, executor=executor)
+    lock = threading.Lock()
+    active = peak = 0
+
+    def work(index):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return index
+
+    assert asyncio.run(collect(runner.map(work, range(12)))) == list(range(12))
+    assert peak == 3
@@ -0,0 +1,62 @@
+"""BatchAnalyzer 테스트"""
+
+import random
+
+import pytest
+
+from scripts.analyzer import Domain, OptimizationLevel, PromptAnalyzer
+
+np = pytest.importorskip("numpy")
+
+from scripts.batch_analyzer import BatchAnalyzer  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return PromptAnalyzer()
+
+
+@pytest.fixture(scope="module")
+def prompts(analyzer):
+    """분석기 키워드와 일반 단어를 섞은 무작위 프롬프트"""
+    rng = random.Random(22)
+    vocabulary = list(analyzer.keyword_matcher.keywords) + [
+        "그리고", "the", "and", "해주세요", "?", ".", "\n", "1.", "-", "목록", "123"
+    ]
+    samples = ["", " ", "코드", "PYTHON API 개발", "마케팅 전략을 세워주세요"]
+    for _ in range(500):
+        samples.append(" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 30))))
+    return samples
+
+
+@pytest.mark.parametrize("optimization_level", list(OptimizationLevel))
+@pytest.mark.parametrize("domain", [Domain.AUTO, Domain.MARKETING])
+def test_batch_analyze_matches_prompt_analyzer(analyzer, prompts, domain, optimization_level):
+    batch = BatchAnalyzer(analyzer)
+
+    results = batch.analyze(prompts, domain, optimization_level)
+
+    assert results == [analyzer.analyze(prompt, domain, optimization_level) for prompt in prompts]
+
+
+def test_batch_scores_match_prompt_analyzer(analyzer, prompts):
+    scores = BatchAnalyzer(analyzer).score(prompts)
+
+    for index, prompt in enumerate(prompts):
+        expected = analyzer.analyze(prompt)
+        assert dict(zip(scores.principle_keys, scores.principle_scores[index].tolist())) == expected.scores
+        assert scores.total_scores[index] == pytest.approx(expected.total_score)
+        assert scores.domains[index] == expected.domain
+        assert scores.intents[index] == expected.detected_intent
+
+
+def test_hit_matrix_rows_match_keyword_hits(analyzer, prompts):
+    batch = BatchAnalyzer(analyzer)
+    matrix = batch.hit_matrix(prompts)
+    dense = matrix.to_dense()
+
+    assert matrix.shape == (len(prompts), len(analyzer.keyword_matcher.keywords))
+    for index, prompt in enumerate(prompts):
+        hits = analyzer.find_keywords(prompt)
+        assert matrix.row(index) == hits
+        assert int(dense[index].sum()) == len(hits)
@@ -0,0 +1,303 @@
+"""결과 캐시 테스트"""
+
+import multiprocessing
+import os
+import sqlite3
+import time
+from multiprocessing import shared_memory
+
+import pytest
+
+from scripts.analyzer import Domain, OptimizationLevel
+from scripts.cache import CacheBackend, LRUCache, SharedMemoryCache, SQLiteCache
+from scripts.core import ClaudePromptOptimizer, ExecutionMode, OptimizationRequest
+from scripts.gpt5_core import GPT5Engine
+from scripts.tokens import BPETokenizer, TokenEstimator
+
+
+PROMPT = "파이썬으로 웹 크롤러를 만드는 방법을 자세히 설명해주세요 예시 코드도 함께"
+
+
+def bpe_ranks(*merges):
+    ranks = {bytes([byte]): byte for byte in range(256)}
+    for token in merges:
+        ranks[token] = len(ranks)
+    return ranks
+
+
+def cache_key(optimizer, request=None, mode=ExecutionMode.OPTIMIZE, version="v1"):
+    return optimizer._cache_key(request or OptimizationRequest(prompt=PROMPT), mode, version)
+
+
+def test_cache_key_depends_on_every_input():
+    optimizer = ClaudePromptOptimizer(tokenizer=TokenEstimator())
+    base = cache_key(optimizer)
+
+    assert cache_key(optimizer) == base
+    assert cache_key(ClaudePromptOptimizer(tokenizer=TokenEstimator())) == base
+
+    variants = [
+        cache_key(optimizer, OptimizationRequest(prompt=PROMPT + " ")),
+        cache_key(optimizer, OptimizationRequest(prompt=PROMPT, domain=Domain.DEVELOPMENT)),
+        cache_key(optimizer, OptimizationRequest(prompt=PROMPT, optimization_level=OptimizationLevel.AGGRESSIVE)),
+        cache_key(optimizer, OptimizationRequest(prompt=PROMPT, template_id="code_review")),
+        cache_key(optimizer, OptimizationRequest(prompt=PROMPT, template_variables={"language": "python"})),
+        cache_key(optimizer, mode=ExecutionMode.TEMPLATE),
+        cache_key(optimizer, version="v2"),
+        cache_key(ClaudePromptOptimizer(tokenizer=BPETokenizer(bpe_ranks()))),
+    ]
+    assert len(set(variants + [base])) == len(variants) + 1
+
+
+def test_cache_key_distinguishes_bpe_configurations():
+    same = [BPETokenizer(bpe_ranks(b"ab")), BPETokenizer(bpe_ranks(b"ab"), cache_size=16)]
+    different = [
+        BPETokenizer(bpe_ranks(b"ab", b"cd")),
+        BPETokenizer(bpe_ranks(b"cd")),
+        BPETokenizer(bpe_ranks(b"ab"), pattern=r"\S+|\s+"),
+    ]
+
+    keys = [cache_key(ClaudePromptOptimizer(tokenizer=tokenizer)) for tokenizer in same + different]
+
+    assert keys[0] == keys[1]
+    assert len(set(keys)) == 1 + len(different)
+
+
+@pytest.mark.parametrize("prompt", [PROMPT, "코드 리뷰"])
+def test_cache_hit_returns_same_result(prompt):
+    request = OptimizationRequest(prompt=prompt)
+    uncached = ClaudePromptOptimizer().process_request(request)
+    optimizer = ClaudePromptOptimizer(cache=LRUCache())
+
+    first = optimizer.process_request(request)
+    second = optimizer.process_request(request)
+
+    assert optimizer.cache.stats()["hits"] == 1
+    for response in (first, second):
+        assert response.optimized_prompt == uncached.optimized_prompt
+        assert response.analysis == uncached.analysis
+        assert response.optimization == uncached.optimization
+        assert response.recommendations == uncached.recommendations
+        assert response.message == uncached.message
+
+
+def test_cache_hit_is_isolated_from_caller_mutation():
+    request = OptimizationRequest(prompt=PROMPT)
+    optimizer = ClaudePromptOptimizer(cache=LRUCache())
+
+    first = optimizer.process_request(request)
+    expected = (first.recommendations[:], dict(first.analysis.scores), first.analysis.issues[:],
+                first.optimization.applied_techniques[:])
+
+    # 첫 응답(저장 시점)과 캐시 적중 응답을 모두 수정
+    for response in (first, optimizer.process_request(request)):
+        response.recommendations.append("changed")
+        response.analysis.scores["clarity"] = -1
+        response.analysis.issues.clear()
+        response.optimization.applied_techniques.append("changed")
+        response.optimized_prompt = "changed"
+
+    hit = optimizer.process_request(request)
+
+    assert (hit.recommendations, hit.analysis.scores, hit.analysis.issues,
+            hit.optimization.applied_techniques) == expected
+    assert hit.optimized_prompt != "changed"
+
+
+def test_gpt5_cache_hit_is_isolated_from_caller_mutation():
+    prompt = "Be thorough but keep it brief. Never ask the user; always confirm before acting."
+    engine = GPT5Engine(cache=LRUCache())
+
+    first = engine.analyze_and_optimize(prompt)
+    expected = first.to_dict()
+    assert first.analysis.issues and first.optimization.parameter_config
+
+    # 첫 결과(저장 시점)와 캐시 적중 결과를 모두 수정
+    for result in (first, engine.analyze_and_optimize(prompt)):
+        result.analysis.contradictions.clear()
+        result.analysis.issues[0]["severity"] = "changed"
+        result.analysis.suggestions.clear()
+        result.optimization.improvements.clear()
+        result.optimization.parameter_config["verbosity"] = "changed"
+        result.optimization.added_features.append("changed")
+
+    assert engine.analyze_and_optimize(prompt).to_dict() == expected
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+    class Incomplete(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+class FailingBegin:
+    """BEGIN을 처음 한 번 실패시키는 연결 래퍼 (다른 프로세스가 잠근 상황)"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.failed = False
+
+    def execute(self, sql, *args):
+        if sql.startswith("BEGIN") and not self.failed:
+            self.failed = True
+            raise sqlite3.OperationalError("database is locked")
+        return self.connection.execute(sql, *args)
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+def stored_size(cache):
+    return cache._connect().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+
+def test_sqlite_flush_failure_keeps_pending_writes(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), batch_size=1000, flush_interval=3600)
+    try:
+        for index in range(3):
+            cache.set(f"key{index}", {"value": index})
+        cache._connection = FailingBegin(cache._connect())
+
+        with pytest.raises(sqlite3.OperationalError):
+            cache.flush()
+        assert cache.stats()["pending_writes"] == 3
+
+        cache.flush()
+        assert cache.stats()["pending_writes"] == 0
+        assert cache.stats()["entries"] == 3
+        assert [cache.get(f"key{index}") for index in range(3)] == [{"value": index} for index in range(3)]
+    finally:
+        cache.close()
+
+
+def test_sqlite_total_size_tracks_entries(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SQLiteCache(path, max_bytes=4000, ttl=None, batch_size=4, compress_level=0)
+    try:
+        for index in range(40):
+            cache.set(f"key{index % 25}", "x" * (50 + index * 7))
+        cache.flush()
+
+        stats = cache.stats()
+        assert stats["bytes"] == stored_size(cache)
+        assert stats["bytes"] <= 4000
+        assert stats["evictions"] > 0
+
+        # 다른 연결(프로세스)도 같은 누적 값을 봄
+        other = SQLiteCache(path)
+        assert other.stats()["bytes"] == stats["bytes"]
+        other.close()
+
+        cache.clear()
+        assert cache.stats()["bytes"] == 0
+    finally:
+        cache.close()
+
+
+def test_sqlite_total_size_initialized_for_existing_file(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SQLiteCache(path, compress_level=0)
+    for index in range(5):
+        cache.set(f"key{index}", "y" * 100)
+    cache.close()
+
+    # 누적 값 행이 없던 이전 버전 파일
+    connection = sqlite3.connect(path)
+    connection.execute("DELETE FROM meta")
+    connection.commit()
+    connection.close()
+
+    cache = SQLiteCache(path)
+    try:
+        assert cache.stats()["bytes"] == stored_size(cache) > 0
+    finally:
+        cache.close()
+
+
+@pytest.fixture
+def shm_cache():
+    caches = []
+
+    def make(**kwargs):
+        cache = SharedMemoryCache(**kwargs)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def _shm_worker(cache, results):
+    # spawn으로 시작한 자식 프로세스: 부모가 쓴 값을 읽고, 새 값을 쓴 뒤 연결 해제
+    results.put(cache.get("parent"))
+    cache.set("child", {"pid": os.getpid()})
+    cache.close()
+
+
+def test_shared_memory_cache_across_spawned_process(shm_cache):
+    context = multiprocessing.get_context("spawn")
+    cache = shm_cache(buckets=16, ways=2, context=context)
+    cache.set("parent", [1, 2, 3])
+
+    results = context.Queue()
+    process = context.Process(target=_shm_worker, args=(cache, results))
+    process.start()
+    seen = results.get(timeout=60)
+    process.join(timeout=60)
+
+    assert process.exitcode == 0
+    assert seen == [1, 2, 3]
+    # 자식의 close()는 세그먼트를 지우지 않음
+    child = cache.get("child")
+    assert child is not None and child["pid"] != os.getpid()
+
+
+def test_shared_memory_cache_close_unlinks_only_in_owner(shm_cache):
+    cache = shm_cache(buckets=4, ways=1)
+    name = cache.name
+
+    # 다른 프로세스로 전달된 것처럼 owner가 아닌 사본에서 close
+    attached = SharedMemoryCache.__new__(SharedMemoryCache)
+    attached.__setstate__(dict(cache.__getstate__(), _owner_pid=-1))
+    attached.close()
+    shared_memory.SharedMemory(name=name).close()
+
+    cache.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_shared_memory_cache_evicts_oldest_in_full_bucket(shm_cache):
+    cache = shm_cache(buckets=1, ways=2)
+    for key in ("first", "second", "third"):
+        cache.set(key, key)
+
+    assert cache.evictions == 1
+    assert cache.get("first") is None
+    assert (cache.get("second"), cache.get("third")) == ("second", "third")
+    assert cache.stats()["entries"] == 2
+
+
+def test_shared_memory_cache_expires_entries(shm_cache):
+    cache = shm_cache(buckets=4, ways=1, ttl=0.05)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    time.sleep(0.1)
+    assert cache.get("key") is None
+
+
+def test_shared_memory_cache_skips_oversize_values(shm_cache):
+    cache = shm_cache(buckets=4, ways=1, slot_size=256)
+    cache.set("big", os.urandom(1024))  # 압축되지 않는 값
+
+    assert cache.skipped == 1
+    assert cache.get("big") is None
+    assert cache.stats()["writes"] == 0
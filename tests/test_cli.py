@@ -0,0 +1,70 @@
+"""JSONL 명령행 파이프라인 테스트"""
+
+import json
+
+import pytest
+
+from scripts.cli import main
+
+
+PROMPTS = [
+    "파이썬으로 웹 크롤러를 만드는 방법을 자세히 설명해주세요",
+    "마케팅 이메일 작성",
+    "이 코드의 버그를 찾아서 고쳐줘",
+]
+
+
+def run_cli(tmp_path, lines, *args):
+    source = tmp_path / "input.jsonl"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    output = tmp_path / "output.jsonl"
+
+    code = main([str(source), "-o", str(output), "--progress", "0", *args])
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    return code, records
+
+
+def test_error_record_shape_and_exit_code(tmp_path):
+    lines = [json.dumps(PROMPTS[0], ensure_ascii=False), "{not json", json.dumps({"id": "x"})]
+    code, records = run_cli(tmp_path, lines)
+
+    assert code == 1
+    assert records[0]["success"] is True
+    for record, line_number in zip(records[1:], (2, 3)):
+        assert set(record) == {"success", "message", "source", "line"}
+        assert record["success"] is False
+        assert record["source"] == str(tmp_path / "input.jsonl")
+        assert record["line"] == line_number
+
+
+@pytest.mark.parametrize("engine", ["claude", "gpt5"])
+def test_id_is_echoed_first(tmp_path, engine):
+    lines = [json.dumps({"id": "a1", "prompt": PROMPTS[0]}, ensure_ascii=False)]
+    code, records = run_cli(tmp_path, lines, "--engine", engine)
+
+    assert code == 0
+    assert next(iter(records[0])) == "id"
+    assert records[0]["id"] == "a1"
+
+
+def test_output_order_matches_input_with_workers(tmp_path):
+    lines = [json.dumps({"id": index, "prompt": f"{PROMPTS[index % len(PROMPTS)]} {index}"}, ensure_ascii=False)
+             for index in range(40)]
+    code, records = run_cli(tmp_path, lines, "--workers", "2", "--chunksize", "3")
+
+    assert code == 0
+    assert [record["id"] for record in records] == list(range(40))
+
+
+def test_missing_input_file_exits_with_error(tmp_path, capsys):
+    code = main([str(tmp_path / "missing.jsonl"), "-o", str(tmp_path / "output.jsonl"), "--progress", "0"])
+
+    assert code == 2
+    assert capsys.readouterr().err.startswith("Error: ")
+
+
+@pytest.mark.parametrize("option", ["--domain", "--level", "--mode"])
+def test_rejects_unknown_choices(option):
+    with pytest.raises(SystemExit) as excinfo:
+        main([option, "unknown"])
+    assert excinfo.value.code == 2
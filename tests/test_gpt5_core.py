@@ -0,0 +1,23 @@
+"""GPT-5 통합 엔진 테스트"""
+
+import shutil
+import threading
+
+from scripts.gpt5_core import analyze_prompt, get_engine
+from scripts.pattern_pack import DEFAULT_PATTERNS_DIR
+
+
+def test_convenience_helpers_pick_up_edits_without_watcher(tmp_path):
+    patterns_file = tmp_path / "gpt5_patterns.json"
+    shutil.copy(DEFAULT_PATTERNS_DIR / "gpt5_patterns.json", patterns_file)
+
+    analyze_prompt("hello", str(patterns_file))
+    engine = get_engine(str(patterns_file))
+    version = engine.rule_version
+
+    assert "pattern-watcher" not in [thread.name for thread in threading.enumerate()]
+
+    # 다음 호출에서 바로 반영 (감시 주기를 기다리지 않음)
+    patterns_file.write_bytes(patterns_file.read_bytes() + b"\n")
+    assert get_engine(str(patterns_file)) is engine
+    assert engine.rule_version != version
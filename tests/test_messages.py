@@ -0,0 +1,97 @@
+"""메시지 카탈로그 테스트"""
+
+import hashlib
+import json
+import pickle
+import random
+from pathlib import Path
+
+import pytest
+
+from scripts.core import ClaudePromptOptimizer
+from scripts.gpt5_core import GPT5Engine, format_pipeline_result
+from scripts.messages import MESSAGE_TEMPLATES, Message, MessageCode, message, render_messages
+
+
+# 메시지 코드 도입 이전 구현으로 렌더링한 출력의 프롬프트별 sha256
+# (패턴 파일이나 출력 문구를 의도적으로 바꾼 경우에만 rendered_digests()로 다시 생성)
+RENDERED_DIGESTS = Path(__file__).parent / "data" / "rendered_output_digests.json"
+
+VOCABULARY = [
+    "코드를", "리뷰해주세요", "파이썬으로", "웹", "크롤러를", "만들어주세요", "마케팅", "전략을", "세워주세요",
+    "블로그", "글을", "작성해주세요", "비즈니스", "보고서", "분석", "예를", "들어", "형식으로", "표로",
+    "전문가로서", "목표는", "제약", "피해야", "하지", "마세요", "배경", "자세히", "설명해주세요", "가능한",
+    "알려주셔서", "감사합니다", "부탁드립니다.", "?", ".", "\n", "1.", "2.", "-", "api", "python", "tool",
+    "never", "without", "auto", "always confirm", "proceed without asking", "thoroughly", "minimize",
+    "maximize", "as quickly as possible", "must", "always", "step 1", "if", "<task>", "</task>",
+    "<context>", "</context>", "something", "some", "maybe", "좀", "적당히", "sufficient", "relevant",
+]
+
+
+def make_prompts(count=400, seed=25):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(1, 40))) for _ in range(count)]
+
+
+def drop_rule_versions(value):
+    if isinstance(value, dict):
+        return {key: drop_rule_versions(item) for key, item in value.items() if key != "rule_version"}
+    return value
+
+
+def render(claude, gpt5, prompt, level):
+    """공개 API의 문자열/딕셔너리 출력 (실행 시간과 패턴 버전 제외)"""
+    optimized = claude.optimize_prompt(prompt, optimization_level=level)
+    optimized.pop("execution_time", None)
+    pipeline = gpt5.analyze_and_optimize(prompt)
+    output = [
+        optimized,
+        claude.analyze_prompt(prompt),
+        drop_rule_versions(pipeline.to_dict()),
+        format_pipeline_result(pipeline),
+    ]
+    return json.dumps(output, ensure_ascii=False, sort_keys=True)
+
+
+def rendered_digests():
+    claude = ClaudePromptOptimizer()
+    gpt5 = GPT5Engine()
+    levels = ["conservative", "balanced", "aggressive"]
+    return [
+        hashlib.sha256(render(claude, gpt5, prompt, levels[index % 3]).encode("utf-8")).hexdigest()
+        for index, prompt in enumerate(make_prompts())
+    ]
+
+
+def test_rendered_output_unchanged():
+    expected = json.loads(RENDERED_DIGESTS.read_text(encoding="utf-8"))
+    actual = rendered_digests()
+
+    mismatches = [index for index, (left, right) in enumerate(zip(actual, expected)) if left != right]
+    assert len(actual) == len(expected)
+    assert mismatches == [], [make_prompts()[index] for index in mismatches[:5]]
+
+
+def test_every_code_has_template():
+    assert set(MESSAGE_TEMPLATES) == set(MessageCode)
+
+
+def test_message_rendering_and_sharing():
+    assert message(MessageCode.PROMPT_TOO_SHORT) is message(MessageCode.PROMPT_TOO_SHORT)
+    assert str(message(MessageCode.ROLE_DEFINED, "시니어 개발자로서")) == "역할 정의: 시니어 개발자로서"
+    assert str(message(MessageCode.LOW_CLARITY_SCORE, 3.14159)) == "명확성 점수가 낮습니다 (3.1/10)"
+    assert render_messages([message(MessageCode.GOAL_ADDED), message(MessageCode.CONSTRAINT_ADDED)]) == [
+        "구체적인 목표 추가", "제약 조건 추가"
+    ]
+
+
+def test_message_is_immutable_and_picklable():
+    original = message(MessageCode.ANTI_PATTERN_FIXED, "over-thoroughness")
+
+    with pytest.raises(AttributeError):
+        original.code = MessageCode.GOAL_ADDED
+
+    restored = pickle.loads(pickle.dumps(original))
+    assert restored == original
+    assert hash(restored) == hash(original)
+    assert isinstance(restored, Message)
@@ -0,0 +1,64 @@
+"""PromptOptimizer 토큰 치환 테스트"""
+
+import random
+import re
+
+import pytest
+
+from scripts.optimizer import PromptOptimizer
+from scripts.tokens import get_estimator
+
+
+@pytest.fixture(scope="module")
+def optimizer():
+    return PromptOptimizer(tokenizer=get_estimator())
+
+
+def sequential_rewrite(optimizer, prompt):
+    """규칙마다 전체 문자열을 다시 치환하고 추정하던 기존 구현"""
+    estimate = get_estimator().estimate
+    optimized = prompt
+    total_reduction = 0
+    for pattern, replacement in optimizer.token_optimization_patterns + optimizer.duplicated_patterns:
+        if re.search(pattern, optimized):
+            before_tokens = estimate(optimized)
+            optimized = re.sub(pattern, replacement, optimized)
+            total_reduction += before_tokens - estimate(optimized)
+    return optimized, total_reduction
+
+
+@pytest.mark.parametrize("prompt, expected", [
+    # 앞 규칙(자세히 설명해주세요)이 먼저 적용되어 '가능한 자세히'는 더 이상 일치하지 않음
+    ("가능한 자세히 설명해주세요", "가능한 설명해주세요"),
+    # 앞 규칙의 치환 결과에 뒤 규칙이 적용되는 연쇄 치환
+    ("가능한 자세히 설명해주시면 감사하겠습니다", "설명해주세요"),
+    ("가능한 자세히 설명해줘서 감사합니다", "설명해주세요"),
+    # 삭제 규칙 뒤에 이어 붙은 표현은 앞 규칙으로 다시 치환하지 않음
+    ("자세히 제가 이해할 수 있도록 설명해주세요", "자세히  설명해주세요"),
+    ("코드를 리뷰해주세요", "코드를 리뷰해주세요"),
+    # 치환 구간이 영어/숫자와 바로 붙어 있어 단어가 합쳐지거나 나뉘는 경우
+    ("abc 제가 이해할 수 있도록xyz", "abc xyz"),
+    ("x제가 이해할 수 있도록 y", "x y"),
+    ("abc제가 이해할 수 있도록xyz", "abcxyz"),
+    ("v2제가 이해할 수 있도록3.0 api", "v23.0 api"),
+    ("전문적인 관점에서review 해주세요", "전문가로서review 해주세요"),
+])
+def test_rewrite_matches_sequential_rules(optimizer, prompt, expected):
+    optimized, reduction = optimizer.optimize_tokens(prompt)
+
+    assert optimized == expected
+    assert (optimized, reduction) == sequential_rewrite(optimizer, prompt)
+
+
+def test_rewrite_fuzz_matches_sequential_rules(optimizer):
+    fragments = [
+        "가능한", "자세히", "설명해주세요", "설명해주시면", "감사하겠습니다", "제가", "이해할", "수",
+        "있도록", "알려주셔서", "감사합니다", "부탁드립니다.", "설명해줘서", "친절하게", "설명해줘",
+        "상세히", "알려주세요", "초보자도", "api", "x", "42", "v2.1", "\n"
+    ]
+    rng = random.Random(6)
+    for _ in range(3000):
+        # 공백 없이 붙여 치환 구간이 영어/숫자와 맞닿는 경우도 생성
+        prompt = "".join(rng.choice(fragments) + rng.choice([" ", "", ""])
+                         for _ in range(rng.randint(0, 12)))
+        assert optimizer.optimize_tokens(prompt) == sequential_rewrite(optimizer, prompt), prompt
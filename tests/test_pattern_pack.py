@@ -0,0 +1,58 @@
+"""패턴 팩 테스트"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from scripts import pattern_pack
+from scripts.pattern_pack import DEFAULT_PATTERNS_DIR, build_pattern_pack, find_pattern_pack, load_pattern_file
+
+
+@pytest.fixture
+def patterns_dir(tmp_path):
+    for name in ("development.json", "gpt5_patterns.json"):
+        shutil.copy(DEFAULT_PATTERNS_DIR / name, tmp_path / name)
+    build_pattern_pack(str(tmp_path))
+    return tmp_path
+
+
+def test_load_pattern_file_returns_independent_copies(patterns_dir):
+    patterns_file = patterns_dir / "development.json"
+    assert find_pattern_pack(patterns_file) is not None
+
+    first = load_pattern_file(patterns_file)
+    first.clear()
+
+    second = load_pattern_file(patterns_file)
+    with open(patterns_file, encoding="utf-8") as f:
+        assert second == json.load(f)
+
+
+def test_pack_rejects_same_size_edit_with_same_mtime(patterns_dir):
+    patterns_file = patterns_dir / "development.json"
+    stat = os.stat(patterns_file)
+    raw = patterns_file.read_bytes()
+
+    # 크기와 mtime은 그대로 두고 내용만 변경
+    index = raw.index(b'"', 1) + 1
+    edited = raw[:index] + (b"X" if raw[index:index + 1] != b"X" else b"Y") + raw[index + 1:]
+    patterns_file.write_bytes(edited)
+    os.utime(patterns_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert find_pattern_pack(patterns_file) is None
+
+
+def test_pack_rejected_when_built_by_other_code(patterns_dir, monkeypatch):
+    pack_path = patterns_dir / pattern_pack.PACK_FILENAME
+    assert pattern_pack.load_pattern_pack(pack_path) is not None
+
+    monkeypatch.setattr(pattern_pack, "_code_digest", lambda: b"\0" * 32)
+    assert pattern_pack.load_pattern_pack(pack_path) is None
+
+
+def test_pack_rejected_when_built_by_other_python(patterns_dir, monkeypatch):
+    pack_path = patterns_dir / pattern_pack.PACK_FILENAME
+    monkeypatch.setattr(pattern_pack, "_python_tag", lambda: b"cpython-27")
+    assert pattern_pack.load_pattern_pack(pack_path) is None
@@ -0,0 +1,57 @@
+"""패턴 레지스트리 테스트"""
+
+import hashlib
+import os
+import shutil
+
+from scripts.pattern_pack import DEFAULT_PATTERNS_DIR
+from scripts.pattern_registry import PatternRegistry
+
+
+def edit(patterns_file, count):
+    """내용과 mtime을 바꿔 새 버전으로 만듦"""
+    raw = (DEFAULT_PATTERNS_DIR / "gpt5_patterns.json").read_bytes()
+    patterns_file.write_bytes(raw + b"\n" * count)
+    stat = os.stat(patterns_file)
+    os.utime(patterns_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + count * 1_000_000_000))
+
+
+def test_registry_drops_previous_versions(tmp_path):
+    patterns_file = tmp_path / "gpt5_patterns.json"
+    shutil.copy(DEFAULT_PATTERNS_DIR / "gpt5_patterns.json", patterns_file)
+    registry = PatternRegistry()
+
+    versions = set()
+    for count in range(1, 6):
+        edit(patterns_file, count)
+        rules = registry.get_gpt5_rules(patterns_file)
+        registry.get_patterns(patterns_file)
+        versions.add(rules.version)
+
+        assert len(registry._gpt5_rules) == 1
+        assert len(registry._patterns) == 1
+        assert registry.get_gpt5_rules(patterns_file) is rules
+
+    assert len(versions) == 5
+
+
+def test_rules_labelled_with_hash_of_parsed_content(tmp_path):
+    patterns_file = tmp_path / "gpt5_patterns.json"
+    shutil.copy(DEFAULT_PATTERNS_DIR / "gpt5_patterns.json", patterns_file)
+    registry = PatternRegistry()
+    _, old_digest = registry.fingerprint(patterns_file)
+
+    # 해시 계산 이후 같은 크기/mtime으로 내용이 바뀐 경우
+    stat = os.stat(patterns_file)
+    raw = patterns_file.read_bytes().replace(b"thoroughly", b"THOROUGHLY", 1)
+    patterns_file.write_bytes(raw)
+    os.utime(patterns_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    new_digest = hashlib.sha256(raw).hexdigest()
+
+    rules = registry.get_gpt5_rules(patterns_file)
+
+    assert new_digest != old_digest
+    assert rules.version == new_digest[:12]
+    assert "THOROUGHLY" in repr(rules.patterns)
+    # 이전 해시 키로 등록되지 않음
+    assert (str(patterns_file), old_digest) not in registry._gpt5_rules
@@ -0,0 +1,64 @@
+"""증분 분석 세션 테스트"""
+
+import random
+
+import pytest
+
+from scripts.analyzer import PromptAnalyzer
+from scripts.gpt5_analyzer import GPT5PromptAnalyzer
+from scripts.session import AnalysisSession, GPT5AnalysisSession, TextEdit, _IncrementalSession
+
+
+FRAGMENTS = [
+    "코드를 리뷰해주세요", "python", "api", "자세히", "예시", "형식", "역할", "never", "without",
+    "auto", "always confirm", "proceed without asking", "thoroughly", "minimize", "must", "never",
+    "step 1", "1.", "- ", "tool", "if", "<task>", "</task>", "<context>", "</context>", "\n", "\n\n",
+    "  ", ".", "?", "İ", "ς", "마케팅", "전략", "목표", "제약", "피해야", "sufficient",
+]
+
+
+def random_edit(rng, text):
+    start = rng.randint(0, len(text))
+    end = min(len(text), start + rng.choice([0, 0, 1, 3, 10, 40]))
+    insert = "".join(rng.choice(FRAGMENTS) + rng.choice([" ", "", "\n"]) for _ in range(rng.randint(0, 4)))
+    return TextEdit(start, end, insert)
+
+
+def test_incremental_session_is_abstract():
+    class Incomplete(_IncrementalSession):
+        def analyze(self):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete("prompt")
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_analysis_session_matches_full_analysis(seed):
+    rng = random.Random(seed)
+    analyzer = PromptAnalyzer()
+    session = AnalysisSession("", analyzer)
+    text = ""
+
+    for _ in range(150):
+        edit = random_edit(rng, text)
+        text = edit.apply(text)
+        assert session.update(edit) == analyzer.analyze(text), text
+
+    assert session.set_text(text[::-1]) == analyzer.analyze(text[::-1])
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_gpt5_session_matches_full_analysis(seed):
+    rng = random.Random(seed)
+    analyzer = GPT5PromptAnalyzer()
+    session = GPT5AnalysisSession("", analyzer)
+    text = ""
+
+    for _ in range(150):
+        edit = random_edit(rng, text)
+        text = edit.apply(text)
+        assert session.update(edit).to_dict() == analyzer.analyze(text).to_dict(), text
+        assert session.features() == analyzer.extract_features(text), text
+
+    assert session.set_text(text[::-1]).to_dict() == analyzer.analyze(text[::-1]).to_dict()
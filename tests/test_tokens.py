@@ -0,0 +1,85 @@
+"""토큰 카운터 테스트"""
+
+import base64
+import multiprocessing
+import pickle
+
+import pytest
+
+from scripts.core import ClaudePromptOptimizer, OptimizationRequest
+from scripts.tokens import BPETokenizer, Tokenizer
+
+
+def make_tokenizer(**kwargs):
+    """단일 바이트와 몇 개의 병합 토큰만 가진 작은 BPE 테이블"""
+    ranks = {bytes([byte]): byte for byte in range(256)}
+    for token in (b"th", b"the", b" the", b"in", b"ing"):
+        ranks[token] = len(ranks)
+    return BPETokenizer(ranks, **kwargs)
+
+
+def test_tokenizer_is_abstract():
+    with pytest.raises(TypeError):
+        Tokenizer()
+
+    class Incomplete(Tokenizer):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_bpe_tokenizer_pickle_round_trip():
+    tokenizer = make_tokenizer(pattern=r"\S+|\s+", cache_size=8)
+    text = "the thing in the string"
+    expected = tokenizer.count(text)
+
+    restored = pickle.loads(pickle.dumps(tokenizer))
+
+    assert restored.ranks == tokenizer.ranks
+    assert restored.pretokenize_pattern.pattern == r"\S+|\s+"
+    assert restored.cache_size == 8
+    assert restored.count(text) == expected
+    # 복원된 객체는 자기 캐시를 새로 가짐
+    assert restored._count_piece is not tokenizer._count_piece
+    assert restored._count_piece.cache_info().maxsize == 8
+
+
+def test_merges_file_keeps_hash_merges(tmp_path):
+    merges = tmp_path / "merges.txt"
+    merges.write_text("#version: 0.2\n# #\n## #\nt h\nth e\n", encoding="utf-8")
+
+    tokenizer = BPETokenizer.from_file(str(merges))
+
+    assert tokenizer.ranks[b"##"] == 256
+    assert tokenizer.ranks[b"###"] == 257
+    assert tokenizer.ranks[b"the"] == 259
+    assert tokenizer.count("###") == 1
+
+
+def test_tiktoken_file(tmp_path):
+    vocab = tmp_path / "vocab.tiktoken"
+    lines = [f"{base64.b64encode(bytes([byte])).decode()} {byte}" for byte in range(256)]
+    lines.append(f"{base64.b64encode(b'ab').decode()} 256")
+    vocab.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    tokenizer = BPETokenizer.from_file(str(vocab))
+
+    assert tokenizer.ranks[b"ab"] == 256
+    assert tokenizer.count("ab") == 1
+
+
+def test_process_batch_with_bpe_tokenizer_under_spawn():
+    tokenizer = make_tokenizer()
+    optimizer = ClaudePromptOptimizer(tokenizer=tokenizer)
+    requests = [OptimizationRequest(prompt=f"the thing {index} 자세히 설명해주세요") for index in range(4)]
+
+    responses = list(optimizer.process_batch(
+        requests, workers=2, chunksize=2, context=multiprocessing.get_context("spawn")
+    ))
+
+    assert [response.success for response in responses] == [True] * 4
+    expected = [ClaudePromptOptimizer(tokenizer=tokenizer).process_request(request) for request in requests]
+    assert [response.optimized_prompt for response in responses] == [
+        response.optimized_prompt for response in expected
+    ]